@@ -0,0 +1,174 @@
+"""
+Production server of the API.
+
+Runs the WSGI application, or the ASGI one, under gunicorn: a master
+process loads Django, the URL configuration and the views, then forks the
+workers, which share the loaded modules copy-on-write instead of each
+importing them. ``gc.freeze()`` keeps the collector of a worker from
+writing to, and so copying, the pages of the preloaded objects. The master
+restarts a worker that exits, for instance when it is recycled after
+``MAX_REQUESTS`` requests.
+
+The ``SERVER`` setting configures it, and the options of the command line
+override the setting::
+
+    DJANGO_SETTINGS_MODULE=app.settings_production python -m app.server \\
+        [--bind 0.0.0.0:8000] [--workers 4] [--asgi]
+
+``manage.py runserver`` stays the development server.
+"""
+import argparse
+import gc
+import os
+from typing import Optional
+
+from gunicorn.app.base import BaseApplication
+
+DEFAULT_SERVER = {
+    'BIND': '0.0.0.0:8000',
+    'WORKERS': None,
+    'WORKER_CLASS': 'sync',
+    'THREADS': 1,
+    'KEEPALIVE': 5,
+    'TIMEOUT': 30,
+    'MAX_REQUESTS': 10000,
+    'MAX_REQUESTS_JITTER': 1000,
+    'PRELOAD': True,
+}
+
+WORKER_CLASSES = ('sync', 'asgi')
+ASGI_WORKER_CLASS = 'uvicorn.workers.UvicornWorker'
+SHARED_MEMORY = '/dev/shm'
+
+
+def cores() -> int:
+    """Cores this process may run on."""
+
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def server_config(overrides: Optional[dict] = None) -> dict:
+    """The ``SERVER`` setting, completed by the defaults and overrides."""
+
+    from django.conf import settings
+
+    config = dict(DEFAULT_SERVER, **getattr(settings, 'SERVER', {}))
+    config.update((key, value) for key, value in (overrides or {}).items()
+                  if value is not None)
+
+    if config['WORKER_CLASS'] not in WORKER_CLASSES:
+        raise ValueError(
+            "Unknown worker class {!r}, expected one of {}.".format(
+                config['WORKER_CLASS'], ', '.join(WORKER_CLASSES)))
+    return config
+
+
+def gunicorn_options(config: dict) -> dict:
+    """Gunicorn settings of a server configuration."""
+
+    if config['WORKER_CLASS'] == 'asgi':
+        worker_class = ASGI_WORKER_CLASS
+    elif config['THREADS'] > 1:
+        worker_class = 'gthread'
+    else:
+        worker_class = 'sync'
+
+    options = {
+        'bind': config['BIND'],
+        'workers': config['WORKERS'] or cores(),
+        'worker_class': worker_class,
+        'threads': config['THREADS'],
+        'keepalive': config['KEEPALIVE'],
+        'timeout': config['TIMEOUT'],
+        'max_requests': config['MAX_REQUESTS'],
+        'max_requests_jitter': config['MAX_REQUESTS_JITTER'],
+        'preload_app': config['PRELOAD'],
+    }
+
+    # The heartbeat of the workers is a file; in memory it cannot stall on
+    # a slow disk, as it can in containers.
+    if os.path.isdir(SHARED_MEMORY):
+        options['worker_tmp_dir'] = SHARED_MEMORY
+    return options
+
+
+def load_application(asgi: bool = False):
+    """
+    The WSGI or ASGI application, with its URLs and views imported.
+
+    Django only imports the URL configuration, and the views and engine
+    with it, on the first request; resolving it here moves that into the
+    master before the fork.
+    """
+
+    if asgi:
+        from app.asgi import application
+    else:
+        from app.wsgi import application
+
+    from django.urls import get_resolver
+    get_resolver().url_patterns
+    return application
+
+
+class Server(BaseApplication):
+    """Gunicorn application serving the API."""
+
+    def __init__(self, options: dict):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for name, value in self.options.items():
+            self.cfg.set(name, value)
+
+    def load(self):
+        application = load_application(
+            self.options['worker_class'] == ASGI_WORKER_CLASS)
+
+        if self.options['preload_app']:
+            gc.freeze()
+        return application
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Serve the API with the ``SERVER`` setting and the given options."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--bind', help='Address, HOST:PORT.')
+    parser.add_argument('--workers', type=int,
+                        help='Worker processes, by default one per core.')
+    parser.add_argument('--asgi', action='store_const', const='asgi',
+                        dest='worker_class',
+                        help='Serve app.asgi with uvicorn workers.')
+    parser.add_argument('--threads', type=int,
+                        help='Threads of every WSGI worker.')
+    parser.add_argument('--keepalive', type=int,
+                        help='Seconds a connection is kept between '
+                        'requests.')
+    parser.add_argument('--timeout', type=int,
+                        help='Seconds a silent worker has before it is '
+                        'restarted.')
+    parser.add_argument('--max-requests', type=int,
+                        help='Requests before a worker is recycled, 0 for '
+                        'never.')
+    parser.add_argument('--max-requests-jitter', type=int)
+    parser.add_argument('--no-preload', action='store_false', default=None,
+                        dest='preload',
+                        help='Load the application in every worker.')
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
+    import django
+    django.setup()
+
+    Server(gunicorn_options(server_config({
+        name.upper(): value for name, value in vars(args).items()
+    }))).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -43,6 +43,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'app.shared.middlewares.ServerTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -131,3 +132,57 @@ REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'EXCEPTION_HANDLER': 'app.shared.middlewares.pretty_exception_handler',
 }
+
+# Schedule cache
+# BACKEND is 'lru' (in-process), 'django' (the CACHE_ALIAS cache) or None.
+
+VESTING_SCHEDULE_CACHE = {
+    'BACKEND': 'lru',
+    'MAX_SIZE': 1024,
+    'TTL': 300,
+    'CACHE_ALIAS': 'default',
+}
+
+# Schedule arithmetic
+# 'float' follows the README formula, 'exact' uses integer share math.
+
+VESTING_ARITHMETIC = 'float'
+
+# Linked schedules
+# Seconds the schedules of schedule/<token>/ may be cached for.
+
+VESTING_SCHEDULE_MAX_AGE = 86400
+
+# Request instrumentation
+# ENABLED adds Server-Timing headers and the api/metrics/ histograms.
+
+INSTRUMENTATION = {
+    'ENABLED': False,
+}
+
+# Schedule executor of the async endpoints
+# KIND is 'thread' or 'process'; MAX_WORKERS None is one worker per core.
+
+VESTING_SCHEDULE_EXECUTOR = {
+    'KIND': 'thread',
+    'MAX_WORKERS': None,
+    'CHUNK_SIZE': 64,
+}
+
+# Production server of python -m app.server
+# WORKERS None is one worker per core. WORKER_CLASS is 'sync' (WSGI, threaded
+# when THREADS > 1) or 'asgi'. A worker is recycled after MAX_REQUESTS
+# requests, plus up to MAX_REQUESTS_JITTER, or never with 0. KEEPALIVE is in
+# seconds and only kept by threaded and ASGI workers.
+
+SERVER = {
+    'BIND': '0.0.0.0:8000',
+    'WORKERS': None,
+    'WORKER_CLASS': 'sync',
+    'THREADS': 1,
+    'KEEPALIVE': 5,
+    'TIMEOUT': 30,
+    'MAX_REQUESTS': 10000,
+    'MAX_REQUESTS_JITTER': 1000,
+    'PRELOAD': True,
+}
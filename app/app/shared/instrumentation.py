@@ -0,0 +1,227 @@
+"""
+Request instrumentation.
+
+Times the stages of a request, such as validation, the use case and the
+rendering, and counts the memory blocks each stage allocates. The
+``INSTRUMENTATION`` setting turns it on:
+
+* ``ENABLED``: record the stages of every request. Off by default; the
+  middleware then removes itself and ``timed`` is a context variable lookup.
+* ``BUCKETS``: upper bounds, in seconds, of the duration histograms.
+
+``ServerTimingMiddleware`` sends the stages of a request in its
+``Server-Timing`` header and adds them to in-process histograms, which
+``metrics`` exports in the Prometheus text format.
+"""
+import contextvars
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Iterable, Iterator, Optional
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import Http404, HttpResponse
+
+DEFAULT_INSTRUMENTATION = {
+    'ENABLED': False,
+    'BUCKETS': (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25,
+                0.5, 1.0, 2.5),
+}
+BLOCK_BUCKETS = (10, 100, 1000, 10000, 100000, 1000000)
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_NULL_TIMER = nullcontext()
+
+
+def instrumentation_config() -> dict:
+    """The ``INSTRUMENTATION`` setting, with its defaults."""
+
+    return dict(DEFAULT_INSTRUMENTATION,
+                **getattr(settings, 'INSTRUMENTATION', {}))
+
+
+class RequestTimings:
+    """Durations and allocated blocks of the stages of one request."""
+
+    __slots__ = ('stages',)
+
+    def __init__(self):
+        self.stages: list[tuple[str, float, int]] = []
+
+    @contextmanager
+    def timed(self, stage: str) -> Iterator[None]:
+        blocks = sys.getallocatedblocks()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append((
+                stage, time.perf_counter() - started,
+                sys.getallocatedblocks() - blocks))
+
+    def server_timing(self) -> str:
+        """The stages as a ``Server-Timing`` header value."""
+
+        return ', '.join(
+            '{};dur={:.3f};desc="{} blocks"'.format(
+                stage, duration * 1e3, blocks)
+            for stage, duration, blocks in self.stages)
+
+
+_request_timings: contextvars.ContextVar[Optional[RequestTimings]] = \
+    contextvars.ContextVar('request_timings', default=None)
+
+
+def timed(stage: str):
+    """
+    Context manager timing a stage of the current request.
+
+    Does nothing outside an instrumented request.
+    """
+
+    request_timings = _request_timings.get()
+    if request_timings is None:
+        return _NULL_TIMER
+    return request_timings.timed(stage)
+
+
+@contextmanager
+def instrumented() -> Iterator[RequestTimings]:
+    """Record the stages timed until the block exits."""
+
+    request_timings = RequestTimings()
+    token = _request_timings.set(request_timings)
+    try:
+        yield request_timings
+    finally:
+        _request_timings.reset(token)
+
+
+class Histogram:
+    """Cumulative bucket counts, sum and count of observed values."""
+
+    def __init__(self, buckets: Iterable[float]):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        index = 0
+        for bound in self.buckets:
+            if value <= bound:
+                break
+            index += 1
+        self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self) -> Iterator[tuple[str, int]]:
+        """``le`` label and cumulative count of every bucket."""
+
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            yield ('+Inf' if bound == float('inf') else repr(bound)), total
+
+
+class MetricsRegistry:
+    """In-process histograms of the request stages."""
+
+    def __init__(self, buckets: Iterable[float]):
+        self.buckets = tuple(buckets)
+        self.durations: dict[tuple[str, str], Histogram] = {}
+        self.blocks: dict[tuple[str, str], Histogram] = {}
+        self.collectors: list[Callable[[], Iterable[str]]] = []
+        self._lock = threading.Lock()
+
+    def record(self, view: str, request_timings: RequestTimings) -> None:
+        with self._lock:
+            for stage, duration, blocks in request_timings.stages:
+                key = (view, stage)
+                if key not in self.durations:
+                    self.durations[key] = Histogram(self.buckets)
+                    self.blocks[key] = Histogram(BLOCK_BUCKETS)
+                self.durations[key].observe(duration)
+                self.blocks[key].observe(max(blocks, 0))
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text format."""
+
+        lines: list[str] = []
+        with self._lock:
+            for name, help_text, histograms in [
+                ('request_stage_duration_seconds',
+                 'Duration of the stages of the requests.', self.durations),
+                ('request_stage_allocated_blocks',
+                 'Memory blocks allocated by the stages of the requests.',
+                 self.blocks),
+            ]:
+                lines.append('# HELP {} {}'.format(name, help_text))
+                lines.append('# TYPE {} histogram'.format(name))
+                for (view, stage), histogram in sorted(histograms.items()):
+                    labels = 'view="{}",stage="{}"'.format(view, stage)
+                    for bound, count in histogram.samples():
+                        lines.append('{}_bucket{{{},le="{}"}} {}'.format(
+                            name, labels, bound, count))
+                    lines.append('{}_sum{{{}}} {!r}'.format(
+                        name, labels, histogram.sum))
+                    lines.append('{}_count{{{}}} {}'.format(
+                        name, labels, histogram.count))
+
+        for collector in self.collectors:
+            lines.extend(collector())
+
+        return '\n'.join(lines) + '\n'
+
+
+_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+_collectors: list[Callable[[], Iterable[str]]] = []
+
+
+def register_collector(collector: Callable[[], Iterable[str]]) -> None:
+    """Add a callable giving more Prometheus lines to the export."""
+
+    _collectors.append(collector)
+    if _registry is not None:
+        _registry.collectors.append(collector)
+
+
+def get_registry() -> MetricsRegistry:
+    """The process wide metrics registry."""
+
+    global _registry
+
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = MetricsRegistry(
+                    instrumentation_config()['BUCKETS'])
+                _registry.collectors.extend(_collectors)
+
+    return _registry
+
+
+@receiver(setting_changed)
+def reset_registry(setting: str, **kwargs) -> None:
+    """Start new histograms on next use when the setting changes."""
+
+    global _registry
+
+    if setting == 'INSTRUMENTATION':
+        with _registry_lock:
+            _registry = None
+
+
+def metrics(request) -> HttpResponse:
+    """Export the metrics, when instrumentation is enabled."""
+
+    if not instrumentation_config()['ENABLED']:
+        raise Http404('Instrumentation is disabled.')
+
+    return HttpResponse(get_registry().render(),
+                        content_type=PROMETHEUS_CONTENT_TYPE)
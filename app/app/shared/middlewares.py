@@ -1,7 +1,13 @@
+import asyncio
+
+from django.core.exceptions import MiddlewareNotUsed
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import exception_handler
 
+from app.shared.instrumentation import (get_registry, instrumentation_config,
+                                        instrumented)
+
 
 def pretty_exception_handler(exc, context) -> Response:
     """ Pretty exception handler."""
@@ -11,3 +17,60 @@ def pretty_exception_handler(exc, context) -> Response:
         response.data['status_code'] = status.HTTP_400_BAD_REQUEST
 
     return response
+
+
+class ServerTimingMiddleware:
+    """
+    Time the stages of every request.
+
+    Sends them in the ``Server-Timing`` header and records them in the
+    metrics histograms. Unused unless ``INSTRUMENTATION['ENABLED']``.
+
+    The header is sent before the body, so for a streaming response
+    ``total`` is the time until the response is returned, without the
+    streaming of its content. The middleware is both sync and async capable,
+    so under ASGI it adds no thread hop of its own in front of async views.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not instrumentation_config()['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            # Django treats the middleware as async when it looks like a
+            # coroutine function, as MiddlewareMixin marks itself.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        with instrumented() as request_timings:
+            with request_timings.timed('total'):
+                response = self.get_response(request)
+
+        return self.process_timings(request, response, request_timings)
+
+    async def __acall__(self, request):
+        with instrumented() as request_timings:
+            with request_timings.timed('total'):
+                response = await self.get_response(request)
+
+        return self.process_timings(request, response, request_timings)
+
+    @staticmethod
+    def process_timings(request, response, request_timings):
+        """Send the timings in the header and record them."""
+
+        response['Server-Timing'] = request_timings.server_timing()
+
+        resolver_match = getattr(request, 'resolver_match', None)
+        get_registry().record(
+            resolver_match.view_name if resolver_match else 'unresolved',
+            request_timings)
+
+        return response
@@ -14,15 +14,23 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.urls import include, path
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+
+from app.shared.instrumentation import metrics
+from app.shared.lazy_views import lazy_view
 
 urlpatterns = [
-    path('api/schema/', SpectacularAPIView.as_view(), name='api-schema'),
+    path(
+        'api/schema/',
+        lazy_view('drf_spectacular.views.SpectacularAPIView'),
+        name='api-schema',
+    ),
     path(
         'api/docs/',
-        SpectacularSwaggerView.as_view(url_name='api-schema'),
+        lazy_view('drf_spectacular.views.SpectacularSwaggerView',
+                  url_name='api-schema'),
         name='api-docs',
     ),
     path('api/vesting/', include('vesting.urls')),
+    path('api/metrics/', metrics, name='metrics'),
 
 ]
@@ -0,0 +1,16 @@
+"""
+Benchmarks for the vesting app.
+
+Run a benchmark module from the ``app`` directory, for example::
+
+    python -m benchmarks.vest_encoder
+
+Importing this package configures Django with ``app.settings`` unless
+``DJANGO_SETTINGS_MODULE`` says otherwise.
+"""
+import os
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
+django.setup()
@@ -0,0 +1,334 @@
+"""
+Capacity report of the schedule endpoint under a mix of traffic.
+
+Starts ``app.wsgi`` on a threaded ``wsgiref`` server and ``app.asgi`` on
+``uvicorn``, each as one worker process, and keeps ``--concurrency``
+clients posting to ``schedule/`` for ``--duration`` seconds. Every request
+is drawn, with the weights of ``--mix``, from these kinds:
+
+* ``short-hit`` and ``long-hit``: a grant of ``--short-months`` or
+  ``--long-months`` out of a pool of ``--hit-pool`` grants, posted once
+  before the measure so the schedule cache answers them.
+* ``short-miss`` and ``long-miss``: a grant no other request uses, so the
+  schedule is computed.
+* ``invalid``: a grant with its cliff after its duration, answered 400.
+
+For every server and concurrency level the report has the requests per
+second, the latency percentiles overall and by kind, and the resident
+memory of the worker before and after the load and at its peak, read from
+``/proc`` (``None`` where there is no ``/proc``). A request answered with
+another status than its kind expects counts as an error. The clients run in
+this process, so on a small machine they compete with the server for the
+CPU; the requests per second of one worker are then a lower bound.
+
+    python -m benchmarks.capacity [--mix short-hit=40 long-miss=10 ...]
+        [--concurrency 1 8 32] [--output capacity.json]
+"""
+import argparse
+import datetime
+import http.client
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from typing import Optional
+
+from benchmarks.load_test import HOST, free_port, percentile, start_server
+
+SERVERS = ['wsgi', 'asgi']
+PATH = '/api/vesting/schedule/'
+PERCENTILES = {'p50_ms': 0.50, 'p90_ms': 0.90, 'p99_ms': 0.99,
+               'p999_ms': 0.999}
+
+SHORT_HIT = 'short-hit'
+SHORT_MISS = 'short-miss'
+LONG_HIT = 'long-hit'
+LONG_MISS = 'long-miss'
+INVALID = 'invalid'
+KINDS = (SHORT_HIT, SHORT_MISS, LONG_HIT, LONG_MISS, INVALID)
+DEFAULT_MIX = {SHORT_HIT: 40, SHORT_MISS: 25, LONG_HIT: 10, LONG_MISS: 15,
+               INVALID: 10}
+
+HIT_QUANTITY = 4800
+MISS_QUANTITY = 1000000
+
+
+def parse_mix(entries: list[str]) -> dict[str, float]:
+    """Weights of ``kind=weight`` entries, the kinds left out weighing 0."""
+
+    mix = dict.fromkeys(KINDS, 0.0)
+    for entry in entries:
+        kind, _, weight = entry.partition('=')
+        if kind not in mix:
+            raise argparse.ArgumentTypeError(
+                'Unknown kind {!r}, expected one of {}.'.format(
+                    kind, ', '.join(KINDS)))
+        mix[kind] = float(weight)
+
+    if sum(mix.values()) <= 0:
+        raise argparse.ArgumentTypeError('The mix weighs nothing.')
+    return mix
+
+
+class TrafficMix:
+    """Payloads of the kinds of a mix, drawn in a reproducible order."""
+
+    def __init__(self, mix: dict[str, float], short_months: int,
+                 long_months: int, hit_pool: int, seed: int = 0):
+        self.kinds = [kind for kind in KINDS if mix[kind] > 0]
+        self.weights = [mix[kind] for kind in self.kinds]
+        self.months = {SHORT_HIT: short_months, SHORT_MISS: short_months,
+                       LONG_HIT: long_months, LONG_MISS: long_months,
+                       INVALID: short_months}
+        self.hit_pool = hit_pool
+        self.random = random.Random(seed)
+        self.misses = itertools.count(MISS_QUANTITY)
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def payload(quantity: int, months: int, cliff: int) -> bytes:
+        return json.dumps({
+            'option_grants': [{
+                'quantity': quantity,
+                'start_date': '31-01-2018',
+                'cliff_months': cliff,
+                'duration_months': months,
+            }],
+            'company_valuations': [
+                {'price': '10.00', 'valuation_date': '09-12-2017'}],
+        }).encode('utf-8')
+
+    def hits(self) -> list[bytes]:
+        """Payloads of every hit kind of the mix, to warm the cache."""
+
+        return [self.payload(HIT_QUANTITY + index, self.months[kind],
+                             min(12, self.months[kind]))
+                for kind in self.kinds if kind in (SHORT_HIT, LONG_HIT)
+                for index in range(self.hit_pool)]
+
+    def draw(self) -> tuple[str, bytes, int]:
+        """Kind, payload and expected status of the next request."""
+
+        with self.lock:
+            kind = self.random.choices(self.kinds, self.weights)[0]
+            index = self.random.randrange(self.hit_pool)
+            miss = next(self.misses)
+
+        months = self.months[kind]
+        if kind == INVALID:
+            return kind, self.payload(miss, months, months + 1), 400
+        if kind in (SHORT_HIT, LONG_HIT):
+            return kind, self.payload(
+                HIT_QUANTITY + index, months, min(12, months)), 200
+        return kind, self.payload(miss, months, min(12, months)), 200
+
+
+def post(port: int, body: bytes) -> int:
+    """Status of a POST to the schedule endpoint, 0 on a network error."""
+
+    try:
+        connection = http.client.HTTPConnection(HOST, port, timeout=60)
+        connection.request('POST', PATH, body,
+                           {'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        response.read()
+        connection.close()
+        return response.status
+    except OSError:
+        return 0
+
+
+def worker_memory(pid: int) -> dict[str, Optional[float]]:
+    """Resident and peak resident memory of a process, in MiB."""
+
+    memory: dict[str, Optional[float]] = {'rss_mb': None, 'peak_rss_mb': None}
+    try:
+        with open('/proc/{}/status'.format(pid)) as status:
+            for line in status:
+                name, _, value = line.partition(':')
+                if name == 'VmRSS':
+                    memory['rss_mb'] = int(value.split()[0]) / 1024
+                elif name == 'VmHWM':
+                    memory['peak_rss_mb'] = int(value.split()[0]) / 1024
+    except OSError:
+        pass
+    return memory
+
+
+def latency_summary(latencies: list[float]) -> dict[str, Optional[float]]:
+    """Percentiles and maximum of latencies in seconds, in milliseconds."""
+
+    summary = {}
+    for name, fraction in PERCENTILES.items():
+        value = percentile(latencies, fraction)
+        summary[name] = None if value is None else value * 1e3
+    summary['max_ms'] = max(latencies) * 1e3 if latencies else None
+    return summary
+
+
+def run_mix(port: int, traffic: TrafficMix, concurrency: int,
+            duration: float) -> dict:
+    """Post the mix from ``concurrency`` clients for ``duration`` seconds."""
+
+    lock = threading.Lock()
+    latencies: dict[str, list[float]] = {kind: [] for kind in traffic.kinds}
+    errors = dict.fromkeys(traffic.kinds, 0)
+    deadline = time.monotonic() + duration
+
+    def client():
+        while time.monotonic() < deadline:
+            kind, body, expected = traffic.draw()
+
+            started = time.perf_counter()
+            answered = post(port, body)
+            elapsed = time.perf_counter() - started
+
+            with lock:
+                if answered == expected:
+                    latencies[kind].append(elapsed)
+                else:
+                    errors[kind] += 1
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    every_latency = [latency for kind in traffic.kinds
+                     for latency in latencies[kind]]
+    return {
+        'concurrency': concurrency,
+        'seconds': elapsed,
+        'requests': len(every_latency),
+        'errors': sum(errors.values()),
+        'requests_per_second': len(every_latency) / elapsed,
+        'latency': latency_summary(every_latency),
+        'kinds': {
+            kind: dict(requests=len(latencies[kind]), errors=errors[kind],
+                       **latency_summary(latencies[kind]))
+            for kind in traffic.kinds
+        },
+    }
+
+
+def measure_server(name: str, args, mix: dict[str, float]) -> list[dict]:
+    """Results of every concurrency level against one server."""
+
+    port = free_port()
+    process = start_server(
+        name, port, args.settings,
+        stderr=None if args.server_log else subprocess.DEVNULL)
+    results = []
+    try:
+        traffic = TrafficMix(mix, args.short_months, args.long_months,
+                             args.hit_pool, args.seed)
+        for body in traffic.hits():
+            post(port, body)
+
+        for concurrency in args.concurrency:
+            before = worker_memory(process.pid)
+            result = run_mix(port, traffic, concurrency, args.duration)
+            after = worker_memory(process.pid)
+            result.update(server=name, worker={
+                'pid': process.pid,
+                'rss_before_mb': before['rss_mb'],
+                'rss_after_mb': after['rss_mb'],
+                'peak_rss_mb': after['peak_rss_mb'],
+            })
+            results.append(result)
+            print_result(result)
+    finally:
+        process.terminate()
+        process.wait()
+    return results
+
+
+def print_result(result: dict) -> None:
+    latency = result['latency']
+    print('{server:>6} {concurrency:>11} {requests:>9} {errors:>7} '
+          '{requests_per_second:>9.1f} {p50:>9} {p99:>9} {rss:>9}'.format(
+              p50=format_number(latency['p50_ms']),
+              p99=format_number(latency['p99_ms']),
+              rss=format_number(result['worker']['peak_rss_mb']),
+              **result), flush=True)
+
+
+def format_number(value: Optional[float]) -> str:
+    return '-' if value is None else '{:.1f}'.format(value)
+
+
+def main() -> None:
+    """Measure every server and print a table, or save the report."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--servers', nargs='+', choices=SERVERS,
+                        default=SERVERS)
+    parser.add_argument('--concurrency', nargs='+', type=int,
+                        default=[1, 8, 32])
+    parser.add_argument('--duration', type=float, default=10.0,
+                        help='Seconds of load per concurrency level.')
+    parser.add_argument('--mix', nargs='+', metavar='KIND=WEIGHT',
+                        default=['{}={}'.format(kind, weight)
+                                 for kind, weight in DEFAULT_MIX.items()],
+                        help='Weights of the request kinds: {}.'.format(
+                            ', '.join(KINDS)))
+    parser.add_argument('--short-months', type=int, default=12)
+    parser.add_argument('--long-months', type=int, default=600)
+    parser.add_argument('--hit-pool', type=int, default=16,
+                        help='Distinct grants of every hit kind.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--settings', default='app.settings',
+                        help='Settings module of the servers.')
+    parser.add_argument('--server-log', action='store_true',
+                        help='Show the log of the servers, which report '
+                        'every invalid request.')
+    parser.add_argument('--output', help='Save the report to this file.')
+    args = parser.parse_args()
+
+    try:
+        mix = parse_mix(args.mix)
+    except argparse.ArgumentTypeError as exc:
+        parser.error(str(exc))
+
+    print('{:>6} {:>11} {:>9} {:>7} {:>9} {:>9} {:>9} {:>9}'.format(
+        'server', 'concurrency', 'requests', 'errors', 'req/s',
+        'p50 (ms)', 'p99 (ms)', 'rss (MiB)'))
+
+    results = []
+    for name in args.servers:
+        results.extend(measure_server(name, args, mix))
+
+    report = {
+        'created': datetime.datetime.now(
+            datetime.timezone.utc).isoformat(timespec='seconds'),
+        'machine': {
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+        },
+        'settings': args.settings,
+        'path': PATH,
+        'duration': args.duration,
+        'mix': {kind: weight for kind, weight in mix.items() if weight > 0},
+        'short_months': args.short_months,
+        'long_months': args.long_months,
+        'hit_pool': args.hit_pool,
+        'results': results,
+    }
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+            output.write('\n')
+
+
+if __name__ == '__main__':
+    main()
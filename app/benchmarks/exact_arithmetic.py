@@ -0,0 +1,85 @@
+"""
+Micro-benchmark of the exact arithmetic against the float one.
+
+Times ``ScheduleEngine.calculate`` with each arithmetic for a few schedule
+lengths, in CPU time, and reports the best run of each and the speedup of
+the exact arithmetic.
+
+    python -m benchmarks.exact_arithmetic [--repeat 7] [--number 10]
+"""
+import argparse
+import datetime
+import time
+import timeit
+from decimal import Decimal
+
+from vesting.engine.schedule_engine import EXACT, FLOAT, ScheduleEngine
+from vesting.models import CompanyValuation, OptionGrant
+
+DURATIONS = [48, 120, 600]
+
+COMPANY_VALUATION = CompanyValuation(
+    price=Decimal('10.37'),
+    valuation_date=datetime.date(2017, 12, 9),
+)
+
+
+def make_grant(duration: int) -> OptionGrant:
+    """A grant of ``duration`` months with a one year cliff."""
+
+    return OptionGrant(
+        quantity=1000003,
+        start_date=datetime.date(2018, 1, 31),
+        cliff_months=min(12, duration),
+        duration_months=duration,
+    )
+
+
+def best_time(schedule_engine: ScheduleEngine, option_grant: OptionGrant,
+              repeat: int, number: int) -> float:
+    """Best CPU time of one schedule, in seconds."""
+
+    timer = timeit.Timer(
+        lambda: schedule_engine.calculate(option_grant, COMPANY_VALUATION),
+        timer=time.process_time)
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run(repeat: int, number: int) -> list[dict]:
+    """Time both arithmetics for every schedule length."""
+
+    float_engine = ScheduleEngine(FLOAT)
+    exact_engine = ScheduleEngine(EXACT)
+
+    results = []
+    for duration in DURATIONS:
+        option_grant = make_grant(duration)
+        float_seconds = best_time(float_engine, option_grant, repeat, number)
+        exact_seconds = best_time(exact_engine, option_grant, repeat, number)
+        results.append({
+            'rows': duration + 1,
+            'float_us': float_seconds * 1e6,
+            'exact_us': exact_seconds * 1e6,
+            'speedup': float_seconds / exact_seconds,
+        })
+
+    return results
+
+
+def main():
+    """Run the benchmark and print a table."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--number', type=int, default=10)
+    args = parser.parse_args()
+
+    print('{:>6} {:>12} {:>12} {:>8}'.format(
+        'rows', 'float (us)', 'exact (us)', 'speedup'))
+    for result in run(args.repeat, args.number):
+        print('{rows:>6} {float_us:>12.1f} {exact_us:>12.1f} '
+              '{speedup:>7.2f}x'.format(**result))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,272 @@
+"""
+Load test of the batch schedule endpoints, WSGI against ASGI.
+
+Starts each server in its own process, then keeps ``--concurrency`` clients
+posting batches for ``--duration`` seconds and reports the requests per
+second and the p50 and p99 latencies:
+
+* ``wsgi``: ``app.wsgi`` on a threaded ``wsgiref`` server, posting to the
+  synchronous ``schedule/batch/`` endpoint.
+* ``asgi``: ``app.asgi`` on ``uvicorn``, posting to the async
+  ``async/schedule/batch/`` endpoint.
+
+Every request uses new grant quantities, so the schedule cache does not
+answer in place of the computation. The clients run in this process, so on
+a small machine they compete with the server for the CPU.
+
+    python -m benchmarks.load_test [--concurrency 1 8 32] [--grants 200]
+"""
+import argparse
+import http.client
+import itertools
+import json
+import math
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from typing import Optional
+from wsgiref.simple_server import (WSGIRequestHandler, WSGIServer,
+                                   make_server)
+
+SERVERS = {
+    'wsgi': '/api/vesting/schedule/batch/',
+    'asgi': '/api/vesting/async/schedule/batch/',
+}
+HOST = '127.0.0.1'
+
+# app.settings_production requires both; the servers are only reached at
+# HOST.
+SERVER_ENVIRON = {
+    'DJANGO_SECRET_KEY': 'benchmark',
+    'DJANGO_ALLOWED_HOSTS': HOST,
+}
+
+
+class ThreadingWSGIServer(socketserver.ThreadingMixIn, WSGIServer):
+    """A ``wsgiref`` server handling every request in its own thread."""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class QuietWSGIRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_wsgi(port: int) -> None:
+    """Serve ``app.wsgi`` until killed."""
+
+    from app.wsgi import application
+
+    make_server(HOST, port, application, server_class=ThreadingWSGIServer,
+                handler_class=QuietWSGIRequestHandler).serve_forever()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def server_environ(settings_module: str) -> dict[str, str]:
+    """Environment of a server process, ``SERVER_ENVIRON`` by default."""
+
+    env = dict(SERVER_ENVIRON)
+    env.update(os.environ)
+    env['DJANGO_SETTINGS_MODULE'] = settings_module
+    return env
+
+
+def start_server(name: str, port: int, settings_module: str,
+                 stderr=None) -> subprocess.Popen:
+    """
+    Start a server process and wait until it accepts connections.
+
+    ``stderr`` is passed to ``subprocess.Popen``, to silence the log of the
+    server for instance.
+    """
+
+    if name == 'wsgi':
+        command = [sys.executable, '-m', 'benchmarks.load_test',
+                   '--serve-wsgi', str(port)]
+    else:
+        command = [sys.executable, '-m', 'uvicorn', 'app.asgi:application',
+                   '--host', HOST, '--port', str(port), '--log-level',
+                   'warning', '--no-access-log']
+
+    return start_process(name, command, port, settings_module, stderr)
+
+
+def start_process(name: str, command: list[str], port: int,
+                  settings_module: str, stderr=None) -> subprocess.Popen:
+    """Start a server command and wait until it accepts connections."""
+
+    process = subprocess.Popen(command, env=server_environ(settings_module),
+                               stderr=stderr)
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError('{} server exited early.'.format(name))
+        try:
+            socket.create_connection((HOST, port), timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+
+    process.kill()
+    raise RuntimeError('{} server did not start.'.format(name))
+
+
+def make_payload(batch: int, grants: int, duration: int) -> bytes:
+    """A batch of grants with quantities no other request uses."""
+
+    return json.dumps({
+        'option_grants': [
+            {
+                'id': str(index),
+                'quantity': 4800 + batch * grants + index,
+                'start_date': '31-01-2018',
+                'cliff_months': 12,
+                'duration_months': duration,
+            }
+            for index in range(grants)
+        ],
+        'company_valuations': [
+            {'price': '10.00', 'valuation_date': '09-12-2017'},
+            {'price': '12.50', 'valuation_date': '30-06-2019'},
+        ],
+    }).encode('utf-8')
+
+
+def percentile(latencies: list[float], fraction: float) -> Optional[float]:
+    if not latencies:
+        return None
+    ordered = sorted(latencies)
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+def run_load(port: int, path: str, concurrency: int, duration: float,
+             grants: int, months: int) -> dict:
+    """Post batches from ``concurrency`` clients for ``duration`` seconds."""
+
+    batches = itertools.count()
+    lock = threading.Lock()
+    latencies: list[float] = []
+    errors = [0]
+    deadline = time.monotonic() + duration
+
+    def client():
+        while time.monotonic() < deadline:
+            with lock:
+                batch = next(batches)
+            body = make_payload(batch, grants, months)
+
+            started = time.perf_counter()
+            try:
+                connection = http.client.HTTPConnection(
+                    HOST, port, timeout=60)
+                connection.request('POST', path, body, {
+                    'Content-Type': 'application/json'})
+                response = connection.getresponse()
+                response.read()
+                connection.close()
+                failed = response.status != 200
+            except OSError:
+                failed = True
+            elapsed = time.perf_counter() - started
+
+            with lock:
+                if failed:
+                    errors[0] += 1
+                else:
+                    latencies.append(elapsed)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    p50 = percentile(latencies, 0.50)
+    p99 = percentile(latencies, 0.99)
+    return {
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'errors': errors[0],
+        'requests_per_second': len(latencies) / elapsed,
+        'p50_ms': None if p50 is None else p50 * 1e3,
+        'p99_ms': None if p99 is None else p99 * 1e3,
+    }
+
+
+def print_result(result: dict) -> None:
+    print('{server:>6} {concurrency:>11} {requests:>9} {errors:>7} '
+          '{requests_per_second:>9.1f} {p50:>9} {p99:>9}'.format(
+              p50='-' if result['p50_ms'] is None else
+              '{:.1f}'.format(result['p50_ms']),
+              p99='-' if result['p99_ms'] is None else
+              '{:.1f}'.format(result['p99_ms']),
+              **result), flush=True)
+
+
+def main() -> None:
+    """Run the load test against every server and print a table."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--servers', nargs='+', choices=list(SERVERS),
+                        default=list(SERVERS))
+    parser.add_argument('--concurrency', nargs='+', type=int,
+                        default=[1, 8, 32])
+    parser.add_argument('--duration', type=float, default=10.0,
+                        help='Seconds of load per concurrency level.')
+    parser.add_argument('--grants', type=int, default=200,
+                        help='Option grants per batch.')
+    parser.add_argument('--months', type=int, default=48,
+                        help='Duration of every grant.')
+    parser.add_argument('--settings', default='app.settings',
+                        help='Settings module of the servers, for example '
+                        'one with a process VESTING_SCHEDULE_EXECUTOR.')
+    parser.add_argument('--output', help='Save the results to this file.')
+    parser.add_argument('--serve-wsgi', type=int, metavar='PORT',
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve_wsgi:
+        serve_wsgi(args.serve_wsgi)
+        return
+
+    print('{:>6} {:>11} {:>9} {:>7} {:>9} {:>9} {:>9}'.format(
+        'server', 'concurrency', 'requests', 'errors', 'req/s',
+        'p50 (ms)', 'p99 (ms)'))
+
+    results = []
+    for name in args.servers:
+        port = free_port()
+        process = start_server(name, port, args.settings)
+        try:
+            for concurrency in args.concurrency:
+                result = dict(run_load(
+                    port, SERVERS[name], concurrency, args.duration,
+                    args.grants, args.months), server=name)
+                results.append(result)
+                print_result(result)
+        finally:
+            process.terminate()
+            process.wait()
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2)
+            output.write('\n')
+
+
+if __name__ == '__main__':
+    main()
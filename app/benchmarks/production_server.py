@@ -0,0 +1,125 @@
+"""
+Throughput of the production server against ``runserver``.
+
+Starts each server in turn and replays the default traffic mix of
+``benchmarks.capacity`` to the schedule endpoint from ``--concurrency``
+clients for ``--duration`` seconds:
+
+* ``runserver``: ``manage.py runserver``, threaded, without the reloader.
+* ``gunicorn``: ``python -m app.server`` with ``--workers`` sync workers,
+  one per core by default.
+* ``gunicorn-asgi``: the same with ``--asgi``.
+
+Every server uses the ``--settings`` module, ``app.settings`` by default,
+so the gain reported is the server's: the requests per second of a server
+divided by those of ``runserver`` at the same concurrency.
+
+    python -m benchmarks.production_server [--concurrency 1 8 32]
+        [--workers 4] [--output server.json]
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+from benchmarks.capacity import (DEFAULT_MIX, TrafficMix, format_number,
+                                 post, run_mix)
+from benchmarks.load_test import HOST, free_port, start_process
+
+SERVERS = ['runserver', 'gunicorn', 'gunicorn-asgi']
+
+
+def server_command(name: str, port: int, workers: int) -> list[str]:
+    """Command running a server on a port."""
+
+    if name == 'runserver':
+        return [sys.executable, 'manage.py', 'runserver', '--noreload',
+                '{}:{}'.format(HOST, port)]
+
+    command = [sys.executable, '-m', 'app.server',
+               '--bind', '{}:{}'.format(HOST, port)]
+    if workers:
+        command += ['--workers', str(workers)]
+    if name == 'gunicorn-asgi':
+        command.append('--asgi')
+    return command
+
+
+def measure(name: str, args) -> list[dict]:
+    """Results of every concurrency level against one server."""
+
+    port = free_port()
+    process = start_process(
+        name, server_command(name, port, args.workers), port, args.settings,
+        stderr=subprocess.DEVNULL)
+    results = []
+    try:
+        traffic = TrafficMix(DEFAULT_MIX, 12, 600, 16)
+        for body in traffic.hits():
+            post(port, body)
+
+        for concurrency in args.concurrency:
+            result = run_mix(port, traffic, concurrency, args.duration)
+            results.append({
+                'server': name,
+                'concurrency': concurrency,
+                'requests': result['requests'],
+                'errors': result['errors'],
+                'requests_per_second': result['requests_per_second'],
+                'p50_ms': result['latency']['p50_ms'],
+                'p99_ms': result['latency']['p99_ms'],
+            })
+    finally:
+        process.terminate()
+        process.wait()
+    return results
+
+
+def main() -> None:
+    """Measure every server and print their gain over runserver."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--servers', nargs='+', choices=SERVERS,
+                        default=SERVERS)
+    parser.add_argument('--concurrency', nargs='+', type=int,
+                        default=[1, 8, 32])
+    parser.add_argument('--duration', type=float, default=10.0,
+                        help='Seconds of load per concurrency level.')
+    parser.add_argument('--workers', type=int,
+                        help='Workers of gunicorn, by default one per core.')
+    parser.add_argument('--settings', default='app.settings',
+                        help='Settings module of every server.')
+    parser.add_argument('--output', help='Save the results to this file.')
+    args = parser.parse_args()
+
+    results = []
+    for name in args.servers:
+        results.extend(measure(name, args))
+
+    baseline = {result['concurrency']: result['requests_per_second']
+                for result in results if result['server'] == 'runserver'}
+    for result in results:
+        reference = baseline.get(result['concurrency'])
+        result['gain'] = (result['requests_per_second'] / reference
+                          if reference else None)
+
+    print('{:>13} {:>11} {:>9} {:>7} {:>9} {:>9} {:>9} {:>6}'.format(
+        'server', 'concurrency', 'requests', 'errors', 'req/s',
+        'p50 (ms)', 'p99 (ms)', 'gain'))
+    for result in results:
+        print('{server:>13} {concurrency:>11} {requests:>9} {errors:>7} '
+              '{requests_per_second:>9.1f} {p50:>9} {p99:>9} {times:>6}'
+              .format(p50=format_number(result['p50_ms']),
+                      p99=format_number(result['p99_ms']),
+                      times='-' if result['gain'] is None else
+                      '{:.2f}x'.format(result['gain']),
+                      **result))
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2)
+            output.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,381 @@
+"""
+Benchmark suite of the schedule pipeline.
+
+Times every stage of a schedule request on its own, for several schedule
+durations and batch sizes:
+
+* ``month``: ``calculate_vest_of_a_month`` for every month, as the legacy
+  loop did.
+* ``vests``: ``GenerateScheduleUseCase._calculate_vests``.
+* ``serializer``: ``OptionCompanyValuationSerializer``, the reference
+  validation of the schedule payload.
+* ``validator``: ``OptionCompanyValuationValidator``, the fast validation
+  the schedule endpoint uses.
+* ``output``: ``VestSerializer(many=True).data``.
+* ``api``: a full ``APIClient`` POST to ``schedule/`` per grant.
+* ``api_batch``: one ``APIClient`` POST of the grants to ``schedule/batch/``.
+
+A batch of ``n`` runs a stage on ``n`` distinct grants. The schedule cache
+is off unless ``--cache`` is given, so repeated runs measure the work and
+not the cache.
+
+Results can be saved as JSON and compared against a baseline; the command
+exits with status 1 when a case is slower than the baseline by more than
+its threshold::
+
+    python -m benchmarks.schedule_pipeline --output results.json
+    python -m benchmarks.schedule_pipeline --baseline benchmarks/baseline.json
+    python -m benchmarks.schedule_pipeline --durations 48 600 \\
+        --threshold 0.2 --stage-threshold api=0.5
+
+``benchmarks/baseline.json`` is only meaningful on the machine it was
+recorded on; refresh it there with ``--output benchmarks/baseline.json``.
+"""
+import argparse
+import datetime
+import json
+import platform
+import sys
+import time
+import timeit
+from decimal import Decimal
+from typing import Callable, Optional
+
+import django
+import numpy as np
+import rest_framework
+from django.test.utils import override_settings, setup_test_environment
+from django.urls import reverse
+from rest_framework.test import APIClient
+from vesting.engine.valuation_timeline import ValuationTimeline
+from vesting.models import CompanyValuation, OptionGrant
+from vesting.serializers import (OptionCompanyValuationSerializer,
+                                 VestSerializer)
+from vesting.use_cases.generate_schedule.generate_schedule_use_case import \
+    GenerateScheduleUseCase
+from vesting.validators import OptionCompanyValuationValidator
+
+DURATIONS = [12, 48, 120, 600]
+BATCH_SIZES = [1, 10, 100]
+DEFAULT_THRESHOLD = 0.25
+START_DATE = datetime.date(2018, 1, 31)
+VALUATION_DATE = datetime.date(2017, 12, 9)
+PRICE = Decimal('10.00')
+
+
+def make_option_grants(duration: int, batch_size: int) -> list[OptionGrant]:
+    """Distinct grants of ``duration`` months, so nothing is shared."""
+
+    return [
+        OptionGrant(
+            quantity=4800 + index,
+            start_date=START_DATE,
+            cliff_months=min(12, duration),
+            duration_months=duration,
+        )
+        for index in range(batch_size)
+    ]
+
+
+def grant_payload(option_grant: OptionGrant) -> dict:
+    """Request body of an option grant."""
+
+    return {
+        'quantity': option_grant.quantity,
+        'start_date': option_grant.start_date.strftime('%d-%m-%Y'),
+        'cliff_months': option_grant.cliff_months,
+        'duration_months': option_grant.duration_months,
+    }
+
+
+VALUATION_PAYLOAD = {
+    'price': str(PRICE),
+    'valuation_date': VALUATION_DATE.strftime('%d-%m-%Y'),
+}
+
+
+def month_stage(option_grants: list[OptionGrant]) -> Callable:
+    company_valuation = CompanyValuation(PRICE, VALUATION_DATE)
+
+    def run():
+        for option_grant in option_grants:
+            for month in range(option_grant.duration_months + 1):
+                GenerateScheduleUseCase.calculate_vest_of_a_month(
+                    option_grant.start_date,
+                    option_grant.cliff_months,
+                    option_grant.duration_months,
+                    option_grant.quantity,
+                    company_valuation.price,
+                    month,
+                )
+
+    return run
+
+
+def vests_stage(option_grants: list[OptionGrant]) -> Callable:
+    use_case = GenerateScheduleUseCase()
+    valuation_timeline = ValuationTimeline.of(
+        CompanyValuation(PRICE, VALUATION_DATE))
+
+    def run():
+        for option_grant in option_grants:
+            use_case._calculate_vests(option_grant, valuation_timeline)
+
+    return run
+
+
+def schedule_payloads(option_grants: list[OptionGrant]) -> list[dict]:
+    """Request body of the schedule endpoint for every grant."""
+
+    return [
+        {'option_grants': [grant_payload(option_grant)],
+         'company_valuations': [VALUATION_PAYLOAD]}
+        for option_grant in option_grants
+    ]
+
+
+def validation_stage(validator_class) -> Callable:
+    """Stage validating every payload with a serializer or validator."""
+
+    def stage(option_grants: list[OptionGrant]) -> Callable:
+        payloads = schedule_payloads(option_grants)
+
+        def run():
+            for payload in payloads:
+                validator = validator_class(data=payload)
+                if not validator.is_valid():
+                    raise AssertionError(validator.errors)
+
+        return run
+
+    return stage
+
+
+def output_stage(option_grants: list[OptionGrant]) -> Callable:
+    use_case = GenerateScheduleUseCase()
+    company_valuation = CompanyValuation(PRICE, VALUATION_DATE)
+    schedules = [use_case.execute(option_grant, company_valuation)
+                 for option_grant in option_grants]
+
+    def run():
+        for schedule in schedules:
+            VestSerializer(schedule, many=True).data
+
+    return run
+
+
+def api_stage(option_grants: list[OptionGrant]) -> Callable:
+    client = APIClient()
+    url = reverse('vesting:schedule')
+    payloads = schedule_payloads(option_grants)
+
+    def run():
+        for payload in payloads:
+            response = client.post(url, payload, format='json')
+            if response.status_code != 200:
+                raise AssertionError(response.content)
+
+    return run
+
+
+def api_batch_stage(option_grants: list[OptionGrant]) -> Callable:
+    client = APIClient()
+    url = reverse('vesting:schedule-batch')
+    payload = {
+        'option_grants': [
+            dict(grant_payload(option_grant), id=str(index))
+            for index, option_grant in enumerate(option_grants)
+        ],
+        'company_valuations': [VALUATION_PAYLOAD],
+    }
+
+    def run():
+        response = client.post(url, payload, format='json')
+        if response.status_code != 200 or response.data['errors']:
+            raise AssertionError(response.content)
+
+    return run
+
+
+STAGES = {
+    'month': month_stage,
+    'vests': vests_stage,
+    'serializer': validation_stage(OptionCompanyValuationSerializer),
+    'validator': validation_stage(OptionCompanyValuationValidator),
+    'output': output_stage,
+    'api': api_stage,
+    'api_batch': api_batch_stage,
+}
+
+
+def best_time(function: Callable, repeat: int, min_time: float) -> float:
+    """Best time of one call, in seconds."""
+
+    timer = timeit.Timer(function)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+
+    return min([elapsed] + timer.repeat(repeat - 1, number)) / number
+
+
+def case_key(result: dict) -> tuple:
+    return result['stage'], result['duration'], result['batch_size']
+
+
+def run(stages: list[str], durations: list[int], batch_sizes: list[int],
+        repeat: int, min_time: float,
+        progress: Optional[Callable[[dict], None]] = None) -> list[dict]:
+    """Time every stage for every duration and batch size."""
+
+    results = []
+    for stage in stages:
+        for duration in durations:
+            for batch_size in batch_sizes:
+                seconds = best_time(
+                    STAGES[stage](make_option_grants(duration, batch_size)),
+                    repeat, min_time)
+                result = {
+                    'stage': stage,
+                    'duration': duration,
+                    'batch_size': batch_size,
+                    'seconds': seconds,
+                    'us_per_schedule': seconds / batch_size * 1e6,
+                }
+                results.append(result)
+                if progress is not None:
+                    progress(result)
+
+    return results
+
+
+def environment() -> dict:
+    """Versions the timings depend on."""
+
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'django': django.get_version(),
+        'djangorestframework': rest_framework.VERSION,
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+
+
+def compare(results: list[dict], baseline: list[dict],
+            threshold: float = DEFAULT_THRESHOLD,
+            stage_thresholds: Optional[dict] = None) -> list[dict]:
+    """
+    Cases slower than the baseline by more than their threshold.
+
+    A threshold of 0.25 lets a case be up to 25% slower. Cases missing from
+    either side are not compared.
+    """
+
+    stage_thresholds = stage_thresholds or {}
+    baseline_seconds = {case_key(result): result['seconds']
+                        for result in baseline}
+
+    regressions = []
+    for result in results:
+        expected = baseline_seconds.get(case_key(result))
+        if not expected:
+            continue
+
+        allowed = stage_thresholds.get(result['stage'], threshold)
+        ratio = result['seconds'] / expected
+        if ratio > 1 + allowed:
+            regressions.append(dict(
+                result, baseline_seconds=expected, ratio=ratio,
+                threshold=allowed))
+
+    return regressions
+
+
+def parse_stage_threshold(value: str) -> tuple[str, float]:
+    """Stage and allowed slowdown of a ``<stage>=<threshold>`` argument."""
+
+    stage, _, threshold = value.partition('=')
+    try:
+        allowed = float(threshold)
+    except ValueError:
+        allowed = None
+    if stage not in STAGES or allowed is None or not allowed >= 0:
+        raise argparse.ArgumentTypeError(
+            "Expected <stage>=<threshold> with a stage of {} and a "
+            "threshold of 0 or more.".format(', '.join(STAGES)))
+    return stage, allowed
+
+
+def print_result(result: dict) -> None:
+    print('{stage:>10} {duration:>8} {batch_size:>6} '
+          '{seconds:>12.6f} {us_per_schedule:>14.1f}'.format(**result),
+          flush=True)
+
+
+def main() -> int:
+    """Run the suite, save it and compare it against a baseline."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES),
+                        default=list(STAGES))
+    parser.add_argument('--durations', nargs='+', type=int,
+                        default=DURATIONS)
+    parser.add_argument('--batch-sizes', nargs='+', type=int,
+                        default=BATCH_SIZES)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--min-time', type=float, default=0.05,
+                        help='Minimum seconds of one timing run.')
+    parser.add_argument('--cache', action='store_true',
+                        help='Keep the schedule cache settings.')
+    parser.add_argument('--output', help='Save the results to this file.')
+    parser.add_argument('--baseline', help='Compare against this file.')
+    parser.add_argument('--threshold', type=float,
+                        default=DEFAULT_THRESHOLD,
+                        help='Allowed slowdown, 0.25 being 25%%.')
+    parser.add_argument('--stage-threshold', type=parse_stage_threshold,
+                        action='append', default=[],
+                        help='Allowed slowdown of one stage, as api=0.5.')
+    args = parser.parse_args()
+
+    setup_test_environment()
+    settings = {} if args.cache else {
+        'VESTING_SCHEDULE_CACHE': {'BACKEND': None}}
+
+    print('{:>10} {:>8} {:>6} {:>12} {:>14}'.format(
+        'stage', 'duration', 'batch', 'seconds', 'us/schedule'))
+    with override_settings(**settings):
+        results = run(args.stages, args.durations, args.batch_sizes,
+                      args.repeat, args.min_time, progress=print_result)
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump({'environment': environment(), 'results': results},
+                      output, indent=2)
+            output.write('\n')
+
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline) as baseline:
+        regressions = compare(
+            results, json.load(baseline)['results'], args.threshold,
+            dict(args.stage_threshold))
+
+    for regression in regressions:
+        print('REGRESSION {stage} duration={duration} '
+              'batch_size={batch_size}: {seconds:.6f}s vs '
+              '{baseline_seconds:.6f}s ({ratio:.2f}x, allowed '
+              '{threshold:.0%})'.format(**regression))
+    if not regressions:
+        print('No regression against {}.'.format(args.baseline))
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
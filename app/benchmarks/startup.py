@@ -0,0 +1,162 @@
+"""
+Benchmark of the worker start and of the per request overhead.
+
+Starts a fresh interpreter ``--runs`` times for every settings module and
+reports, as medians:
+
+* ``start``: wall time of the process until it answered its first request,
+  interpreter start included.
+* ``setup``, ``handler``, ``urls``, ``first``: ``django.setup()``, the WSGI
+  handler with its middleware, the URL configuration and the first request.
+* ``modules`` and ``rss``: modules imported and peak resident memory after
+  the first request.
+* ``request``: time of one more request, once warm, posting a one year
+  grant to the schedule endpoint through the WSGI application. The schedule
+  cache answers these requests, so the time is the framework overhead.
+
+The measured processes do not import this package, which sets Django up on
+import.
+
+    python -m benchmarks.startup [--runs 10] [--requests 2000]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.load_test import server_environ
+
+SETTINGS_MODULES = ['app.settings', 'app.settings_production']
+
+MEASURE = '''
+import io
+import json
+import resource
+import sys
+import time
+from wsgiref.util import setup_testing_defaults
+
+started = time.perf_counter()
+import django
+django.setup()
+set_up = time.perf_counter()
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.urls import get_resolver
+application = WSGIHandler()
+handler = time.perf_counter()
+get_resolver().url_patterns
+urls = time.perf_counter()
+
+BODY = json.dumps({
+    "option_grants": [{"quantity": 1200, "start_date": "31-01-2018",
+                       "cliff_months": 0, "duration_months": 12}],
+    "company_valuations": [{"price": "10.00",
+                            "valuation_date": "09-12-2017"}],
+}).encode()
+
+
+def post():
+    environ = {}
+    setup_testing_defaults(environ)
+    environ.update({
+        "REQUEST_METHOD": "POST",
+        "PATH_INFO": "/api/vesting/schedule/",
+        "CONTENT_TYPE": "application/json",
+        "CONTENT_LENGTH": str(len(BODY)),
+        "wsgi.input": io.BytesIO(BODY),
+    })
+    statuses = []
+    result = application(
+        environ, lambda status, headers, exc_info=None:
+        statuses.append(status))
+    b"".join(result)
+    result.close()
+    assert statuses == ["200 OK"], statuses
+
+
+post()
+first = time.perf_counter()
+first_done = time.time()
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+modules = len(sys.modules)
+
+requests = int(sys.argv[1])
+request_started = time.perf_counter()
+for _ in range(requests):
+    post()
+request = (time.perf_counter() - request_started) / requests
+
+print(json.dumps({
+    "setup_ms": (set_up - started) * 1e3,
+    "handler_ms": (handler - set_up) * 1e3,
+    "urls_ms": (urls - handler) * 1e3,
+    "first_ms": (first - urls) * 1e3,
+    "first_done": first_done,
+    "modules": modules,
+    "rss_mb": rss / 1024,
+    "request_us": request * 1e6,
+}))
+'''
+
+
+def measure(settings_module: str, requests: int) -> dict:
+    """Start one process and measure it."""
+
+    launched = time.time()
+    completed = subprocess.run(
+        [sys.executable, '-c', MEASURE, str(requests)],
+        env=server_environ(settings_module),
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        stdout=subprocess.PIPE, check=True)
+
+    result = json.loads(completed.stdout)
+    result['start_ms'] = (result.pop('first_done') - launched) * 1e3
+    return result
+
+
+def run(settings_modules: list[str], runs: int, requests: int) -> list[dict]:
+    """Median of every measure, per settings module."""
+
+    samples: dict[str, list[dict]] = {module: [] for module in
+                                      settings_modules}
+    # Interleaved, so that a slower moment of the machine affects every
+    # settings module alike.
+    for _ in range(runs):
+        for settings_module in settings_modules:
+            samples[settings_module].append(
+                measure(settings_module, requests))
+
+    return [
+        dict({key: statistics.median(sample[key] for sample in
+                                     samples[settings_module])
+              for key in samples[settings_module][0]},
+             settings=settings_module)
+        for settings_module in settings_modules
+    ]
+
+
+def main():
+    """Run the benchmark and print a table."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--settings', nargs='+', default=SETTINGS_MODULES)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    print('{:<24} {:>9} {:>9} {:>9} {:>9} {:>9} {:>8} {:>8} {:>12}'.format(
+        'settings', 'start', 'setup', 'handler', 'urls', 'first',
+        'modules', 'rss', 'request'))
+    for result in run(args.settings, args.runs, args.requests):
+        print('{settings:<24} {start_ms:>7.1f}ms {setup_ms:>7.1f}ms '
+              '{handler_ms:>7.1f}ms {urls_ms:>7.1f}ms {first_ms:>7.1f}ms '
+              '{modules:>8.0f} {rss_mb:>6.1f}MB {request_us:>10.1f}us'.format(
+                  **result))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Micro-benchmark of the vest JSON output.
+
+Compares ``VestSerializer(many=True).data`` rendered by ``JSONRenderer``
+with the fast path of ``VestRepresentation`` rendered by
+``VestJSONRenderer``, for a few schedule lengths.
+
+    python -m benchmarks.vest_encoder [--repeat 5] [--number 200]
+"""
+import argparse
+import datetime
+import timeit
+from decimal import Decimal
+
+from rest_framework.renderers import JSONRenderer
+from vesting.encoders import VestRepresentation
+from vesting.engine.schedule_engine import ScheduleEngine
+from vesting.models import CompanyValuation, OptionGrant
+from vesting.renderers import VestJSONRenderer
+from vesting.serializers import VestSerializer
+
+DURATIONS = [48, 120, 600]
+
+
+def make_schedule(duration: int) -> list:
+    """A schedule of ``duration + 1`` vests."""
+
+    return ScheduleEngine().calculate(
+        OptionGrant(
+            quantity=4800,
+            start_date=datetime.date(2018, 1, 31),
+            cliff_months=12,
+            duration_months=duration,
+        ),
+        CompanyValuation(
+            price=Decimal('10.00'),
+            valuation_date=datetime.date(2017, 12, 9),
+        ),
+    )
+
+
+def drf_path(schedule: list) -> bytes:
+    """Today's output path."""
+
+    return JSONRenderer().render(VestSerializer(schedule, many=True).data)
+
+
+def fast_path(schedule: list) -> bytes:
+    """The fast output path."""
+
+    return VestJSONRenderer().render(VestRepresentation(schedule))
+
+
+def best_time(function, schedule: list, repeat: int, number: int) -> float:
+    """Best time of one call, in seconds."""
+
+    return min(timeit.repeat(
+        lambda: function(schedule), repeat=repeat, number=number)) / number
+
+
+def run(repeat: int, number: int) -> list[dict]:
+    """Time both paths for every schedule length."""
+
+    results = []
+    for duration in DURATIONS:
+        schedule = make_schedule(duration)
+        assert drf_path(schedule) == fast_path(schedule)
+
+        drf_seconds = best_time(drf_path, schedule, repeat, number)
+        fast_seconds = best_time(fast_path, schedule, repeat, number)
+        results.append({
+            'rows': len(schedule),
+            'drf_us': drf_seconds * 1e6,
+            'fast_us': fast_seconds * 1e6,
+            'speedup': drf_seconds / fast_seconds,
+        })
+
+    return results
+
+
+def main():
+    """Run the benchmark and print a table."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--number', type=int, default=200)
+    args = parser.parse_args()
+
+    print('{:>6} {:>12} {:>12} {:>8}'.format(
+        'rows', 'drf (us)', 'fast (us)', 'speedup'))
+    for result in run(args.repeat, args.number):
+        print('{rows:>6} {drf_us:>12.1f} {fast_us:>12.1f} '
+              '{speedup:>7.1f}x'.format(**result))
+
+
+if __name__ == '__main__':
+    main()
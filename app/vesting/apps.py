@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class VestingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'vesting'
+
+    def ready(self):
+        from vesting.schedule_cache import cache_metrics
+
+        from app.shared.instrumentation import register_collector
+
+        register_collector(cache_metrics)
@@ -0,0 +1,102 @@
+"""
+Columnar encoding of schedules.
+
+The JSON of a schedule repeats its keys and formats a date on every vest.
+``MessagePack`` responses (``application/msgpack``) send each schedule as a
+map of delta encoded columns instead:
+
+* ``version``: ``1``, the version of this layout.
+* ``length``: the number of vests.
+* ``date``: the days from 1970-01-01 to the first vest date, then the days
+  from each vest date to the next.
+* ``vested_quantity``: the first vested quantity, then the increment from
+  each vest to the next.
+* ``total_value``: the first total value in cents, then the increment in
+  cents from each vest to the next.
+* ``end_date``: only in collapsed schedules, the days from the date of each
+  vest to the ``end_date`` of its run, 0 for a single vest.
+
+A vest is rebuilt by summing each column up to it, so it has the values of
+its ``VestSerializer`` rendering; ``columns_to_representation`` does so.
+Between monthly vests the deltas are small integers, most of them a single
+MessagePack byte. Dates are in days rather than months so every frequency
+and collapsed run decodes without the month end rules of the schedule.
+"""
+import datetime
+from typing import Iterable
+
+from vesting.encoders import format_date, value_cents
+from vesting.engine.month_dates import EPOCH_ORDINAL
+from vesting.models import Vest, VestRange
+
+COLUMNS_VERSION = 1
+
+
+def _deltas(values: list[int]) -> list[int]:
+    """The first value, then the difference of every value to the previous."""
+
+    return values[:1] + [value - previous
+                         for previous, value in zip(values, values[1:])]
+
+
+def _sums(deltas: list[int]) -> list[int]:
+    """The values ``_deltas`` encoded."""
+
+    values = []
+    total = 0
+    for delta in deltas:
+        total += delta
+        values.append(total)
+    return values
+
+
+def vests_to_columns(vests: Iterable[Vest]) -> dict:
+    """Columns of a schedule."""
+
+    vests = list(vests)
+    ordinals = [vest.date.toordinal() for vest in vests]
+    columns = {
+        'version': COLUMNS_VERSION,
+        'length': len(vests),
+        'date': _deltas([ordinal - EPOCH_ORDINAL for ordinal in ordinals]),
+        'vested_quantity': _deltas(
+            [int(vest.vested_quantity) for vest in vests]),
+        'total_value': _deltas(
+            [value_cents(vest.total_value) for vest in vests]),
+    }
+
+    if any(type(vest) is VestRange for vest in vests):
+        columns['end_date'] = [
+            vest.end_date.toordinal() - ordinal
+            if type(vest) is VestRange else 0
+            for vest, ordinal in zip(vests, ordinals)
+        ]
+    return columns
+
+
+def columns_to_representation(columns: dict) -> list[dict]:
+    """The rendered vests of a schedule's columns, as ``VestSerializer``."""
+
+    if columns['version'] != COLUMNS_VERSION:
+        raise ValueError('Unknown columns version {!r}.'.format(
+            columns['version']))
+
+    dates = [datetime.date.fromordinal(EPOCH_ORDINAL + day)
+             for day in _sums(columns['date'])]
+    representations = [
+        {
+            'vested_quantity': quantity,
+            'total_value': '{}.{:02d}'.format(*divmod(cents, 100)),
+            'date': format_date(date),
+        }
+        for quantity, cents, date in zip(
+            _sums(columns['vested_quantity']),
+            _sums(columns['total_value']), dates)
+    ]
+
+    for representation, date, days in zip(
+            representations, dates, columns.get('end_date', ())):
+        if days:
+            representation['end_date'] = format_date(
+                date + datetime.timedelta(days=days))
+    return representations
@@ -0,0 +1,94 @@
+"""
+Dates of the months of a schedule.
+
+``start_date + relativedelta(months=n)`` builds a ``relativedelta``,
+normalizes it and clamps the day, all in Python, for every month. Here the
+year and month come from one ``divmod`` of the month count and the day is
+clamped with a table of month lengths, giving the same dates: a grant
+started on the 31st vests on the last day of shorter months, and on
+February 29th only in leap years.
+
+``add_months`` moves one date and ``month_as_of`` counts the months up to a
+date. ``month_days`` computes the days of a whole
+schedule as an array and ``month_dates`` the dates, cached per start date
+and duration so that the grants of a batch started on the same day share
+them.
+"""
+import datetime
+from functools import lru_cache
+
+import numpy as np
+
+MONTH_DATES_CACHE_SIZE = 1024
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+# Days of every month of a common year, then of a leap year, by month
+# number; index 0 is unused.
+DAYS_IN_MONTH = np.array([
+    [0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31],
+    [0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31],
+], dtype=np.int64)
+_DAYS_IN_MONTH = tuple(tuple(row) for row in DAYS_IN_MONTH.tolist())
+
+_EPOCH_MONTH = 1970 * 12
+
+
+def is_leap(year):
+    """Whether the years are leap years; works on ints and arrays."""
+
+    return (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+
+
+def add_months(date: datetime.date, months: int) -> datetime.date:
+    """
+    ``date + relativedelta(months=months)``.
+
+    Raises ``ValueError`` when the year leaves the range of ``datetime``,
+    as ``relativedelta`` does.
+    """
+
+    year, month = divmod(date.year * 12 + date.month - 1 + months, 12)
+    if not datetime.MINYEAR <= year <= datetime.MAXYEAR:
+        raise ValueError("year {} is out of range".format(year))
+
+    month += 1
+    day = date.day
+    if day > 28:
+        day = min(day, _DAYS_IN_MONTH[is_leap(year)][month])
+    return datetime.date(year, month, day)
+
+
+def month_as_of(start_date: datetime.date, as_of: datetime.date) -> int:
+    """Months whose date is on or before a date, -1 before start."""
+
+    month = (as_of.year - start_date.year) * 12 + \
+        as_of.month - start_date.month
+    if add_months(start_date, month) > as_of:
+        month -= 1
+    return max(month, -1)
+
+
+def month_days(start_date: datetime.date, duration: int) -> np.ndarray:
+    """Day of every month from 0 to ``duration``, as ``datetime64[D]``."""
+
+    first_month = start_date.year * 12 + start_date.month - 1
+    last_year = (first_month + duration) // 12
+    if last_year > datetime.MAXYEAR:
+        raise ValueError("year {} is out of range".format(last_year))
+
+    month_counts = np.arange(first_month, first_month + duration + 1)
+    years, months = np.divmod(month_counts, 12)
+    days = np.minimum(
+        start_date.day,
+        DAYS_IN_MONTH[is_leap(years).astype(np.intp), months + 1])
+
+    return (month_counts - _EPOCH_MONTH).astype('datetime64[M]').astype(
+        'datetime64[D]') + (days - 1)
+
+
+@lru_cache(maxsize=MONTH_DATES_CACHE_SIZE)
+def month_dates(start_date: datetime.date,
+                duration: int) -> tuple[datetime.date, ...]:
+    """Date of every month from 0 to ``duration``, cached."""
+
+    return tuple(month_days(start_date, duration).astype(object).tolist())
@@ -0,0 +1,515 @@
+"""
+Vectorized schedule engine.
+
+Computes every month of a vesting schedule with array expressions instead
+of calling ``GenerateScheduleUseCase.calculate_vest_of_a_month`` once per
+month. The results are identical to the per-month formula.
+
+With ``arithmetic='exact'`` the vests are computed with integer share math
+instead: the vested quantity is the whole number of vested shares and the
+value is the exact value rounded half to even to the cent, so no float is
+ever turned into a ``Decimal``.
+
+Grants vest at their frequency, with the periods of ``VestPeriods``, and
+schedules are computed a block of vests at a time. ``iterate_collapsed``
+yields the runs of equal vests, such as the ones before the cliff, as one
+``VestRange`` each.
+"""
+import datetime
+from decimal import MAX_PREC, Context, Decimal
+from typing import Iterable, Iterator, Optional, Sequence, Union
+
+import numpy as np
+from vesting.engine.month_dates import (EPOCH_ORDINAL, month_as_of,
+                                        month_dates, month_days)
+from vesting.engine.valuation_timeline import ValuationTimeline
+from vesting.engine.vest_periods import VestPeriods, month_quantities
+from vesting.models import (ColumnarSchedule, CompanyValuation, OptionGrant,
+                            Vest, VestRange)
+
+VESTS_PER_BLOCK = 1024
+
+FLOAT = 'float'
+EXACT = 'exact'
+ARITHMETICS = (FLOAT, EXACT)
+
+CENT = Decimal('0.01')
+INT64_MAX = np.iinfo(np.int64).max
+_CENTS_CONTEXT = Context(prec=MAX_PREC)
+
+
+def round_half_even(numerator: int, denominator: int) -> int:
+    """Integer closest to a positive fraction, ties to the even one."""
+
+    quotient, remainder = divmod(numerator, denominator)
+    remainder += remainder
+    if remainder > denominator or (remainder == denominator
+                                   and quotient & 1):
+        quotient += 1
+    return quotient
+
+
+class ScheduleEngine:
+    """Compute a whole vesting schedule in one pass."""
+
+    def __init__(self, arithmetic: str = FLOAT):
+        if arithmetic not in ARITHMETICS:
+            raise ValueError(
+                "Unknown arithmetic {!r}, expected one of {}.".format(
+                    arithmetic, ', '.join(ARITHMETICS)))
+        self.arithmetic = arithmetic
+
+    def calculate(self, option_grant: OptionGrant,
+                  company_valuations: Union[
+                      ValuationTimeline, CompanyValuation,
+                      Iterable[CompanyValuation]]) -> list[Vest]:
+        """
+        Calculate every vest of the schedule.
+
+        Each vest is priced with the valuation in effect on its date, so the
+        valuations must cover the start date of the grant.
+        """
+
+        return list(self.iterate(option_grant, company_valuations))
+
+    def iterate(self, option_grant: OptionGrant,
+                company_valuations: Union[
+                    ValuationTimeline, CompanyValuation,
+                    Iterable[CompanyValuation]],
+                first_month: int = 0) -> Iterator[Vest]:
+        """
+        Yield the vests of the schedule one at a time.
+
+        The vests are computed ``VESTS_PER_BLOCK`` at a time, so a daily
+        schedule is never held whole. Starts at the vest ``first_month``,
+        the month of a monthly grant, so the end of a schedule can be
+        computed without the vests before it.
+        """
+
+        valuation_timeline = ValuationTimeline.of(company_valuations)
+        vest_periods = VestPeriods(option_grant)
+
+        return self._iterate_periods(vest_periods, valuation_timeline,
+                                     first_month, len(vest_periods))
+
+    def iterate_collapsed(self, option_grant: OptionGrant,
+                          company_valuations: Union[
+                              ValuationTimeline, CompanyValuation,
+                              Iterable[CompanyValuation]]
+                          ) -> Iterator[Vest]:
+        """
+        Yield the vests of the schedule, a run of equal vests as one.
+
+        Vests are compared as the API renders them, in whole options and
+        cents, and carry those values. A run of equal vests is yielded as a
+        ``VestRange`` from the date of its first vest to the date of its
+        last. The vests before the cliff, which vest nothing, are one run
+        found without computing them, and the others are computed as
+        columns ``VESTS_PER_BLOCK`` at a time, so a ``Vest`` is only built
+        for what is yielded.
+        """
+
+        valuation_timeline = ValuationTimeline.of(company_valuations)
+        vest_periods = VestPeriods(option_grant)
+
+        return self._iterate_collapsed(vest_periods, valuation_timeline)
+
+    def reprice(self, option_grant: OptionGrant, vests: Sequence[Vest],
+                company_valuations: Union[
+                    ValuationTimeline, CompanyValuation,
+                    Iterable[CompanyValuation]],
+                start: int = 0, stop: Optional[int] = None) -> list[Vest]:
+        """
+        The vests of a schedule with the ones from ``start`` to ``stop``
+        priced again with the valuations in effect on their dates.
+
+        The quantities and dates of the vests are kept and the other vests
+        are returned as they are, so a new valuation only costs the vests
+        it applies to.
+        """
+
+        valuation_timeline = ValuationTimeline.of(company_valuations)
+        stop = len(vests) if stop is None else stop
+        dates = [vest.date for vest in vests[start:stop]]
+        prices = self.vest_prices(valuation_timeline, dates)
+
+        if self.arithmetic == EXACT:
+            vest_periods = VestPeriods(option_grant)
+            repriced = list(self._exact_vests(
+                vest_periods.quantity, vest_periods.vested_units(start, stop),
+                vest_periods.unit_total, prices, dates))
+        else:
+            repriced = [
+                Vest(vest.vested_quantity,
+                     Decimal(vest.vested_quantity) * price, vest.date)
+                for vest, price in zip(vests[start:stop], prices)
+            ]
+
+        return list(vests[:start]) + repriced + list(vests[stop:])
+
+    def vest_as_of(self, option_grant: OptionGrant,
+                   company_valuations: Union[
+                       ValuationTimeline, CompanyValuation,
+                       Iterable[CompanyValuation]],
+                   as_of: datetime.date) -> Optional[Vest]:
+        """
+        The latest vest of the schedule on or before a date, in O(log V).
+
+        The vest is found from the calendar and computed with the closed
+        form of its frequency, so no other vest is built. The vest is the
+        one ``calculate`` gives; ``None`` is returned before the start date.
+        """
+
+        valuation_timeline = ValuationTimeline.of(company_valuations)
+        vest_periods = VestPeriods(option_grant)
+        index = vest_periods.index_as_of(as_of)
+        if index < 0:
+            return None
+        date = vest_periods.date(index)
+        price = Decimal(valuation_timeline.valuation_at(date).price)
+
+        if self.arithmetic == EXACT:
+            return next(self._exact_vests(
+                vest_periods.quantity,
+                vest_periods.vested_units(index, index + 1),
+                vest_periods.unit_total, [price], [date]))
+
+        quantity = vest_periods.float_quantity(index)
+        return Vest(quantity, Decimal(quantity) * price, date)
+
+    @staticmethod
+    def month_as_of(start_date: datetime.date, as_of: datetime.date) -> int:
+        """Months whose vest date is on or before a date, -1 before start."""
+
+        return month_as_of(start_date, as_of)
+
+    def _iterate_periods(self, vest_periods: VestPeriods,
+                         valuation_timeline: ValuationTimeline,
+                         start: int, stop: int) -> Iterator[Vest]:
+        """Yield the vests from ``start`` to ``stop``, a block at a time."""
+
+        for block_start in range(start, stop, VESTS_PER_BLOCK):
+            block_stop = min(block_start + VESTS_PER_BLOCK, stop)
+            dates = vest_periods.dates(block_start, block_stop)
+            prices = self.vest_prices(valuation_timeline, dates)
+
+            if self.arithmetic == EXACT:
+                yield from self._exact_vests(
+                    vest_periods.quantity,
+                    vest_periods.vested_units(block_start, block_stop),
+                    vest_periods.unit_total, prices, dates)
+                continue
+
+            quantities = vest_periods.float_quantities(
+                block_start, block_stop)
+            for quantity, price, date in zip(
+                    quantities.tolist(), prices, dates):
+                yield Vest(
+                    vested_quantity=quantity,
+                    total_value=Decimal(quantity) * price,
+                    date=date,
+                )
+
+    def _iterate_collapsed(self, vest_periods: VestPeriods,
+                           valuation_timeline: ValuationTimeline
+                           ) -> Iterator[Vest]:
+        first_vesting = vest_periods.first_vesting
+
+        # Whole options, cents and first and last date ordinals of the run.
+        run = [0, 0, vest_periods.start_date.toordinal(),
+               vest_periods.date(first_vesting - 1).toordinal()]
+
+        for start in range(first_vesting, len(vest_periods),
+                           VESTS_PER_BLOCK):
+            date_ordinals, quantities, cents = self._value_columns(
+                vest_periods, valuation_timeline, start,
+                min(start + VESTS_PER_BLOCK, len(vest_periods)))
+
+            changes = np.flatnonzero(
+                (quantities[1:] != quantities[:-1])
+                | (cents[1:] != cents[:-1])) + 1
+            date_ordinals = date_ordinals.tolist()
+            quantities = quantities.tolist()
+            cents = cents.tolist()
+
+            for first, last in zip([0] + changes.tolist(),
+                                   (changes - 1).tolist()
+                                   + [len(date_ordinals) - 1]):
+                if quantities[first] == run[0] and cents[first] == run[1]:
+                    run[3] = date_ordinals[last]
+                    continue
+                yield self._collapsed_vest(*run)
+                run = [quantities[first], cents[first],
+                       date_ordinals[first], date_ordinals[last]]
+
+        yield self._collapsed_vest(*run)
+
+    @staticmethod
+    def _collapsed_vest(quantity: int, cents: int, first_ordinal: int,
+                        last_ordinal: int) -> Vest:
+        """A vest, or a ``VestRange`` when the run spans several dates."""
+
+        value = _CENTS_CONTEXT.multiply(Decimal(cents), CENT)
+        date = datetime.date.fromordinal(first_ordinal)
+        if first_ordinal == last_ordinal:
+            return Vest(quantity, value, date)
+        return VestRange(quantity, value, date,
+                         datetime.date.fromordinal(last_ordinal))
+
+    def _exact_vests(self, quantity: int, units: np.ndarray, total: int,
+                     prices: list[Decimal],
+                     dates: list[datetime.date]) -> Iterator[Vest]:
+        """
+        Yield vests of ``units / total`` of the quantity with integer share
+        math.
+
+        ``quantity * units / total`` shares are vested, and each price is
+        turned once into a ratio of integers. The vests are computed with
+        int64 arrays when no product can overflow and with Python integers
+        otherwise, leaving one multiply by a cent per vest.
+        """
+
+        quantity = int(quantity)
+        if not dates:
+            return
+
+        ratios: dict[int, tuple[int, int]] = {}
+        for price in prices:
+            if id(price) not in ratios:
+                numerator, denominator = price.as_integer_ratio()
+                ratios[id(price)] = (numerator * 100, denominator * total)
+        largest = max(max(ratio) for ratio in ratios.values())
+        vest_ratios = [ratios[id(price)] for price in prices]
+
+        if quantity * max(int(units.max()), 1) * largest > INT64_MAX:
+            yield from self._iterate_exact_big(
+                quantity, units.tolist(), total, vest_ratios, dates)
+            return
+
+        shares, cents = self._exact_columns(
+            quantity, units, total, vest_ratios)
+
+        # Cents fit in int64, so the default context multiplies exactly.
+        for share, cent, date in zip(shares, cents, dates):
+            yield Vest(share, Decimal(cent) * CENT, date)
+
+    @staticmethod
+    def _iterate_exact_big(quantity: int, units: list[int], total: int,
+                           ratios: list[tuple[int, int]],
+                           dates: list[datetime.date]) -> Iterator[Vest]:
+        """Exact vests with Python integers, for products past int64."""
+
+        for unit, (numerator, denominator), date in zip(
+                units, ratios, dates):
+            shares = quantity * unit
+            yield Vest(
+                vested_quantity=shares // total,
+                total_value=_CENTS_CONTEXT.multiply(
+                    Decimal(round_half_even(shares * numerator,
+                                            denominator)),
+                    CENT),
+                date=date,
+            )
+
+    @staticmethod
+    def _exact_columns(quantity: int, units: np.ndarray, total: int,
+                       ratios: list[tuple[int, int]]
+                       ) -> tuple[list[int], list[int]]:
+        """Whole vested shares and value in cents of every vest."""
+
+        shares = quantity * units
+        numerators, denominators = np.array(ratios, dtype=np.int64).T
+
+        cents, remainders = np.divmod(shares * numerators, denominators)
+        rest = denominators - remainders
+        cents += (remainders > rest) | ((remainders == rest) & (cents % 2 > 0))
+
+        return (shares // total).tolist(), cents.tolist()
+
+    def calculate_columns(self, option_grant: OptionGrant,
+                          company_valuations: Union[
+                              ValuationTimeline, CompanyValuation,
+                              Iterable[CompanyValuation]]
+                          ) -> ColumnarSchedule:
+        """
+        Calculate the schedule as typed columns, without any ``Vest``.
+
+        Each date is matched to its valuation with one vectorized search,
+        and the ``Decimal`` prices are shared with the valuation timeline.
+        The quantities are the float ones, whatever the arithmetic.
+        """
+
+        valuation_timeline = ValuationTimeline.of(company_valuations)
+        vest_periods = VestPeriods(option_grant)
+        date_ordinals = vest_periods.date_ordinals()
+
+        return ColumnarSchedule(
+            option_grants=[option_grant],
+            company_valuations=valuation_timeline.company_valuations,
+            quantities=vest_periods.float_quantities(),
+            date_ordinals=date_ordinals,
+            price_indices=self.vest_price_indices(
+                valuation_timeline, date_ordinals),
+            prices=valuation_timeline.prices,
+        )
+
+    def value_columns(self, option_grant: OptionGrant,
+                      company_valuations: Union[
+                          ValuationTimeline, CompanyValuation,
+                          Iterable[CompanyValuation]]
+                      ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Date ordinals, vested quantities and values in cents of the vests.
+
+        The quantities and values are the ones the API renders, whole
+        options and values rounded half to even to the cent, as int64
+        columns computed without building any ``Vest``.
+        """
+
+        valuation_timeline = ValuationTimeline.of(company_valuations)
+        vest_periods = VestPeriods(option_grant)
+
+        return self._value_columns(vest_periods, valuation_timeline, 0,
+                                   len(vest_periods))
+
+    def _value_columns(self, vest_periods: VestPeriods,
+                       valuation_timeline: ValuationTimeline,
+                       start: int, stop: int
+                       ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """The value columns of the vests from ``start`` to ``stop``."""
+
+        date_ordinals = vest_periods.date_ordinals(start, stop)
+        price_indices = self.vest_price_indices(
+            valuation_timeline, date_ordinals)
+        prices = valuation_timeline.prices
+
+        if self.arithmetic == EXACT:
+            vested_quantities, value_cents = self._exact_value_columns(
+                vest_periods.quantity, vest_periods.vested_units(start, stop),
+                vest_periods.unit_total, prices, price_indices)
+        else:
+            quantities = vest_periods.float_quantities(start, stop)
+            vested_quantities = quantities.astype(np.int64)
+            value_cents = self.value_cents(quantities, prices, price_indices)
+
+        return date_ordinals, vested_quantities, value_cents
+
+    @staticmethod
+    def value_cents(quantities: np.ndarray, prices: Sequence[Decimal],
+                    price_indices: np.ndarray) -> np.ndarray:
+        """
+        Cents of ``Decimal(quantity) * price`` rounded half to even.
+
+        The products are rounded in floating point, which is exact unless
+        one is within its rounding error of half a cent; those few are
+        computed again with ``Decimal``, as the vests of the float
+        arithmetic are.
+        """
+
+        price_cents = np.array([float(price * 100) for price in prices])
+        scaled = quantities * price_cents[price_indices]
+        cents = np.rint(scaled)
+
+        near_ties = (np.abs(scaled - np.floor(scaled) - 0.5)
+                     <= scaled * 2.0 ** -50) | (scaled >= 2.0 ** 52)
+        for index in np.flatnonzero(near_ties).tolist():
+            value = Decimal(float(quantities[index])) * prices[
+                price_indices[index]]
+            cents[index] = int(_CENTS_CONTEXT.quantize(value, CENT) * 100)
+
+        return cents.astype(np.int64)
+
+    def _exact_value_columns(self, quantity: int, units: np.ndarray,
+                             total: int, prices: Sequence[Decimal],
+                             price_indices: np.ndarray
+                             ) -> tuple[np.ndarray, np.ndarray]:
+        """Whole vested shares and value in cents, as int64 columns."""
+
+        price_ratios = []
+        for price in prices:
+            numerator, denominator = price.as_integer_ratio()
+            price_ratios.append((numerator * 100, denominator * total))
+        ratios = [price_ratios[index] for index in price_indices.tolist()]
+        largest = max(max(price_ratios[index])
+                      for index in set(price_indices.tolist()))
+
+        if quantity * max(int(units.max()), 1) * largest > INT64_MAX:
+            shares = [quantity * unit for unit in units.tolist()]
+            return (
+                np.array([share // total for share in shares],
+                         dtype=np.int64),
+                np.array([round_half_even(share * numerator, denominator)
+                          for share, (numerator, denominator)
+                          in zip(shares, ratios)], dtype=np.int64),
+            )
+
+        shares, cents = self._exact_columns(quantity, units, total, ratios)
+        return (np.array(shares, dtype=np.int64),
+                np.array(cents, dtype=np.int64))
+
+    @staticmethod
+    def vest_price_indices(valuation_timeline: ValuationTimeline,
+                           date_ordinals: np.ndarray) -> np.ndarray:
+        """Index of the price in effect on each vest date, in one search."""
+
+        valuation_ordinals = np.array(
+            [date.toordinal() for date in valuation_timeline.valuation_dates],
+            dtype=np.int64)
+        return np.searchsorted(
+            valuation_ordinals, date_ordinals, side='right') - 1
+
+    @staticmethod
+    def vest_prices(valuation_timeline: ValuationTimeline,
+                    dates: list[datetime.date]) -> list[Decimal]:
+        """Price in effect on each of the ascending vest dates."""
+
+        if len(valuation_timeline) == 1:
+            price = Decimal(valuation_timeline.company_valuations[0].price)
+            return [price] * len(dates)
+
+        prices: dict[int, Decimal] = {}
+        vest_prices: list[Decimal] = []
+        for valuation in valuation_timeline.valuations_for(dates):
+            key = id(valuation)
+            if key not in prices:
+                prices[key] = Decimal(valuation.price)
+            vest_prices.append(prices[key])
+
+        return vest_prices
+
+    @staticmethod
+    def vested_quantities(quantity: int, cliff: int,
+                          duration: int) -> np.ndarray:
+        """
+        Vested quantity for every month from 0 to ``duration``.
+
+        The operations mirror the README formula step by step so the
+        floating point results match the scalar implementation bit for bit.
+        """
+        return month_quantities(quantity, cliff, duration,
+                                np.arange(duration + 1))
+
+    @staticmethod
+    def vest_days(start_date: datetime.date, duration: int) -> np.ndarray:
+        """
+        Day of every month from 0 to ``duration``, as ``datetime64[D]``.
+
+        Months are added as integers and the day is clamped to the length of
+        the target month, which is what ``relativedelta(months=n)`` does.
+        """
+        return month_days(start_date, duration)
+
+    @staticmethod
+    def vest_dates(start_date: datetime.date,
+                   duration: int) -> list[datetime.date]:
+        """Date of every month from 0 to ``duration``."""
+
+        return list(month_dates(start_date, duration))
+
+    @classmethod
+    def vest_date_ordinals(cls, start_date: datetime.date,
+                           duration: int) -> np.ndarray:
+        """Proleptic Gregorian ordinal of every month from 0 to duration."""
+
+        return cls.vest_days(start_date, duration).astype(np.int64) + \
+            EPOCH_ORDINAL
@@ -0,0 +1,95 @@
+"""
+Valuation timeline.
+
+Company valuations sorted by date, used to find the valuation in effect on
+a given day without scanning the whole valuation history.
+"""
+import datetime
+from bisect import bisect_right
+from decimal import Decimal
+from typing import Iterable, Optional, Union
+
+from vesting.models import CompanyValuation
+
+
+class ValuationTimeline:
+    """Company valuations indexed by valuation date."""
+
+    def __init__(self, company_valuations: Iterable[CompanyValuation]):
+        self.company_valuations: list[CompanyValuation] = sorted(
+            company_valuations,
+            key=lambda valuation: valuation.valuation_date,
+        )
+        self.valuation_dates: list[datetime.date] = [
+            valuation.valuation_date for valuation in self.company_valuations
+        ]
+        self._prices: Optional[tuple[Decimal, ...]] = None
+
+    @classmethod
+    def of(cls, company_valuations: Union[
+            'ValuationTimeline', CompanyValuation,
+            Iterable[CompanyValuation]]) -> 'ValuationTimeline':
+        """Build a timeline from one valuation, many, or a timeline."""
+
+        if isinstance(company_valuations, cls):
+            return company_valuations
+        if isinstance(company_valuations, CompanyValuation):
+            return cls([company_valuations])
+        return cls(company_valuations)
+
+    def __len__(self) -> int:
+        return len(self.company_valuations)
+
+    @property
+    def first_date(self) -> Optional[datetime.date]:
+        """Date of the earliest valuation."""
+
+        return self.valuation_dates[0] if self.valuation_dates else None
+
+    @property
+    def prices(self) -> tuple[Decimal, ...]:
+        """Price of every valuation as a ``Decimal``, in timeline order."""
+
+        if self._prices is None:
+            self._prices = tuple(
+                Decimal(valuation.price)
+                for valuation in self.company_valuations)
+        return self._prices
+
+    def index_at(self, date: datetime.date) -> int:
+        """Index of the valuation in effect on a date, -1 before the first."""
+
+        return bisect_right(self.valuation_dates, date) - 1
+
+    def valuation_at(self, date: datetime.date) -> Optional[CompanyValuation]:
+        """
+        Valuation in effect on a date, in O(log V).
+
+        That is the latest valuation made on or before the date. When two
+        valuations share a date the one given last wins. ``None`` is
+        returned for dates before the first valuation.
+        """
+        index = self.index_at(date)
+        return self.company_valuations[index] if index >= 0 else None
+
+    def valuations_for(self, dates: Iterable[datetime.date]
+                       ) -> list[Optional[CompanyValuation]]:
+        """
+        Valuation in effect on each of the ascending dates.
+
+        Walks the dates and the timeline together in one merge pass, so the
+        cost is O(D + V) instead of a lookup per date.
+        """
+        valuations: list[Optional[CompanyValuation]] = []
+        valuation_dates = self.valuation_dates
+        count = len(valuation_dates)
+        index = -1
+        current: Optional[CompanyValuation] = None
+
+        for date in dates:
+            while index + 1 < count and valuation_dates[index + 1] <= date:
+                index += 1
+                current = self.company_valuations[index]
+            valuations.append(current)
+
+        return valuations
@@ -0,0 +1,217 @@
+"""
+Periods a grant vests at.
+
+A grant vests at its ``frequency``. A monthly grant vests every month from
+its start date to its duration, as the README formula has it; quarterly
+and annual grants vest every 3 and 12 months and on their last month, with
+the quantities of the monthly schedule on those months. A daily grant
+accrues every day from its start date to the date of its last month:
+nothing before the date of the cliff, then ``quantity * days / days of the
+schedule``, so it vests its quantity on the last day.
+
+``VestPeriods`` numbers the vests of a grant from 0 and gives the dates and
+vested quantities of any range of them, so a schedule can be computed a
+block at a time and the vests before the cliff, which vest nothing, can be
+skipped without being computed.
+"""
+import datetime
+from typing import Optional
+
+import numpy as np
+from vesting.engine.month_dates import (EPOCH_ORDINAL, add_months,
+                                        month_as_of, month_dates,
+                                        month_days)
+from vesting.models import (ANNUAL, FREQUENCIES, MONTHLY, QUARTERLY,
+                            OptionGrant)
+
+MONTHS_PER_PERIOD = {MONTHLY: 1, QUARTERLY: 3, ANNUAL: 12}
+
+
+def month_quantities(quantity: int, cliff: int, duration: int,
+                     months: np.ndarray) -> np.ndarray:
+    """
+    Vested quantity of the given months.
+
+    The operations mirror the README formula step by step so the floating
+    point results match the scalar implementation bit for bit.
+    """
+
+    cliff_percentage: float = cliff / duration
+    vested = ((duration - cliff) + months) // duration
+
+    return float(quantity) * (
+        (cliff_percentage + ((months / duration) - cliff_percentage))
+        * vested
+    )
+
+
+def month_quantity(quantity: int, cliff: int, duration: int,
+                   month: int) -> float:
+    """Vested quantity of one month, as ``month_quantities`` gives."""
+
+    cliff_percentage: float = cliff / duration
+    vested = ((duration - cliff) + month) // duration
+
+    return float(quantity) * (
+        (cliff_percentage + ((month / duration) - cliff_percentage))
+        * vested
+    )
+
+
+class VestPeriods:
+    """
+    The vests of a grant at its frequency.
+
+    Vest ``i`` of a grant vesting every ``step`` months is on the month
+    ``min(i * step, duration)``, and vest ``i`` of a daily grant on the day
+    ``i``. ``vested_units(start, stop) / unit_total`` is the vested
+    fraction of the quantity of the vests from ``start`` to ``stop``, in
+    integers for the exact arithmetic; ``float_quantities`` gives the float
+    quantities.
+    """
+
+    __slots__ = ('quantity', 'start_date', 'cliff', 'duration', 'step',
+                 'total_days', 'cliff_days')
+
+    def __init__(self, option_grant: OptionGrant):
+        frequency = option_grant.frequency
+        if frequency not in FREQUENCIES:
+            raise ValueError(
+                "Unknown frequency {!r}, expected one of {}.".format(
+                    frequency, ', '.join(FREQUENCIES)))
+
+        self.quantity = int(option_grant.quantity)
+        self.start_date = option_grant.start_date
+        self.cliff = int(option_grant.cliff_months)
+        self.duration = int(option_grant.duration_months)
+        self.step: Optional[int] = MONTHS_PER_PERIOD.get(frequency)
+        self.total_days = 0
+        self.cliff_days = 0
+
+        if self.step is None:
+            self.total_days = (add_months(self.start_date, self.duration)
+                               - self.start_date).days
+            self.cliff_days = (add_months(self.start_date, self.cliff)
+                               - self.start_date).days
+
+    def __len__(self) -> int:
+        if self.step is None:
+            return self.total_days + 1
+        return -(-self.duration // self.step) + 1
+
+    @property
+    def unit_total(self) -> int:
+        """Units of the whole quantity: months, or days when daily."""
+
+        return self.total_days if self.step is None else self.duration
+
+    @property
+    def first_vesting(self) -> int:
+        """Number of vests, from the first, that vest nothing."""
+
+        if self.step is None:
+            return max(self.cliff_days, 1)
+        return self.first_at_month(max(self.cliff, 1))
+
+    def first_at_month(self, month: int) -> int:
+        """First vest on or after ``month`` months from the start date."""
+
+        if self.step is None:
+            return (add_months(self.start_date, month)
+                    - self.start_date).days
+        return min(-(-month // self.step), len(self) - 1)
+
+    def index_as_of(self, as_of: datetime.date) -> int:
+        """The latest vest on or before a date, -1 before the start date."""
+
+        if self.step is None:
+            days = (as_of - self.start_date).days
+            return min(days, self.total_days) if days >= 0 else -1
+
+        month = month_as_of(self.start_date, as_of)
+        if month >= self.duration:
+            return len(self) - 1
+        return month // self.step if month >= 0 else -1
+
+    def month(self, index: int) -> int:
+        """Months from the start date to a vest of a monthly schedule."""
+
+        return min(index * self.step, self.duration)
+
+    def months(self, start: int = 0,
+               stop: Optional[int] = None) -> np.ndarray:
+        """Months from the start date to the vests."""
+
+        if self.step == 1:
+            return np.arange(start, self._stop(stop), dtype=np.int64)
+        return np.minimum(
+            np.arange(start, self._stop(stop), dtype=np.int64) * self.step,
+            self.duration)
+
+    def date(self, index: int) -> datetime.date:
+        """Date of one vest, without the dates of the others."""
+
+        if self.step is None:
+            return self.start_date + datetime.timedelta(days=index)
+        return add_months(self.start_date, self.month(index))
+
+    def _stop(self, stop: Optional[int]) -> int:
+        return len(self) if stop is None else stop
+
+    def date_ordinals(self, start: int = 0,
+                      stop: Optional[int] = None) -> np.ndarray:
+        """Proleptic Gregorian ordinal of the date of every vest."""
+
+        if self.step is None:
+            return np.arange(start, self._stop(stop), dtype=np.int64) + \
+                self.start_date.toordinal()
+
+        return month_days(self.start_date, self.duration)[
+            self.months(start, stop)].astype(np.int64) + EPOCH_ORDINAL
+
+    def dates(self, start: int = 0,
+              stop: Optional[int] = None) -> list[datetime.date]:
+        """Date of every vest."""
+
+        stop = self._stop(stop)
+        if self.step is None:
+            return [datetime.date.fromordinal(ordinal) for ordinal in
+                    self.date_ordinals(start, stop).tolist()]
+
+        dates = month_dates(self.start_date, self.duration)
+        if self.step == 1:
+            return list(dates[start:stop])
+        return [dates[month] for month in self.months(start, stop).tolist()]
+
+    def float_quantity(self, index: int) -> float:
+        """Vested quantity of one vest, as ``float_quantities`` gives."""
+
+        if self.step is None:
+            return float(self.quantity) * (index / self.total_days) * (
+                index >= self.cliff_days)
+        return month_quantity(self.quantity, self.cliff, self.duration,
+                              self.month(index))
+
+    def float_quantities(self, start: int = 0,
+                         stop: Optional[int] = None) -> np.ndarray:
+        """Vested quantity of every vest, in floating point."""
+
+        if self.step is None:
+            days = np.arange(start, self._stop(stop))
+            return float(self.quantity) * (days / self.total_days) * (
+                days >= self.cliff_days)
+
+        return month_quantities(self.quantity, self.cliff, self.duration,
+                                self.months(start, stop))
+
+    def vested_units(self, start: int = 0,
+                     stop: Optional[int] = None) -> np.ndarray:
+        """Vested units of every vest, out of ``unit_total``."""
+
+        if self.step is None:
+            days = np.arange(start, self._stop(stop), dtype=np.int64)
+            return np.where(days >= self.cliff_days, days, 0)
+
+        months = self.months(start, stop)
+        return months * (((self.duration - self.cliff) + months)
+                         // self.duration)
@@ -0,0 +1,93 @@
+"""
+Executors for schedule computations.
+
+Async views hand the CPU bound schedule work to a bounded pool so the event
+loop keeps serving other clients. The ``VESTING_SCHEDULE_EXECUTOR`` setting
+chooses the pool:
+
+* ``'thread'``: a thread pool. The schedule cache is shared with the rest
+  of the process, but the computations still take turns on the GIL.
+* ``'process'``: a process pool, computing in parallel on every core.
+
+``MAX_WORKERS`` bounds the pool (``None`` is one worker per core) and a
+batch is split in chunks of ``CHUNK_SIZE`` grants, one task each.
+"""
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+DEFAULT_SCHEDULE_EXECUTOR = {
+    'KIND': 'thread',
+    'MAX_WORKERS': None,
+    'CHUNK_SIZE': 64,
+}
+
+
+def setup_django() -> None:
+    """Configure Django in a pool process that did not inherit it."""
+
+    import django
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
+    django.setup()
+
+
+def schedule_executor_config() -> dict:
+    """The ``VESTING_SCHEDULE_EXECUTOR`` setting, with its defaults."""
+
+    return dict(DEFAULT_SCHEDULE_EXECUTOR,
+                **getattr(settings, 'VESTING_SCHEDULE_EXECUTOR', {}))
+
+
+def build_schedule_executor(config: dict) -> Executor:
+    """Build the pool described by a ``VESTING_SCHEDULE_EXECUTOR`` dict."""
+
+    config = dict(DEFAULT_SCHEDULE_EXECUTOR, **config)
+    kind = config['KIND']
+    max_workers = config['MAX_WORKERS'] or os.cpu_count() or 1
+
+    if kind == 'thread':
+        return ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='vesting-schedule')
+    if kind == 'process':
+        return ProcessPoolExecutor(
+            max_workers=max_workers, initializer=setup_django)
+
+    raise ValueError("Unknown schedule executor kind {!r}.".format(kind))
+
+
+_schedule_executor: Optional[Executor] = None
+_schedule_executor_lock = threading.Lock()
+
+
+def get_schedule_executor() -> Executor:
+    """The process wide schedule executor."""
+
+    global _schedule_executor
+
+    if _schedule_executor is None:
+        with _schedule_executor_lock:
+            if _schedule_executor is None:
+                _schedule_executor = build_schedule_executor(
+                    schedule_executor_config())
+
+    return _schedule_executor
+
+
+@receiver(setting_changed)
+def reset_schedule_executor(setting: str, **kwargs) -> None:
+    """Replace the executor on next use when its setting changes."""
+
+    global _schedule_executor
+
+    if setting == 'VESTING_SCHEDULE_EXECUTOR':
+        with _schedule_executor_lock:
+            executor, _schedule_executor = _schedule_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
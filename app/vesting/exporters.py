@@ -0,0 +1,180 @@
+"""
+Export schedules as CSV, Apache Arrow or Apache Parquet.
+
+The writers take the batches of ``ScheduleColumns`` computed by
+``ExportSchedulesUseCase`` and turn every batch straight into encoded bytes,
+so exports stream in chunks without a dict per vest. Every row has the
+columns:
+
+* ``id``: the grant id.
+* ``date``: the vest date.
+* ``vested_quantity``: the whole options vested.
+* ``total_value``: the value of the vested options, with two decimals.
+
+The values are the ones the schedule endpoints render. CSV dates are ISO
+8601 (``YYYY-MM-DD``). In Arrow and Parquet, ``date`` is a ``date32`` and
+``total_value`` a ``decimal128(20, 2)``, each batch of grants being a record
+batch or a row group.
+
+``pyarrow`` is only imported by the Arrow and Parquet writers, so workers
+start without it.
+"""
+import csv
+import io
+from typing import Callable, Iterable, Iterator
+
+import numpy as np
+from vesting.models import ScheduleColumns
+
+CSV = 'csv'
+ARROW = 'arrow'
+PARQUET = 'parquet'
+
+CSV_HEADER = ('id', 'date', 'vested_quantity', 'total_value')
+VALUE_PRECISION = 20
+VALUE_SCALE = 2
+
+
+def csv_chunks(batches: Iterable[ScheduleColumns]) -> Iterator[bytes]:
+    """The header, then the rows of every batch, as CSV."""
+
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator='\n')
+    writer.writerow(CSV_HEADER)
+    yield output.getvalue().encode('utf-8')
+
+    for batch in batches:
+        output.seek(0)
+        output.truncate()
+
+        whole, cents = np.divmod(batch.value_cents, 100)
+        values = np.char.add(np.char.add(whole.astype(str), '.'),
+                             np.char.zfill(cents.astype(str), 2))
+        writer.writerows(zip(
+            np.array(batch.grant_ids, dtype=object)[
+                batch.grant_indices].tolist(),
+            batch.days.astype('datetime64[D]').astype(str).tolist(),
+            batch.vested_quantities.tolist(),
+            values.tolist(),
+        ))
+        yield output.getvalue().encode('utf-8')
+
+
+def arrow_schema():
+    """Schema of the Arrow and Parquet exports."""
+
+    import pyarrow as pa
+    return pa.schema([
+        ('id', pa.dictionary(pa.int32(), pa.string())),
+        ('date', pa.date32()),
+        ('vested_quantity', pa.int64()),
+        ('total_value', pa.decimal128(VALUE_PRECISION, VALUE_SCALE)),
+    ])
+
+
+def record_batch(batch: ScheduleColumns, schema):
+    """An Arrow record batch sharing the memory of the columns."""
+
+    import pyarrow as pa
+
+    # decimal128 values are 16 byte little endian integers; the cents are
+    # their low half and the sign their high half.
+    unscaled = np.empty((len(batch), 2), dtype=np.int64)
+    unscaled[:, 0] = batch.value_cents
+    unscaled[:, 1] = batch.value_cents >> 63
+
+    return pa.RecordBatch.from_arrays([
+        pa.DictionaryArray.from_arrays(
+            pa.array(batch.grant_indices, type=pa.int32()),
+            pa.array(batch.grant_ids, type=pa.string())),
+        pa.array(batch.days, type=pa.date32()),
+        pa.array(batch.vested_quantities, type=pa.int64()),
+        pa.Array.from_buffers(
+            schema.field('total_value').type, len(batch),
+            [None, pa.py_buffer(unscaled)]),
+    ], schema=schema)
+
+
+class _ChunkSink:
+    """A write only file keeping what is written until it is taken."""
+
+    closed = False
+
+    def __init__(self):
+        self.chunks: list[bytes] = []
+        self.position = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def take(self) -> bytes:
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _arrow_chunks(batches: Iterable[ScheduleColumns],
+                  open_writer: Callable) -> Iterator[bytes]:
+    """Write every batch with a pyarrow writer, yielding what it wrote."""
+
+    import pyarrow as pa
+    schema = arrow_schema()
+    sink = _ChunkSink()
+    stream = pa.PythonFile(sink, mode='w')
+    writer = open_writer(stream, schema)
+    try:
+        for batch in batches:
+            writer.write_batch(record_batch(batch, schema))
+            yield sink.take()
+    finally:
+        writer.close()
+        stream.close()
+    yield sink.take()
+
+
+def arrow_chunks(batches: Iterable[ScheduleColumns]) -> Iterator[bytes]:
+    """The batches in the Arrow IPC streaming format."""
+
+    import pyarrow as pa
+    return _arrow_chunks(batches, pa.ipc.new_stream)
+
+
+def parquet_chunks(batches: Iterable[ScheduleColumns]) -> Iterator[bytes]:
+    """The batches as a Parquet file, a row group per batch."""
+
+    import pyarrow.parquet as pq
+
+    return _arrow_chunks(batches, pq.ParquetWriter)
+
+
+class ExportFormat:
+    """How a format is written and served."""
+
+    def __init__(self, name: str, content_type: str, extension: str,
+                 chunks: Callable[[Iterable[ScheduleColumns]],
+                                  Iterator[bytes]]):
+        self.name = name
+        self.content_type = content_type
+        self.extension = extension
+        self.chunks = chunks
+
+
+EXPORT_FORMATS = {
+    CSV: ExportFormat(CSV, 'text/csv; charset=utf-8', '.csv', csv_chunks),
+    ARROW: ExportFormat(ARROW, 'application/vnd.apache.arrow.stream',
+                        '.arrows', arrow_chunks),
+    PARQUET: ExportFormat(PARQUET, 'application/vnd.apache.parquet',
+                          '.parquet', parquet_chunks),
+}
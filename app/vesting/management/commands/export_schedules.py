@@ -0,0 +1,84 @@
+"""
+Export the schedules of many option grants as CSV, Arrow or Parquet.
+
+Reads the grants and the company valuations like ``recompute_schedules``
+and writes the schedules of all the grants to one file, in batches of
+columns, in the format given by ``--format`` or by the output extension.
+
+    python manage.py export_schedules grants.csv \\
+        --valuations valuations.json --output schedules.parquet
+"""
+import os
+from typing import Optional
+
+from django.core.management.base import BaseCommand, CommandError
+from vesting.exporters import EXPORT_FORMATS, ExportFormat
+from vesting.management.commands.recompute_schedules import (
+    read_company_valuations, read_grants)
+from vesting.use_cases.export_schedules.export_schedules_use_case import (
+    DEFAULT_GRANTS_PER_BATCH, ExportSchedulesUseCase)
+from vesting.validators import parse_batch_option_grants
+
+
+def output_format(name: Optional[str], path: str) -> ExportFormat:
+    """The format named, or the one of the output extension."""
+
+    if name is None:
+        extension = os.path.splitext(path)[1].lower()
+        for export_format in EXPORT_FORMATS.values():
+            if export_format.extension == extension:
+                return export_format
+        raise CommandError(
+            'Cannot tell the format of {}; use --format.'.format(path))
+
+    return EXPORT_FORMATS[name]
+
+
+class Command(BaseCommand):
+    help = 'Export the schedules of the option grants of a file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'input', help='CSV or JSONL file of option grants, with the '
+            'fields of the batch endpoint.')
+        parser.add_argument(
+            '--valuations', required=True,
+            help='JSON list, JSONL or CSV file of company valuations.')
+        parser.add_argument(
+            '--output', required=True,
+            help='CSV, Arrow (.arrows) or Parquet file of schedules.')
+        parser.add_argument(
+            '--format', choices=sorted(EXPORT_FORMATS),
+            help='Format of the output, from its extension by default.')
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_GRANTS_PER_BATCH,
+            help='Grants per record batch or row group.')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('Batch size must be positive.')
+
+        export_format = output_format(options['format'], options['output'])
+
+        company_valuations = read_company_valuations(options['valuations'])
+        errors: dict = {}
+        failures: dict = {}
+        batches = ExportSchedulesUseCase().execute(
+            parse_batch_option_grants(read_grants(options['input']), errors),
+            company_valuations,
+            grants_per_batch=options['batch_size'],
+            failures=failures,
+        )
+
+        with open(options['output'], 'wb') as output:
+            for chunk in export_format.chunks(batches):
+                output.write(chunk)
+
+        for grant_id, exc in failures.items():
+            errors[grant_id] = {'detail': exc.detail}
+        for grant_id, grant_errors in errors.items():
+            self.stderr.write('{}: {}'.format(grant_id, grant_errors))
+
+        self.stdout.write(self.style.SUCCESS(
+            'Schedules exported to {}, {} grants left out with '
+            'errors.'.format(options['output'], len(errors))))
@@ -0,0 +1,319 @@
+"""
+Recompute the schedules of many option grants.
+
+Reads the grants from a CSV or JSONL file and the company valuations from a
+JSON, JSONL or CSV file, splits the grants in chunks computed on a process
+pool and writes one NDJSON line per grant, as the streamed batch endpoint
+does. A checkpoint is saved after every chunk written, so an interrupted
+run can be resumed with ``--resume``.
+
+    python manage.py recompute_schedules grants.csv \\
+        --valuations valuations.json --output schedules.ndjson
+"""
+import csv
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import islice
+from typing import Iterator
+
+from django.core.management.base import BaseCommand, CommandError
+from vesting.encoders import encode_vests
+from vesting.executors import setup_django
+from vesting.models import CompanyValuation
+from vesting.serializers import CompanyValuationSerializer
+from vesting.streaming import json_line
+from vesting.use_cases.generate_batch_schedule.generate_batch_schedule_use_case import (  # noqa: E501
+    GenerateBatchScheduleUseCase)
+from vesting.validators import parse_batch_option_grants
+
+from app.shared.exceptions import BusinessValidationError
+
+DEFAULT_CHUNK_SIZE = 1000
+CHUNK_MEMO_SIZE = 1024
+
+
+def read_records(path: str) -> Iterator[dict]:
+    """
+    Records of a CSV or JSONL file, chosen by its extension.
+
+    Raises ``CommandError`` with the line number of a JSONL line that is not
+    a JSON object.
+    """
+
+    with open(path, newline='') as records:
+        if path.lower().endswith('.csv'):
+            yield from csv.DictReader(records)
+            return
+
+        for line_number, line in enumerate(records, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            if type(record) is not dict:
+                raise CommandError(
+                    'Line {} of {} is not a JSON object.'.format(
+                        line_number, path))
+            yield record
+
+
+def read_grants(path: str) -> Iterator[dict]:
+    """
+    Grant records, identified by their row number when they have no id.
+
+    As for the batch endpoint the ids must be unique, otherwise a schedule
+    would replace another; a repeated id raises ``CommandError``.
+    """
+
+    ids: set[str] = set()
+    for number, record in enumerate(read_records(path), start=1):
+        if record.get('id') in (None, ''):
+            record['id'] = str(number)
+
+        grant_id = str(record['id'])
+        if grant_id in ids:
+            raise CommandError(
+                'Option grant ids must be unique, grant {} of {} repeats '
+                'the id {!r}.'.format(number, path, grant_id))
+        ids.add(grant_id)
+        yield record
+
+
+def read_company_valuations(path: str) -> list[CompanyValuation]:
+    """Validated company valuations of a JSON, JSONL or CSV file."""
+
+    if path.lower().endswith('.json'):
+        with open(path) as valuations:
+            data = json.load(valuations)
+    else:
+        data = list(read_records(path))
+
+    serializer = CompanyValuationSerializer(
+        data=data, many=True, allow_empty=False)
+    if not serializer.is_valid():
+        raise CommandError(
+            'Invalid company valuations: {}'.format(serializer.errors))
+
+    return [CompanyValuation(**valuation)
+            for valuation in serializer.validated_data]
+
+
+def recompute_chunk(option_grants_data: list[dict],
+                    company_valuations: list[CompanyValuation]
+                    ) -> tuple[bytes, int]:
+    """
+    NDJSON lines of a chunk of grants, in input order, and the error count.
+
+    Defined at module level so the process pool can run it.
+    """
+
+    errors: dict = {}
+    results = dict(GenerateBatchScheduleUseCase().execute_iter(
+        parse_batch_option_grants(option_grants_data, errors),
+        company_valuations,
+        memo_size=CHUNK_MEMO_SIZE,
+    ))
+
+    lines: list[str] = []
+    failed = 0
+    for option_grant_data in option_grants_data:
+        grant_id = str(option_grant_data['id'])
+        result = results.get(grant_id)
+
+        if grant_id in errors:
+            failed += 1
+            lines.append(json_line(
+                {'id': grant_id, 'errors': errors[grant_id]}))
+        elif isinstance(result, BusinessValidationError):
+            failed += 1
+            lines.append(json_line(
+                {'id': grant_id, 'errors': {'detail': result.detail}}))
+        else:
+            lines.append('{{"id":{},"schedule":{}}}'.format(
+                json_line(grant_id), encode_vests(result)))
+
+    return ('\n'.join(lines) + '\n').encode('utf-8'), failed
+
+
+def chunked(records: Iterator[dict], size: int) -> Iterator[list[dict]]:
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class Checkpoint:
+    """Progress of a run, saved next to its output."""
+
+    def __init__(self, path: str, input_path: str, chunk_size: int):
+        self.path = path
+        self.input_path = os.path.abspath(input_path)
+        self.chunk_size = chunk_size
+        self.chunks = 0
+        self.grants = 0
+        self.errors = 0
+        self.output_bytes = 0
+
+    def load(self) -> None:
+        """Continue from the saved progress of the same input."""
+
+        try:
+            with open(self.path) as checkpoint:
+                saved = json.load(checkpoint)
+        except FileNotFoundError:
+            return
+
+        if saved['input'] != self.input_path or \
+                saved['chunk_size'] != self.chunk_size:
+            raise CommandError(
+                'The checkpoint {} belongs to {} with chunks of {} '
+                'grants.'.format(self.path, saved['input'],
+                                 saved['chunk_size']))
+
+        self.chunks = saved['chunks']
+        self.grants = saved['grants']
+        self.errors = saved['errors']
+        self.output_bytes = saved['output_bytes']
+
+    def save(self) -> None:
+        """Replace the checkpoint file atomically."""
+
+        temporary_path = self.path + '.tmp'
+        with open(temporary_path, 'w') as checkpoint:
+            json.dump({
+                'input': self.input_path,
+                'chunk_size': self.chunk_size,
+                'chunks': self.chunks,
+                'grants': self.grants,
+                'errors': self.errors,
+                'output_bytes': self.output_bytes,
+            }, checkpoint)
+        os.replace(temporary_path, self.path)
+
+
+def check_resumable(output_path: str, output_bytes: int) -> None:
+    """Fail unless the output still holds what the checkpoint wrote."""
+
+    if not output_bytes:
+        return
+
+    try:
+        size = os.path.getsize(output_path)
+    except OSError:
+        size = None
+    if size is None or size < output_bytes:
+        raise CommandError(
+            'The output {} does not hold the {} bytes of the checkpoint; '
+            'run again without --resume.'.format(output_path, output_bytes))
+
+
+class Command(BaseCommand):
+    help = 'Recompute the schedules of the option grants of a file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'input', help='CSV or JSONL file of option grants, with the '
+            'fields of the batch endpoint.')
+        parser.add_argument(
+            '--valuations', required=True,
+            help='JSON list, JSONL or CSV file of company valuations.')
+        parser.add_argument(
+            '--output', required=True, help='NDJSON file of schedules.')
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Processes computing the chunks, one per core by default.')
+        parser.add_argument(
+            '--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+            help='Grants per chunk.')
+        parser.add_argument(
+            '--checkpoint', help='Checkpoint file, the output file with a '
+            '.checkpoint suffix by default.')
+        parser.add_argument(
+            '--resume', action='store_true',
+            help='Continue after the last chunk of the checkpoint.')
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1 or options['chunk_size'] < 1:
+            raise CommandError('Workers and chunk size must be positive.')
+
+        company_valuations = read_company_valuations(options['valuations'])
+        checkpoint = Checkpoint(
+            options['checkpoint'] or options['output'] + '.checkpoint',
+            options['input'], options['chunk_size'])
+
+        if options['resume']:
+            checkpoint.load()
+            check_resumable(options['output'], checkpoint.output_bytes)
+
+        # Reading every grant once first also checks the ids before any
+        # chunk is written.
+        total = sum(1 for _ in read_grants(options['input']))
+        chunks = chunked(read_grants(options['input']), options['chunk_size'])
+        for _ in range(checkpoint.chunks):
+            next(chunks, None)
+
+        mode = 'r+b' if checkpoint.output_bytes else 'wb'
+        with open(options['output'], mode) as output, ProcessPoolExecutor(
+                max_workers=options['workers'],
+                initializer=setup_django) as executor:
+            output.truncate(checkpoint.output_bytes)
+            output.seek(checkpoint.output_bytes)
+            self._run(executor, chunks, company_valuations, output,
+                      checkpoint, total, options['workers'] * 2)
+
+        self.stdout.write(self.style.SUCCESS(
+            '{} schedules written to {}, {} with errors.'.format(
+                checkpoint.grants, options['output'], checkpoint.errors)))
+
+    def _run(self, executor: Executor, chunks: Iterator[list[dict]],
+             company_valuations: list[CompanyValuation], output,
+             checkpoint: Checkpoint, total: int, in_flight: int) -> None:
+        """
+        Compute the chunks and write them in input order.
+
+        At most ``in_flight`` chunks are pending at once, so memory does not
+        grow with the input.
+        """
+
+        pending: deque = deque()
+        started = time.monotonic()
+        resumed_grants = checkpoint.grants
+
+        def submit() -> bool:
+            chunk = next(chunks, None)
+            if chunk is None:
+                return False
+            pending.append((len(chunk), executor.submit(
+                recompute_chunk, chunk, company_valuations)))
+            return True
+
+        while len(pending) < in_flight and submit():
+            pass
+
+        while pending:
+            size, future = pending.popleft()
+            content, failed = future.result()
+
+            output.write(content)
+            output.flush()
+            os.fsync(output.fileno())
+
+            checkpoint.chunks += 1
+            checkpoint.grants += size
+            checkpoint.errors += failed
+            checkpoint.output_bytes = output.tell()
+            checkpoint.save()
+
+            submit()
+
+            elapsed = time.monotonic() - started
+            self.stderr.write('{}/{} grants, {:.0f} schedules/min'.format(
+                checkpoint.grants, total,
+                (checkpoint.grants - resumed_grants) / elapsed * 60
+                if elapsed else 0))
@@ -0,0 +1,54 @@
+# Generated by Django 3.2.25 on 2026-10-18 14:26
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompanyValuationRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('valuation_date', models.DateField(db_index=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='OptionGrantRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('grant_id', models.CharField(max_length=255, unique=True)),
+                ('employee_id', models.CharField(db_index=True, max_length=255)),
+                ('quantity', models.BigIntegerField()),
+                ('start_date', models.DateField()),
+                ('cliff_months', models.PositiveIntegerField()),
+                ('duration_months', models.PositiveIntegerField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='VestRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('employee_id', models.CharField(max_length=255)),
+                ('date', models.DateField()),
+                ('vested_quantity', models.FloatField()),
+                ('total_value', models.DecimalField(decimal_places=2, max_digits=20)),
+                ('grant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='vests', to='vesting.optiongrantrecord')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='vestrecord',
+            index=models.Index(fields=['employee_id', 'date'], name='vest_employee_date_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='vestrecord',
+            constraint=models.UniqueConstraint(fields=('grant', 'date'), name='unique_vest_date_per_grant'),
+        ),
+    ]
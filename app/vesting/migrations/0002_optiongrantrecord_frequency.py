@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-18 14:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vesting', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='optiongrantrecord',
+            name='frequency',
+            field=models.CharField(choices=[('daily', 'daily'), ('monthly', 'monthly'), ('quarterly', 'quarterly'), ('annual', 'annual')], default='monthly', max_length=16),
+        ),
+    ]
@@ -1,11 +1,28 @@
 """
 Models for the vesting app.
+
+The plain classes are what the schedule engine computes with; the
+``*Record`` models store grants, valuations and vests in the database.
 """
+import datetime
+from collections.abc import Sequence
+from decimal import Decimal
+
+import numpy as np
+from django.db import models
+
+DAILY = 'daily'
+MONTHLY = 'monthly'
+QUARTERLY = 'quarterly'
+ANNUAL = 'annual'
+FREQUENCIES = (DAILY, MONTHLY, QUARTERLY, ANNUAL)
 
 
 class CompanyValuation(object):
     """A valuation of the company."""
 
+    __slots__ = ('price', 'valuation_date')
+
     def __init__(self, price, valuation_date):
         self.price = price
         self.valuation_date = valuation_date
@@ -14,26 +31,227 @@ class CompanyValuation(object):
 class Vest(object):
     """A vesting event."""
 
+    __slots__ = ('vested_quantity', 'total_value', 'date')
+
     def __init__(self, vested_quantity, total_value, date):
         self.vested_quantity = vested_quantity
         self.total_value = total_value
         self.date = date
 
 
+class VestRange(Vest):
+    """A run of equal vesting events, from ``date`` to ``end_date``."""
+
+    __slots__ = ('end_date',)
+
+    def __init__(self, vested_quantity, total_value, date, end_date):
+        super().__init__(vested_quantity, total_value, date)
+        self.end_date = end_date
+
+
 class OptionGrant(object):
-    """A grant of options to an employee."""
+    """
+    A grant of options to an employee.
+
+    The cliff and the duration are in months whatever the ``frequency`` the
+    options vest at, one of ``FREQUENCIES``.
+    """
+
+    __slots__ = ('quantity', 'start_date', 'cliff_months', 'duration_months',
+                 'frequency')
 
-    def __init__(self, quantity, start_date, cliff_months, duration_months):
+    def __init__(self, quantity, start_date, cliff_months, duration_months,
+                 frequency=MONTHLY):
         self.quantity = quantity
         self.start_date = start_date
         self.cliff_months = cliff_months
         self.duration_months = duration_months
+        self.frequency = frequency
 
 
 class Schedule(object):
     """A schedule of vesting events."""
 
+    __slots__ = ('option_grants', 'company_valuations', 'vests')
+
     def __init__(self, option_grants, company_valuations, vests):
         self.option_grants = option_grants
         self.company_valuations = company_valuations
         self.vests = vests
+
+
+def _compact(values) -> np.ndarray:
+    """Non-negative integers in the smallest unsigned dtype that fits."""
+
+    values = np.asarray(values, dtype=np.int64)
+    if not len(values):
+        return values.astype(np.uint8)
+    return values.astype(np.min_scalar_type(int(values.max())))
+
+
+class ColumnarSchedule(Sequence):
+    """
+    A schedule of vesting events stored as typed columns.
+
+    Holds the vested quantities, the dates as day offsets from the first
+    vest and, for the values, the index of the price of each vest into the
+    distinct ``prices``. The integer columns use the smallest dtype that
+    fits. A ``Vest`` is only built when one is accessed, with the same
+    attributes the vest of a ``Schedule`` has.
+    """
+
+    __slots__ = ('option_grants', 'company_valuations', 'quantities',
+                 'first_ordinal', 'date_offsets', 'price_indices', 'prices')
+
+    def __init__(self, option_grants, company_valuations, quantities,
+                 date_ordinals, price_indices, prices):
+        date_ordinals = np.asarray(date_ordinals, dtype=np.int64)
+
+        self.option_grants = option_grants
+        self.company_valuations = company_valuations
+        self.quantities = np.asarray(quantities, dtype=np.float64)
+        self.first_ordinal = int(date_ordinals[0]) if len(date_ordinals) \
+            else 0
+        self.date_offsets = _compact(date_ordinals - self.first_ordinal)
+        self.price_indices = _compact(price_indices)
+        self.prices = prices
+
+    @property
+    def vests(self) -> 'ColumnarSchedule':
+        """The vests, built lazily like the list of a ``Schedule``."""
+
+        return self
+
+    @property
+    def date_ordinals(self) -> np.ndarray:
+        """Proleptic Gregorian ordinal of every vest date."""
+
+        return self.date_offsets.astype(np.int64) + self.first_ordinal
+
+    def __len__(self) -> int:
+        return len(self.quantities)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position]
+                    for position in range(*index.indices(len(self)))]
+
+        quantity = float(self.quantities[index])
+        return Vest(
+            vested_quantity=quantity,
+            total_value=Decimal(quantity) * self.prices[
+                self.price_indices[index]],
+            date=datetime.date.fromordinal(
+                self.first_ordinal + int(self.date_offsets[index])),
+        )
+
+    def __iter__(self):
+        prices = self.prices
+        first_ordinal = self.first_ordinal
+        for quantity, offset, price_index in zip(
+                self.quantities.tolist(), self.date_offsets.tolist(),
+                self.price_indices.tolist()):
+            yield Vest(
+                vested_quantity=quantity,
+                total_value=Decimal(quantity) * prices[price_index],
+                date=datetime.date.fromordinal(first_ordinal + offset),
+            )
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the columns."""
+
+        return (self.quantities.nbytes + self.date_offsets.nbytes
+                + self.price_indices.nbytes)
+
+
+class ScheduleColumns(object):
+    """
+    The vests of many grants as columns, with the values the API renders.
+
+    Row ``i`` is a vest of the grant ``grant_ids[grant_indices[i]]`` on the
+    day ``days[i]``, counted from 1970-01-01, of ``vested_quantities[i]``
+    whole options worth ``value_cents[i]`` cents.
+    """
+
+    __slots__ = ('grant_ids', 'grant_indices', 'days', 'vested_quantities',
+                 'value_cents')
+
+    def __init__(self, grant_ids, grant_indices, days, vested_quantities,
+                 value_cents):
+        self.grant_ids = grant_ids
+        self.grant_indices = grant_indices
+        self.days = days
+        self.vested_quantities = vested_quantities
+        self.value_cents = value_cents
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+
+class OptionGrantRecord(models.Model):
+    """A stored grant of options to an employee."""
+
+    grant_id = models.CharField(max_length=255, unique=True)
+    employee_id = models.CharField(max_length=255, db_index=True)
+    quantity = models.BigIntegerField()
+    start_date = models.DateField()
+    cliff_months = models.PositiveIntegerField()
+    duration_months = models.PositiveIntegerField()
+    frequency = models.CharField(
+        max_length=16, default=MONTHLY,
+        choices=[(frequency, frequency) for frequency in FREQUENCIES])
+
+    def to_option_grant(self) -> OptionGrant:
+        return OptionGrant(
+            quantity=self.quantity,
+            start_date=self.start_date,
+            cliff_months=self.cliff_months,
+            duration_months=self.duration_months,
+            frequency=self.frequency,
+        )
+
+
+class CompanyValuationRecord(models.Model):
+    """A stored valuation of the company."""
+
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    valuation_date = models.DateField(db_index=True)
+
+    def to_company_valuation(self) -> CompanyValuation:
+        return CompanyValuation(
+            price=self.price, valuation_date=self.valuation_date)
+
+
+class VestRecord(models.Model):
+    """
+    A stored vesting event of a grant.
+
+    ``vested_quantity`` and ``total_value`` are cumulative, as in a
+    ``Vest``. The employee is copied from the grant so the vests of an
+    employee are found by the ``(employee_id, date)`` index.
+    """
+
+    grant = models.ForeignKey(
+        OptionGrantRecord, on_delete=models.CASCADE, related_name='vests')
+    employee_id = models.CharField(max_length=255)
+    date = models.DateField()
+    vested_quantity = models.FloatField()
+    total_value = models.DecimalField(max_digits=20, decimal_places=2)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['grant', 'date'], name='unique_vest_date_per_grant'),
+        ]
+        indexes = [
+            models.Index(fields=['employee_id', 'date'],
+                         name='vest_employee_date_idx'),
+        ]
+
+    def to_vest(self) -> Vest:
+        return Vest(
+            vested_quantity=self.vested_quantity,
+            total_value=self.total_value,
+            date=self.date,
+        )
@@ -0,0 +1,109 @@
+"""
+Renderers for the vesting app.
+"""
+import json
+
+import msgpack
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+from vesting.columnar import vests_to_columns
+from vesting.encoders import VestRepresentation
+
+from app.shared.instrumentation import timed
+
+
+class VestJSONEncoder(JSONEncoder):
+    """JSON encoder that also understands ``VestRepresentation``."""
+
+    def default(self, obj):
+        if isinstance(obj, VestRepresentation):
+            return list(obj)
+        return super().default(obj)
+
+
+class VestJSONRenderer(JSONRenderer):
+    """
+    JSON renderer with a fast path for schedules.
+
+    ``VestRepresentation`` values, at the top level or inside dictionaries,
+    are written with the vest encoder. Anything else, and any indented
+    output, goes through ``JSONRenderer`` unchanged.
+    """
+    encoder_class = VestJSONEncoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render `data` into JSON, returning a bytestring."""
+
+        with timed('render'):
+            return self._render(data, accepted_media_type, renderer_context)
+
+    def _render(self, data, accepted_media_type, renderer_context):
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+
+        if indent is not None or not self.compact or \
+                not self._has_representation(data):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = self._encode(data)
+        ret = ret.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029')
+        return ret.encode()
+
+    def _has_representation(self, data) -> bool:
+        """Whether the data holds a schedule the fast path can encode."""
+
+        if isinstance(data, VestRepresentation):
+            return True
+        if isinstance(data, dict):
+            return any(self._has_representation(value)
+                       for value in data.values())
+        return False
+
+    def _encode(self, data) -> str:
+        """Encode the data, splicing in the encoded schedules."""
+
+        if isinstance(data, VestRepresentation):
+            return data.encode()
+
+        if isinstance(data, dict) and self._has_representation(data):
+            return '{' + ','.join(
+                self._dumps(str(key)) + ':' + self._encode(value)
+                for key, value in data.items()
+            ) + '}'
+
+        return self._dumps(data)
+
+    def _dumps(self, data) -> str:
+        """Encode the data as ``JSONRenderer`` does."""
+
+        return json.dumps(
+            data, cls=self.encoder_class, ensure_ascii=self.ensure_ascii,
+            allow_nan=not self.strict, separators=(',', ':'))
+
+
+class VestMessagePackRenderer(BaseRenderer):
+    """
+    MessagePack renderer sending schedules as columns.
+
+    ``VestRepresentation`` values become the delta encoded columns of
+    ``vesting.columnar``; anything else, such as errors, is packed as the
+    JSON renderer would write it.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render `data` into MessagePack, returning a bytestring."""
+
+        if data is None:
+            return b''
+
+        with timed('render'):
+            return msgpack.packb(data, default=self._default)
+
+    @staticmethod
+    def _default(obj):
+        if isinstance(obj, VestRepresentation):
+            return vests_to_columns(obj.vests)
+        return json.loads(json.dumps(obj, cls=JSONEncoder))
@@ -0,0 +1,57 @@
+"""
+Company Valuation Repository.
+"""
+import datetime
+from typing import Iterable, Optional
+
+from vesting.engine.valuation_timeline import ValuationTimeline
+from vesting.models import CompanyValuation, CompanyValuationRecord
+
+BATCH_SIZE = 1000
+
+
+class CompanyValuationRepository:
+    """Store and load company valuations."""
+
+    def bulk_create(self, company_valuations: Iterable[CompanyValuation],
+                    batch_size: int = BATCH_SIZE
+                    ) -> list[CompanyValuationRecord]:
+        """Insert valuations."""
+
+        return CompanyValuationRecord.objects.bulk_create(
+            [
+                CompanyValuationRecord(
+                    price=company_valuation.price,
+                    valuation_date=company_valuation.valuation_date,
+                )
+                for company_valuation in company_valuations
+            ],
+            batch_size=batch_size,
+        )
+
+    def timeline(self) -> ValuationTimeline:
+        """Every valuation, in the order they were made."""
+
+        return ValuationTimeline([
+            record.to_company_valuation()
+            for record in CompanyValuationRecord.objects.order_by(
+                'valuation_date', 'pk')
+        ])
+
+    def in_effect_on(self, date: datetime.date
+                     ) -> Optional[CompanyValuation]:
+        """The latest valuation made on or before a date, or ``None``."""
+
+        record = CompanyValuationRecord.objects.filter(
+            valuation_date__lte=date,
+        ).order_by('-valuation_date', '-pk').first()
+        return None if record is None else record.to_company_valuation()
+
+    def next_valuation_date(self, date: datetime.date
+                            ) -> Optional[datetime.date]:
+        """Date of the first valuation made after a date, or ``None``."""
+
+        return CompanyValuationRecord.objects.filter(
+            valuation_date__gt=date,
+        ).order_by('valuation_date').values_list(
+            'valuation_date', flat=True).first()
@@ -0,0 +1,76 @@
+"""
+Option Grant Repository.
+"""
+from typing import Iterable, Optional
+
+from vesting.models import OptionGrant, OptionGrantRecord
+
+BATCH_SIZE = 1000
+
+
+class OptionGrantRepository:
+    """Store and load option grants."""
+
+    def bulk_create(self,
+                    option_grants: Iterable[tuple[str, str, OptionGrant]],
+                    batch_size: int = BATCH_SIZE) -> list[OptionGrantRecord]:
+        """
+        Insert ``(grant_id, employee_id, option_grant)`` triples.
+
+        Returns the records with their primary keys, which are read back on
+        databases that do not return them from a bulk insert.
+        """
+
+        records = OptionGrantRecord.objects.bulk_create(
+            [
+                OptionGrantRecord(
+                    grant_id=grant_id,
+                    employee_id=employee_id,
+                    quantity=option_grant.quantity,
+                    start_date=option_grant.start_date,
+                    cliff_months=option_grant.cliff_months,
+                    duration_months=option_grant.duration_months,
+                    frequency=option_grant.frequency,
+                )
+                for grant_id, employee_id, option_grant in option_grants
+            ],
+            batch_size=batch_size,
+        )
+
+        if all(record.pk is not None for record in records):
+            return records
+
+        grant_ids = [record.grant_id for record in records]
+        stored: dict[str, OptionGrantRecord] = {}
+        for start in range(0, len(grant_ids), batch_size):
+            stored.update(OptionGrantRecord.objects.in_bulk(
+                grant_ids[start:start + batch_size], field_name='grant_id'))
+        return [stored[grant_id] for grant_id in grant_ids]
+
+    def update(self, option_grant_record: OptionGrantRecord,
+               option_grant: OptionGrant) -> OptionGrantRecord:
+        """Store the new parameters of a grant."""
+
+        option_grant_record.quantity = option_grant.quantity
+        option_grant_record.start_date = option_grant.start_date
+        option_grant_record.cliff_months = option_grant.cliff_months
+        option_grant_record.duration_months = option_grant.duration_months
+        option_grant_record.frequency = option_grant.frequency
+        option_grant_record.save(update_fields=[
+            'quantity', 'start_date', 'cliff_months', 'duration_months',
+            'frequency'])
+        return option_grant_record
+
+    def get(self, grant_id: str) -> Optional[OptionGrantRecord]:
+        """The grant with this id, or ``None``."""
+
+        return OptionGrantRecord.objects.filter(grant_id=grant_id).first()
+
+    def all(self, employee_id: Optional[str] = None
+            ) -> list[OptionGrantRecord]:
+        """Every grant, or the grants of one employee, by grant id."""
+
+        records = OptionGrantRecord.objects.order_by('grant_id')
+        if employee_id is not None:
+            records = records.filter(employee_id=employee_id)
+        return list(records)
@@ -0,0 +1,171 @@
+"""
+Vest Repository.
+
+Vests are materialized per grant so questions about many grants at a date
+are answered by the database. The vested quantity and value of a vest are
+cumulative, so what a grant has vested as of a date is its latest vest on
+or before that date, found with the ``(grant, date)`` unique index.
+"""
+import datetime
+from decimal import Decimal
+from itertools import groupby
+from operator import attrgetter
+from typing import Iterable, Iterator, Optional
+
+from django.db import transaction
+from django.db.models import OuterRef, Subquery, Sum
+from vesting.models import OptionGrantRecord, Vest, VestRecord
+
+BATCH_SIZE = 1000
+
+
+class VestRepository:
+    """Store materialized vests and query them in SQL."""
+
+    def replace_schedules(
+        self,
+        schedules: Iterable[tuple[OptionGrantRecord, Iterable[Vest]]],
+        batch_size: int = BATCH_SIZE,
+    ) -> int:
+        """Replace the vests of the given grants, returning the count."""
+
+        schedules = list(schedules)
+        records = [
+            VestRecord(
+                grant=option_grant_record,
+                employee_id=option_grant_record.employee_id,
+                date=vest.date,
+                vested_quantity=vest.vested_quantity,
+                total_value=vest.total_value,
+            )
+            for option_grant_record, vests in schedules
+            for vest in vests
+        ]
+
+        with transaction.atomic():
+            VestRecord.objects.filter(grant__in=[
+                option_grant_record.pk
+                for option_grant_record, _ in schedules
+            ]).delete()
+            VestRecord.objects.bulk_create(records, batch_size=batch_size)
+
+        return len(records)
+
+    def replace_schedule_from(self, option_grant_record: OptionGrantRecord,
+                              vests: Iterable[Vest], first_date: datetime.date,
+                              batch_size: int = BATCH_SIZE) -> int:
+        """
+        Replace the vests of a grant on or after a date, returning the count.
+
+        The earlier vests of the grant are left as they are.
+        """
+
+        records = [
+            VestRecord(
+                grant=option_grant_record,
+                employee_id=option_grant_record.employee_id,
+                date=vest.date,
+                vested_quantity=vest.vested_quantity,
+                total_value=vest.total_value,
+            )
+            for vest in vests
+            if vest.date >= first_date
+        ]
+
+        with transaction.atomic():
+            VestRecord.objects.filter(
+                grant=option_grant_record, date__gte=first_date).delete()
+            VestRecord.objects.bulk_create(records, batch_size=batch_size)
+
+        return len(records)
+
+    def schedules_between(
+        self, first_date: datetime.date,
+        next_date: Optional[datetime.date] = None,
+    ) -> Iterator[tuple[OptionGrantRecord, list[VestRecord]]]:
+        """
+        Every stored vest of the grants with a vest from ``first_date``
+        until ``next_date``, by grant and date, in one query.
+        """
+
+        vests = VestRecord.objects.filter(date__gte=first_date)
+        if next_date is not None:
+            vests = vests.filter(date__lt=next_date)
+
+        records = VestRecord.objects.filter(
+            grant__in=vests.values('grant')).select_related(
+                'grant').order_by('grant', 'date')
+        for _, grant_records in groupby(records,
+                                        key=attrgetter('grant_id')):
+            grant_records = list(grant_records)
+            yield grant_records[0].grant, grant_records
+
+    def update_values(self, records: Iterable[VestRecord],
+                      batch_size: int = BATCH_SIZE) -> int:
+        """Store the ``total_value`` of vests, returning the count."""
+
+        records = list(records)
+        VestRecord.objects.bulk_update(
+            records, ['total_value'], batch_size=batch_size)
+        return len(records)
+
+    def schedule(self, grant_id: str) -> list[Vest]:
+        """The stored vests of a grant, by date."""
+
+        return [
+            record.to_vest()
+            for record in VestRecord.objects.filter(
+                grant__grant_id=grant_id).order_by('date')
+        ]
+
+    def total_vested_as_of(self, as_of: datetime.date,
+                           employee_id: Optional[str] = None) -> dict:
+        """
+        Vested quantity and value summed over every grant as of a date.
+
+        Runs as one query; grants without a vest by then count as zero.
+        """
+
+        grants = self._vested_as_of(as_of)
+        if employee_id is not None:
+            grants = grants.filter(employee_id=employee_id)
+
+        totals = grants.aggregate(
+            vested_quantity=Sum('latest_vested_quantity'),
+            total_value=Sum('latest_total_value'),
+        )
+        return {
+            'vested_quantity': totals['vested_quantity'] or 0.0,
+            'total_value': totals['total_value'] or Decimal('0.00'),
+        }
+
+    def vested_by_employee_as_of(self, as_of: datetime.date
+                                 ) -> dict[str, dict]:
+        """Vested quantity and value of every employee as of a date."""
+
+        rows = self._vested_as_of(as_of).values('employee_id').annotate(
+            vested_quantity=Sum('latest_vested_quantity'),
+            total_value=Sum('latest_total_value'),
+        ).order_by('employee_id')
+
+        return {
+            row['employee_id']: {
+                'vested_quantity': row['vested_quantity'] or 0.0,
+                'total_value': row['total_value'] or Decimal('0.00'),
+            }
+            for row in rows
+        }
+
+    @staticmethod
+    def _vested_as_of(as_of: datetime.date):
+        """Grants annotated with their latest vest on or before a date."""
+
+        latest_vest = VestRecord.objects.filter(
+            grant=OuterRef('pk'), date__lte=as_of).order_by('-date')
+
+        return OptionGrantRecord.objects.annotate(
+            latest_vested_quantity=Subquery(
+                latest_vest.values('vested_quantity')[:1]),
+            latest_total_value=Subquery(
+                latest_vest.values('total_value')[:1]),
+        )
@@ -0,0 +1,320 @@
+"""
+Schedule cache.
+
+A schedule only depends on the grant parameters and on the valuations in
+effect while it vests, so it can be memoized on a normalized key of those
+values. Two backends are available and chosen with the
+``VESTING_SCHEDULE_CACHE`` setting:
+
+* ``'lru'``: an in-process LRU bounded by ``MAX_SIZE`` entries.
+* ``'django'``: Django's cache framework, using the ``CACHE_ALIAS`` cache,
+  so a shared cache such as Redis or Memcached can serve every worker.
+
+Both expire entries after ``TTL`` seconds. Setting ``BACKEND`` to ``None``
+disables the cache. Clearing the ``'django'`` backend only drops the
+schedules, not the other entries of the shared cache.
+"""
+import calendar
+import datetime
+import decimal
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from vesting.engine.valuation_timeline import ValuationTimeline
+from vesting.models import OptionGrant
+
+MISSING = object()
+
+DEFAULT_SCHEDULE_CACHE = {
+    'BACKEND': 'lru',
+    'MAX_SIZE': 1024,
+    'TTL': 300,
+    'CACHE_ALIAS': 'default',
+}
+
+
+def canonical_decimal(value) -> str:
+    """Text of a number without trailing zeros, so 10.0 and 10.00 match."""
+
+    value = decimal.Decimal(value)
+    context = decimal.Context(prec=max(len(value.as_tuple().digits), 1))
+    return str(value.normalize(context))
+
+
+def _last_vest_date(start_date: datetime.date,
+                    duration: int) -> datetime.date:
+    """Date of the last vest of a schedule."""
+
+    year, month = divmod(start_date.year * 12 + start_date.month - 1
+                         + duration, 12)
+    if year > datetime.MAXYEAR:
+        return datetime.date.max
+
+    day = min(start_date.day, calendar.monthrange(year, month + 1)[1])
+    return datetime.date(year, month + 1, day)
+
+
+def schedule_key(option_grant: OptionGrant,
+                 valuation_timeline: ValuationTimeline) -> tuple:
+    """
+    Normalized key of everything a schedule depends on.
+
+    Only the valuations in effect between the first and the last vest are
+    part of the key, so an unrelated valuation history does not split the
+    cache.
+    """
+
+    first = max(valuation_timeline.index_at(option_grant.start_date), 0)
+    last = valuation_timeline.index_at(_last_vest_date(
+        option_grant.start_date, option_grant.duration_months))
+
+    return (
+        int(option_grant.quantity),
+        option_grant.start_date.isoformat(),
+        int(option_grant.cliff_months),
+        int(option_grant.duration_months),
+        option_grant.frequency,
+        tuple(
+            (valuation.valuation_date.isoformat(),
+             canonical_decimal(valuation.price))
+            for valuation in
+            valuation_timeline.company_valuations[first:last + 1]
+        ),
+    )
+
+
+class LRUCacheBackend:
+    """In-process cache with least recently used eviction."""
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None,
+                 timer: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.evictions = 0
+        self._timer = timer
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Cached value, or ``MISSING``."""
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= self._timer():
+                del self._entries[key]
+                return MISSING
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value) -> None:
+        """Store a value, evicting the least recently used ones."""
+
+        expires_at = None if self.ttl is None else self._timer() + self.ttl
+
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry."""
+
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DjangoCacheBackend:
+    """
+    Cache stored in one of Django's configured caches.
+
+    Every entry holds the version of the schedules it was stored under, and
+    only the entries of the current version are hits. ``clear`` stores a new
+    version, which every worker reads with its next lookup, so the old
+    entries are left to expire instead of clearing a cache that other data
+    may share.
+    """
+
+    key_prefix = 'vesting:schedule:'
+    version_key = key_prefix + 'version'
+
+    def __init__(self, alias: str = 'default', ttl: Optional[float] = None):
+        self.alias = alias
+        self.ttl = ttl
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _key(self, key: tuple) -> str:
+        return self.key_prefix + hashlib.sha256(
+            repr(key).encode('utf-8')).hexdigest()
+
+    def _version(self) -> Optional[str]:
+        """The current version, created when the cache has none."""
+
+        version = self.cache.get(self.version_key)
+        if version is None:
+            self.cache.add(self.version_key, uuid.uuid4().hex, timeout=None)
+            version = self.cache.get(self.version_key)
+        return version
+
+    def get(self, key):
+        """Cached value of the current version, or ``MISSING``."""
+
+        cache_key = self._key(key)
+        entries = self.cache.get_many([self.version_key, cache_key])
+        version = entries.get(self.version_key)
+        entry = entries.get(cache_key)
+
+        if version is None or entry is None or entry[0] != version:
+            return MISSING
+        return entry[1]
+
+    def set(self, key, value) -> None:
+        """Store a value for ``ttl`` seconds."""
+
+        self.cache.set(self._key(key), (self._version(), value),
+                       timeout=self.ttl)
+
+    def clear(self) -> None:
+        """Drop every schedule by moving to a new version."""
+
+        self.cache.set(self.version_key, uuid.uuid4().hex, timeout=None)
+
+
+class ScheduleCache:
+    """Memoize schedules and count hits and misses."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: tuple, compute: Callable):
+        """Cached value for the key, computing and storing it on a miss."""
+
+        value = self.backend.get(key)
+        if value is not MISSING:
+            with self._lock:
+                self.hits += 1
+            return value
+
+        with self._lock:
+            self.misses += 1
+
+        value = compute()
+        self.backend.set(key, value)
+        return value
+
+    def get(self, key: tuple):
+        """Cached value for the key, or ``MISSING``, counting the lookup."""
+
+        value = self.backend.get(key)
+        with self._lock:
+            if value is MISSING:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def stats(self) -> dict:
+        """Hit and miss counters, plus size and evictions when known."""
+
+        stats = {'hits': self.hits, 'misses': self.misses}
+        if isinstance(self.backend, LRUCacheBackend):
+            stats.update(size=len(self.backend),
+                         max_size=self.backend.max_size,
+                         evictions=self.backend.evictions)
+        return stats
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+
+        self.backend.clear()
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+
+_schedule_cache = MISSING
+_schedule_cache_lock = threading.Lock()
+
+
+def build_schedule_cache(config: dict) -> Optional[ScheduleCache]:
+    """Build the cache described by a ``VESTING_SCHEDULE_CACHE`` dict."""
+
+    config = dict(DEFAULT_SCHEDULE_CACHE, **config)
+    backend = config['BACKEND']
+
+    if backend is None:
+        return None
+    if backend == 'lru':
+        return ScheduleCache(LRUCacheBackend(
+            max_size=config['MAX_SIZE'], ttl=config['TTL']))
+    if backend == 'django':
+        return ScheduleCache(DjangoCacheBackend(
+            alias=config['CACHE_ALIAS'], ttl=config['TTL']))
+
+    raise ValueError(
+        "Unknown schedule cache backend {!r}.".format(backend))
+
+
+def get_schedule_cache() -> Optional[ScheduleCache]:
+    """The process wide schedule cache, or ``None`` when disabled."""
+
+    global _schedule_cache
+
+    if _schedule_cache is MISSING:
+        with _schedule_cache_lock:
+            if _schedule_cache is MISSING:
+                _schedule_cache = build_schedule_cache(getattr(
+                    settings, 'VESTING_SCHEDULE_CACHE', {}))
+
+    return _schedule_cache
+
+
+@receiver(setting_changed)
+def reset_schedule_cache(setting: str, **kwargs) -> None:
+    """Rebuild the cache on next use when its setting changes."""
+
+    global _schedule_cache
+
+    if setting == 'VESTING_SCHEDULE_CACHE':
+        _schedule_cache = MISSING
+
+
+def cache_metrics() -> list[str]:
+    """The schedule cache counters in the Prometheus text format."""
+
+    schedule_cache = get_schedule_cache()
+    if schedule_cache is None:
+        return []
+
+    lines = []
+    for name, value in schedule_cache.stats().items():
+        kind = 'counter' if name in ('hits', 'misses', 'evictions') \
+            else 'gauge'
+        metric = 'vesting_schedule_cache_{}{}'.format(
+            name, '_total' if kind == 'counter' else '')
+        lines.append('# TYPE {} {}'.format(metric, kind))
+        lines.append('{} {}'.format(metric, value))
+    return lines
@@ -0,0 +1,142 @@
+"""
+Links to schedules.
+
+A schedule is a pure function of its grant and valuations, so besides
+being posted to ``schedule/`` it can be read at ``schedule/<token>/``,
+where the token names the grant and the valuations. The token is the
+canonical form of the payload, ``[quantity, start date, cliff, duration,
+frequency, price, valuation date, ...]`` with a price and a date for every
+valuation in date order, as compact JSON in URL safe base64 without
+padding, so payloads that only differ in formatting or in the order of the
+valuations get the same link and any worker can serve it without storing
+anything. A history too long for ``MAX_TOKEN_LENGTH`` gets no link.
+
+The ETag of a linked schedule hashes its token and whatever else shapes the
+response: the arithmetic, the collapse flag and the media type. It is known
+before the schedule is computed, so a matching ``If-None-Match`` is answered
+``304 Not Modified`` without decoding the token.
+"""
+import base64
+import decimal
+import hashlib
+import json
+from typing import Iterable, Optional, Union
+
+from django.conf import settings
+from django.urls import reverse
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from vesting.encoders import format_date
+from vesting.engine.valuation_timeline import ValuationTimeline
+from vesting.models import CompanyValuation, OptionGrant
+from vesting.schedule_cache import canonical_decimal
+
+DEFAULT_MAX_AGE = 86400
+MAX_TOKEN_LENGTH = 512
+GRANT_FIELDS = 5
+VALUATION_FIELDS = 2
+
+# Changes whenever the representation of a schedule does, so that caches
+# holding the old one revalidate.
+REPRESENTATION_VERSION = '1'
+
+
+def schedule_token(option_grant: OptionGrant,
+                   company_valuations: Union[
+                       ValuationTimeline, CompanyValuation,
+                       Iterable[CompanyValuation]]) -> Optional[str]:
+    """
+    Token of the link to the schedule of a grant and its valuations.
+
+    ``None`` when the token would be longer than ``MAX_TOKEN_LENGTH``.
+    """
+
+    fields = [
+        int(option_grant.quantity),
+        format_date(option_grant.start_date),
+        int(option_grant.cliff_months),
+        int(option_grant.duration_months),
+        option_grant.frequency,
+    ]
+    for company_valuation in ValuationTimeline.of(
+            company_valuations).company_valuations:
+        fields += [
+            '{:f}'.format(decimal.Decimal(
+                canonical_decimal(company_valuation.price))),
+            format_date(company_valuation.valuation_date),
+        ]
+    canonical = json.dumps(fields, separators=(',', ':'))
+
+    token = base64.urlsafe_b64encode(
+        canonical.encode('ascii')).rstrip(b'=').decode('ascii')
+    return token if len(token) <= MAX_TOKEN_LENGTH else None
+
+
+def parse_schedule_token(token: str) -> dict:
+    """
+    Payload of the schedule endpoint named by a token.
+
+    Raises ``ValueError`` when the token is not one; the payload itself is
+    left to the validators.
+    """
+
+    if len(token) > MAX_TOKEN_LENGTH:
+        raise ValueError("Schedule token too long.")
+
+    fields = json.loads(base64.urlsafe_b64decode(
+        token + '=' * (-len(token) % 4)).decode('ascii'))
+    if type(fields) is not list or len(fields) <= GRANT_FIELDS or \
+            (len(fields) - GRANT_FIELDS) % VALUATION_FIELDS:
+        raise ValueError(
+            "Schedule token without a grant and its valuations.")
+
+    (quantity, start_date, cliff_months, duration_months,
+     frequency) = fields[:GRANT_FIELDS]
+    valuations = fields[GRANT_FIELDS:]
+
+    return {
+        'option_grants': [{
+            'quantity': quantity,
+            'start_date': start_date,
+            'cliff_months': cliff_months,
+            'duration_months': duration_months,
+            'frequency': frequency,
+        }],
+        'company_valuations': [
+            {'price': price, 'valuation_date': valuation_date}
+            for price, valuation_date in zip(valuations[::2],
+                                             valuations[1::2])
+        ],
+    }
+
+
+def schedule_link(token: str, collapse: bool = False) -> str:
+    """Path of the linked schedule."""
+
+    path = reverse('vesting:schedule-detail', kwargs={'token': token})
+    return path + '?collapse=1' if collapse else path
+
+
+def schedule_etag(token: str, arithmetic: str, collapse: bool,
+                  media_type: str) -> str:
+    """Strong ETag of a linked schedule."""
+
+    digest = hashlib.sha256('\n'.join((
+        REPRESENTATION_VERSION, arithmetic, str(int(collapse)), media_type,
+        token)).encode('utf-8')).hexdigest()
+
+    return '"{}"'.format(digest[:32])
+
+
+def schedule_max_age() -> int:
+    """Seconds a linked schedule may be cached for."""
+
+    return getattr(settings, 'VESTING_SCHEDULE_MAX_AGE', DEFAULT_MAX_AGE)
+
+
+def add_cache_headers(response, etag: str):
+    """Let shared caches keep a linked schedule, told apart by media type."""
+
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=schedule_max_age())
+    patch_vary_headers(response, ('Accept',))
+    return response
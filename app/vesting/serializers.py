@@ -2,6 +2,7 @@
 Serializers for the vesting app.
 """
 from rest_framework import serializers
+from vesting.models import FREQUENCIES, MONTHLY
 
 
 class CompanyValuationSerializer(serializers.Serializer):
@@ -25,6 +26,8 @@ class VestSerializer(serializers.Serializer):
     total_value = serializers.DecimalField(max_digits=10, decimal_places=2)
     date = serializers.DateField(input_formats=['%d-%m-%Y'],
                                  format='%d-%m-%Y')
+    end_date = serializers.DateField(
+        input_formats=['%d-%m-%Y'], format='%d-%m-%Y', required=False)
 
     def validate(self, data: dict) -> dict:
         """Validate the data."""
@@ -47,6 +50,7 @@ class OptionGrantSerializer(serializers.Serializer):
                                        format='%d-%m-%Y')
     cliff_months = serializers.IntegerField()
     duration_months = serializers.IntegerField()
+    frequency = serializers.ChoiceField(choices=FREQUENCIES, default=MONTHLY)
 
     def validate(self, data: dict) -> dict:
         """Validate the data."""
@@ -82,7 +86,67 @@ class OptionCompanyValuationSerializer(serializers.Serializer):
         if len(data['option_grants']) != 1:
             raise serializers.ValidationError(
                 "Only one option grant must be provided.")
-        if len(data['company_valuations']) != 1:
+        if not data['company_valuations']:
             raise serializers.ValidationError(
-                "Only one company valuation must be provided.")
+                "At least one company valuation must be provided.")
         return data
+
+
+class VestedAsOfSerializer(OptionCompanyValuationSerializer):
+    """ Option Grant, Company Valuation and As Of Dates Serializer."""
+
+    as_of = serializers.DateField(
+        input_formats=['%d-%m-%Y'], format='%d-%m-%Y', required=False)
+    as_of_dates = serializers.ListField(
+        child=serializers.DateField(
+            input_formats=['%d-%m-%Y'], format='%d-%m-%Y'),
+        allow_empty=False, required=False)
+
+    def validate(self, data: dict) -> dict:
+        """Validate the data."""
+
+        data = super().validate(data)
+        if ('as_of' in data) == ('as_of_dates' in data):
+            raise serializers.ValidationError(
+                "Either an as of date or a list of as of dates must be "
+                "provided.")
+        return data
+
+
+class PortfolioSerializer(serializers.Serializer):
+    """ Option Grants and Company Valuations of a portfolio Serializer."""
+
+    option_grants = OptionGrantSerializer(
+        many=True, required=True, allow_empty=False)
+    company_valuations = CompanyValuationSerializer(
+        many=True, required=True, allow_empty=False)
+
+
+class BatchOptionGrantSerializer(OptionGrantSerializer):
+    """Option Grant Serializer identified by a client supplied id."""
+
+    id = serializers.CharField(max_length=255)
+
+
+class BatchScheduleSerializer(serializers.Serializer):
+    """ Batch of Option Grants and Company Valuations Serializer."""
+
+    option_grants = serializers.ListField(
+        child=serializers.DictField(), allow_empty=False)
+    company_valuations = CompanyValuationSerializer(
+        many=True, required=True, allow_empty=False)
+
+    def validate_option_grants(self, value: list) -> list:
+        """Validate every option grant carries a unique id."""
+
+        ids = [option_grant.get('id') for option_grant in value]
+
+        if any(grant_id in (None, '') for grant_id in ids):
+            raise serializers.ValidationError(
+                "Every option grant must have an id.")
+
+        if len({str(grant_id) for grant_id in ids}) != len(ids):
+            raise serializers.ValidationError(
+                "Option grant ids must be unique.")
+
+        return value
@@ -0,0 +1,62 @@
+"""
+Streaming responses for the vesting app.
+
+Schedules can be streamed as newline delimited JSON (NDJSON) by adding
+``?stream=1`` to the request. Records are encoded as they are produced and
+sent in small chunks, so memory stays flat however long the output is.
+Adding ``?collapse=1`` sends a run of equal vests as one record, streamed or
+not.
+"""
+import json
+from typing import Iterable, Iterator
+
+from django.http import StreamingHttpResponse
+
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+LINES_PER_CHUNK = 64
+
+
+def is_flag_requested(request, name: str) -> bool:
+    """Whether the client turned a query parameter flag on."""
+
+    return request.query_params.get(name, '').lower() in ('1', 'true', 'yes')
+
+
+def is_stream_requested(request) -> bool:
+    """Whether the client asked for a streamed response."""
+
+    return is_flag_requested(request, 'stream')
+
+
+def is_collapse_requested(request) -> bool:
+    """Whether the client asked for the runs of equal vests collapsed."""
+
+    return is_flag_requested(request, 'collapse')
+
+
+def json_line(record) -> str:
+    """Encode a record as one compact line of JSON."""
+
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+
+
+def ndjson_chunks(lines: Iterable[str],
+                  lines_per_chunk: int = LINES_PER_CHUNK) -> Iterator[bytes]:
+    """Join JSON lines into NDJSON, yielding a chunk every few lines."""
+
+    chunk: list[str] = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= lines_per_chunk:
+            yield ('\n'.join(chunk) + '\n').encode('utf-8')
+            chunk = []
+
+    if chunk:
+        yield ('\n'.join(chunk) + '\n').encode('utf-8')
+
+
+def ndjson_response(lines: Iterable[str]) -> StreamingHttpResponse:
+    """Stream JSON lines as an NDJSON response."""
+
+    return StreamingHttpResponse(
+        ndjson_chunks(lines), content_type=NDJSON_CONTENT_TYPE)
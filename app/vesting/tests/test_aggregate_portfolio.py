@@ -0,0 +1,175 @@
+"""
+Test the PortfolioEngine class and the portfolio API.
+"""
+import datetime
+import random
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from vesting.engine.portfolio_engine import PortfolioEngine
+from vesting.engine.schedule_engine import ScheduleEngine
+from vesting.models import CompanyValuation, OptionGrant
+from vesting.use_cases.aggregate_portfolio.aggregate_portfolio_use_case import (  # noqa: E501
+    AggregatePortfolioUseCase)
+
+from app.shared.exceptions import BusinessValidationError
+
+VESTING_SCHEDULE_PORTFOLIO_URL = reverse("vesting:schedule-portfolio")
+
+
+class PortfolioEngineTest(TestCase):
+    """Test the PortfolioEngine class."""
+
+    def setUp(self):
+        self.__company_valuations = [
+            CompanyValuation(price=Decimal('10.00'),
+                             valuation_date=datetime.date(2017, 12, 9)),
+            CompanyValuation(price=Decimal('12.37'),
+                             valuation_date=datetime.date(2019, 6, 30)),
+            CompanyValuation(price=Decimal('3.10'),
+                             valuation_date=datetime.date(2020, 2, 15)),
+        ]
+
+    def test_given_grants_when_calculate_then_sum_of_schedules(self):
+        """Test the curve is the sum of the schedules at every month end."""
+
+        # Arrange
+        randomizer = random.Random(7)
+        option_grants = []
+        for _ in range(60):
+            duration = randomizer.randint(1, 60)
+            option_grants.append(OptionGrant(
+                randomizer.randint(1, 10 ** 5),
+                datetime.date(2018, 1, 1) + datetime.timedelta(
+                    randomizer.randint(0, 900)),
+                randomizer.choice([0, duration,
+                                   randomizer.randint(0, duration)]),
+                duration,
+            ))
+        schedules = [
+            ScheduleEngine().calculate(option_grant,
+                                       self.__company_valuations)
+            for option_grant in option_grants
+        ]
+
+        # Act
+        curve = PortfolioEngine().calculate(
+            option_grants, self.__company_valuations)
+
+        # Assert
+        self.assertEqual(curve[0].date, datetime.date(2018, 1, 31))
+        last_date = max(schedule[-1].date for schedule in schedules)
+        next_month = last_date.replace(day=28) + datetime.timedelta(days=4)
+        self.assertEqual(
+            curve[-1].date,
+            next_month - datetime.timedelta(days=next_month.day))
+        for point in curve:
+            latest_vests = [
+                [vest for vest in schedule if vest.date <= point.date]
+                for schedule in schedules
+            ]
+            latest_vests = [vests[-1] for vests in latest_vests if vests]
+            self.assertAlmostEqual(
+                point.vested_quantity,
+                sum(vest.vested_quantity for vest in latest_vests),
+                places=5)
+            self.assertLessEqual(
+                abs(point.total_value
+                    - sum(vest.total_value for vest in latest_vests)),
+                Decimal('0.01'))
+
+    def test_given_no_cliff_when_calculate_then_final_vest_doubled(self):
+        """Test the README formula's last vest without cliff is kept."""
+
+        # Act
+        curve = PortfolioEngine().calculate(
+            [OptionGrant(1200, datetime.date(2018, 1, 15), 0, 12)],
+            self.__company_valuations)
+
+        # Assert
+        self.assertEqual(
+            [point.vested_quantity for point in curve],
+            [0.0] + [100.0 * month for month in range(1, 12)] + [2400.0])
+        self.assertEqual(curve[-1].total_value, Decimal('24000.00'))
+
+    def test_given_no_grants_when_calculate_then_empty(self):
+        """Test an empty portfolio has an empty curve."""
+
+        self.assertEqual(
+            PortfolioEngine().calculate([], self.__company_valuations), [])
+
+    def test_given_invalid_grant_when_aggregate_then_fails(self):
+        """Test every grant is validated like for its schedule."""
+
+        with self.assertRaisesMessage(
+                BusinessValidationError,
+                "Start date must be greater than or equal to valuation date."):
+            AggregatePortfolioUseCase().execute(
+                [OptionGrant(4800, datetime.date(2018, 1, 31), 12, 48),
+                 OptionGrant(4800, datetime.date(2017, 1, 31), 12, 48)],
+                self.__company_valuations)
+
+
+class PortfolioAPITestCase(TestCase):
+    """Test the portfolio API."""
+
+    def setUp(self):
+        """Set up the test case."""
+
+        self.__client = APIClient()
+
+    def test_given_grants_when_portfolio_then_monthly_curve(self):
+        """Test the curve has a row per month end."""
+
+        # Arrange
+        payload = {
+            "option_grants": [
+                {
+                    "quantity": 4800,
+                    "start_date": "31-01-2018",
+                    "cliff_months": 12,
+                    "duration_months": 48,
+                },
+                {
+                    "quantity": 1200,
+                    "start_date": "15-06-2019",
+                    "cliff_months": 0,
+                    "duration_months": 12,
+                },
+            ],
+            "company_valuations": [
+                {
+                    "price": 10.0,
+                    "valuation_date": "09-12-2017"
+                }
+            ],
+        }
+
+        # Act
+        response = self.__client.post(
+            VESTING_SCHEDULE_PORTFOLIO_URL, payload, format="json")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        curve = response.json()
+        self.assertEqual(len(curve), 49)
+        self.assertEqual(curve[17], {
+            "vested_quantity": 1700, "total_value": "17000.00",
+            "date": "30-06-2019"})
+        self.assertEqual(curve[-1], {
+            "vested_quantity": 7200, "total_value": "72000.00",
+            "date": "31-01-2022"})
+
+    def test_given_no_grants_when_portfolio_then_fails(self):
+        """Test a portfolio needs at least one grant."""
+
+        response = self.__client.post(
+            VESTING_SCHEDULE_PORTFOLIO_URL,
+            {"option_grants": [], "company_valuations": [
+                {"price": 10.0, "valuation_date": "09-12-2017"}]},
+            format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
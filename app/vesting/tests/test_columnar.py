@@ -0,0 +1,132 @@
+"""
+Test the columnar MessagePack rendering of schedules.
+"""
+import datetime
+from decimal import Decimal
+
+import msgpack
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from vesting.columnar import columns_to_representation, vests_to_columns
+from vesting.engine.schedule_engine import EXACT, FLOAT, ScheduleEngine
+from vesting.models import (ANNUAL, DAILY, MONTHLY, QUARTERLY,
+                            CompanyValuation, OptionGrant)
+from vesting.serializers import VestSerializer
+
+VESTING_SCHEDULE_URL = reverse("vesting:schedule")
+VESTING_SCHEDULE_BATCH_URL = reverse("vesting:schedule-batch")
+MSGPACK = "application/msgpack"
+
+PAYLOAD = {
+    "option_grants": [
+        {
+            "quantity": 4800,
+            "start_date": "31-01-2018",
+            "cliff_months": 12,
+            "duration_months": 48,
+        }
+    ],
+    "company_valuations": [
+        {"price": "10.00", "valuation_date": "09-12-2017"}
+    ],
+}
+
+
+class ColumnarTest(TestCase):
+    """Test the columns decode to the serializer's rendering."""
+
+    def setUp(self):
+        """Set up the test case."""
+
+        self.__company_valuations = [
+            CompanyValuation(Decimal("0.01"), datetime.date(2017, 12, 9)),
+            CompanyValuation(Decimal("12.35"), datetime.date(2019, 6, 30)),
+            CompanyValuation(Decimal("3.3"), datetime.date(2020, 2, 29)),
+        ]
+
+    def test_given_schedules_when_round_trip_then_serializer_output(self):
+        """Test every frequency and arithmetic decodes to VestSerializer."""
+
+        for arithmetic in (FLOAT, EXACT):
+            schedule_engine = ScheduleEngine(arithmetic)
+            for frequency in (MONTHLY, QUARTERLY, ANNUAL, DAILY):
+                for quantity, cliff, duration in (
+                        (4800, 12, 48), (1001, 0, 7), (3, 5, 5)):
+                    with self.subTest(arithmetic=arithmetic,
+                                      frequency=frequency,
+                                      quantity=quantity):
+                        # Arrange
+                        vests = schedule_engine.calculate(
+                            OptionGrant(quantity, datetime.date(2018, 1, 31),
+                                        cliff, duration, frequency),
+                            self.__company_valuations)
+
+                        # Act
+                        columns = msgpack.unpackb(
+                            msgpack.packb(vests_to_columns(vests)))
+
+                        # Assert
+                        self.assertEqual(
+                            columns_to_representation(columns),
+                            VestSerializer(vests, many=True).data)
+
+    def test_given_collapsed_schedule_when_round_trip_then_end_dates(self):
+        """Test the runs of a collapsed schedule keep their end dates."""
+
+        # Arrange
+        vests = list(ScheduleEngine().iterate_collapsed(
+            OptionGrant(4800, datetime.date(2018, 1, 31), 12, 48, DAILY),
+            self.__company_valuations))
+
+        # Act
+        columns = vests_to_columns(vests)
+
+        # Assert
+        self.assertEqual(columns_to_representation(columns),
+                         VestSerializer(vests, many=True).data)
+        self.assertEqual(columns["length"], len(vests))
+        self.assertEqual(len(columns["end_date"]), len(vests))
+
+    def test_given_accept_msgpack_when_post_then_columns(self):
+        """Test the endpoints render columns when MessagePack is accepted."""
+
+        # Arrange
+        client = APIClient()
+        batch = dict(PAYLOAD, option_grants=[
+            dict(PAYLOAD["option_grants"][0], id="employee-1")])
+
+        # Act
+        json_response = client.post(
+            VESTING_SCHEDULE_URL, PAYLOAD, format="json")
+        response = client.post(VESTING_SCHEDULE_URL, PAYLOAD, format="json",
+                               HTTP_ACCEPT=MSGPACK)
+        batch_response = client.post(
+            VESTING_SCHEDULE_BATCH_URL, batch, format="json",
+            HTTP_ACCEPT=MSGPACK)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], MSGPACK)
+        self.assertEqual(
+            columns_to_representation(msgpack.unpackb(response.content)),
+            json_response.json())
+        self.assertLess(len(response.content) * 5, len(json_response.content))
+        schedules = msgpack.unpackb(batch_response.content)["schedules"]
+        self.assertEqual(
+            columns_to_representation(schedules["employee-1"]),
+            json_response.json())
+
+    def test_given_invalid_payload_when_post_msgpack_then_errors(self):
+        """Test the errors are packed as they are in JSON."""
+
+        # Act
+        response = APIClient().post(
+            VESTING_SCHEDULE_URL, {"option_grants": []}, format="json",
+            HTTP_ACCEPT=MSGPACK)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(msgpack.unpackb(response.content),
+                         {"company_valuations": ["This field is required."]})
@@ -0,0 +1,96 @@
+"""
+Test the vest encoders and the VestJSONRenderer class.
+"""
+import datetime
+from decimal import Decimal
+
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+from vesting.encoders import VestRepresentation, encode_vests
+from vesting.engine.schedule_engine import ScheduleEngine
+from vesting.models import CompanyValuation, OptionGrant, Vest
+from vesting.renderers import VestJSONRenderer
+from vesting.serializers import VestSerializer
+
+
+class VestEncoderTest(TestCase):
+    """Test the encoders give the same JSON as VestSerializer."""
+
+    def __assert_same_json(self, vests):
+        """Assert both paths render the same bytes."""
+
+        expected = JSONRenderer().render(VestSerializer(vests, many=True).data)
+
+        self.assertEqual(encode_vests(vests).encode(), expected)
+        self.assertEqual(
+            VestJSONRenderer().render(VestRepresentation(vests)), expected)
+        self.assertEqual(list(VestRepresentation(vests)),
+                         VestSerializer(vests, many=True).data)
+
+    def test_given_schedules_when_encode_then_same_json(self):
+        """Test generated schedules encode byte for byte the same."""
+
+        schedule_engine = ScheduleEngine()
+        grants = [
+            (4800, datetime.date(2018, 1, 1), 12, 48),
+            (999, datetime.date(2019, 1, 31), 7, 49),
+            (100003, datetime.date(2020, 2, 29), 0, 600),
+        ]
+
+        for quantity, start_date, cliff, duration in grants:
+            for price in [10.0, Decimal('0.33'), Decimal('123.45')]:
+                with self.subTest(quantity=quantity, price=price):
+                    self.__assert_same_json(schedule_engine.calculate(
+                        OptionGrant(quantity, start_date, cliff, duration),
+                        CompanyValuation(price, datetime.date(2017, 1, 1)),
+                    ))
+
+    def test_given_edge_values_when_encode_then_same_json(self):
+        """Test rounding, old years and missing dates encode the same."""
+
+        self.__assert_same_json([
+            Vest(0, Decimal('0.005'), datetime.date(2018, 1, 1)),
+            Vest(1.999, Decimal('0.015'), datetime.date(999, 12, 31)),
+            Vest(3, 7.125, datetime.date(1, 1, 1)),
+            Vest(4, Decimal('-2.675'), None),
+        ])
+
+    def test_given_batch_data_when_render_then_same_json(self):
+        """Test schedules nested in a dictionary render the same."""
+
+        # Arrange
+        vests = ScheduleEngine().calculate(
+            OptionGrant(4800, datetime.date(2018, 1, 1), 12, 48),
+            CompanyValuation(10.0, datetime.date(2017, 1, 1)),
+        )
+        errors = {'é': {'detail': 'Start date invalid.'}}
+
+        # Act
+        rendered = VestJSONRenderer().render({
+            'schedules': {'a': VestRepresentation(vests)},
+            'errors': errors,
+        })
+
+        # Assert
+        self.assertEqual(rendered, JSONRenderer().render({
+            'schedules': {'a': VestSerializer(vests, many=True).data},
+            'errors': errors,
+        }))
+
+    def test_given_indent_when_render_then_falls_back(self):
+        """Test indented output goes through JSONRenderer."""
+
+        # Arrange
+        vests = ScheduleEngine().calculate(
+            OptionGrant(4800, datetime.date(2018, 1, 1), 12, 48),
+            CompanyValuation(10.0, datetime.date(2017, 1, 1)),
+        )
+
+        # Act
+        rendered = VestJSONRenderer().render(
+            VestRepresentation(vests), 'application/json; indent=4')
+
+        # Assert
+        self.assertEqual(rendered, JSONRenderer().render(
+            VestSerializer(vests, many=True).data,
+            'application/json; indent=4'))
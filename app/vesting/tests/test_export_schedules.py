@@ -0,0 +1,294 @@
+"""
+Test the schedule exports and the export_schedules command.
+"""
+import csv
+import datetime
+import io
+import json
+import os
+import tempfile
+from decimal import Decimal
+from io import StringIO
+
+import pyarrow
+import pyarrow.parquet
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from vesting.encoders import vest_to_representation
+from vesting.engine.schedule_engine import EXACT, ScheduleEngine
+from vesting.exporters import EXPORT_FORMATS, csv_chunks, parquet_chunks
+from vesting.models import CompanyValuation, OptionGrant
+from vesting.use_cases.export_schedules.export_schedules_use_case import \
+    ExportSchedulesUseCase
+
+VESTING_SCHEDULE_BATCH_URL = reverse("vesting:schedule-batch")
+
+PAYLOAD = {
+    "option_grants": [
+        {
+            "id": "employee-1",
+            "quantity": 4800,
+            "start_date": "31-01-2018",
+            "cliff_months": 12,
+            "duration_months": 48,
+        },
+        {
+            "id": "employee, 2",
+            "quantity": 1001,
+            "start_date": "29-02-2020",
+            "cliff_months": 0,
+            "duration_months": 7,
+        },
+    ],
+    "company_valuations": [
+        {"price": "10.00", "valuation_date": "09-12-2017"},
+        {"price": "12.35", "valuation_date": "30-06-2019"},
+    ],
+}
+
+
+def export_url(export_format: str) -> str:
+    return reverse("vesting:schedule-export",
+                   kwargs={"export_format": export_format})
+
+
+def read_parquet(data: bytes):
+    return pyarrow.parquet.ParquetFile(io.BytesIO(data))
+
+
+class ExportSchedulesTest(TestCase):
+    """Test the exports give the schedules of the batch endpoint."""
+
+    def setUp(self):
+        """Set up the test case."""
+
+        self.__client = APIClient()
+
+    def __expected_rows(self) -> list[tuple]:
+        """Rows of the batch endpoint, with ISO dates."""
+
+        response = self.__client.post(
+            VESTING_SCHEDULE_BATCH_URL, PAYLOAD, format="json")
+        return [
+            (grant_id,
+             datetime.datetime.strptime(vest["date"], "%d-%m-%Y").date(),
+             vest["vested_quantity"], Decimal(vest["total_value"]))
+            for grant_id, schedule in response.json()["schedules"].items()
+            for vest in schedule
+        ]
+
+    def __export(self, export_format: str):
+        response = self.__client.post(
+            export_url(export_format), PAYLOAD, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"],
+                         EXPORT_FORMATS[export_format].content_type)
+        return b"".join(response.streaming_content)
+
+    def test_given_batch_when_export_csv_then_batch_rows(self):
+        """Test the CSV export has the rows of the batch endpoint."""
+
+        # Act
+        content = self.__export("csv").decode()
+
+        # Assert
+        rows = list(csv.reader(StringIO(content)))
+        self.assertEqual(rows[0],
+                         ["id", "date", "vested_quantity", "total_value"])
+        self.assertEqual(
+            [(grant_id, datetime.date.fromisoformat(date), int(quantity),
+              Decimal(value)) for grant_id, date, quantity, value in rows[1:]],
+            self.__expected_rows())
+        self.assertIn('"employee, 2",2020-03-29,', content)
+
+    def test_given_batch_when_export_arrow_then_logical_types(self):
+        """Test the Arrow export keeps dates and decimals typed."""
+
+        # Act
+        table = pyarrow.ipc.open_stream(self.__export("arrow")).read_all()
+
+        # Assert
+        self.assertEqual(table.schema.field("date").type, pyarrow.date32())
+        self.assertEqual(table.schema.field("total_value").type,
+                         pyarrow.decimal128(20, 2))
+        self.assertEqual(
+            [tuple(row.values()) for row in table.to_pylist()],
+            self.__expected_rows())
+
+    def test_given_batch_when_export_parquet_then_batch_rows(self):
+        """Test the Parquet export has the rows of the batch endpoint."""
+
+        # Act
+        table = read_parquet(self.__export("parquet")).read(use_threads=False)
+
+        # Assert
+        self.assertEqual(
+            [tuple(row.values()) for row in table.to_pylist()],
+            self.__expected_rows())
+
+    def test_given_invalid_grant_when_export_then_bad_request(self):
+        """Test no export starts when a grant is invalid."""
+
+        # Arrange
+        payload = dict(PAYLOAD, option_grants=[
+            dict(PAYLOAD["option_grants"][0], start_date="01-01-2017"),
+            {"id": "no-fields"},
+            PAYLOAD["option_grants"][1],
+        ])
+
+        # Act
+        response = self.__client.post(
+            export_url("csv"), payload, format="json")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(sorted(response.json()["errors"]),
+                         ["employee-1", "no-fields"])
+
+    def test_given_unknown_format_when_export_then_not_found(self):
+        """Test only the known formats are exported."""
+
+        response = self.__client.post(
+            export_url("xml"), PAYLOAD, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ExportColumnsTest(TestCase):
+    """Test the columns of the export use case and the writers."""
+
+    def setUp(self):
+        """Set up the test case."""
+
+        self.__company_valuations = [
+            CompanyValuation(Decimal("0.01"), datetime.date(2017, 12, 9)),
+            CompanyValuation(Decimal("12.35"), datetime.date(2019, 6, 30)),
+        ]
+        self.__option_grants = [
+            ("grant-{}".format(quantity), OptionGrant(
+                quantity, datetime.date(2018, 1, 31), cliff, duration))
+            for quantity in (1, 3, 1001, 4800)
+            for cliff, duration in ((0, 2), (0, 8), (12, 48))
+        ]
+
+    def test_given_arithmetics_when_value_columns_then_rendered_vests(self):
+        """Test the value columns are the rendered vests, ties included."""
+
+        for arithmetic in ("float", EXACT):
+            schedule_engine = ScheduleEngine(arithmetic)
+            for _, option_grant in self.__option_grants:
+                with self.subTest(arithmetic=arithmetic,
+                                  quantity=option_grant.quantity,
+                                  duration=option_grant.duration_months):
+                    # Act
+                    ordinals, quantities, cents = \
+                        schedule_engine.value_columns(
+                            option_grant, self.__company_valuations)
+
+                    # Assert
+                    self.assertEqual(
+                        [{"vested_quantity": quantity,
+                          "total_value": "{}.{:02d}".format(
+                              *divmod(cent, 100)),
+                          "date": datetime.date.fromordinal(
+                              ordinal).strftime("%d-%m-%Y")}
+                         for ordinal, quantity, cent in zip(
+                             ordinals.tolist(), quantities.tolist(),
+                             cents.tolist())],
+                        [vest_to_representation(vest)
+                         for vest in schedule_engine.calculate(
+                             option_grant, self.__company_valuations)])
+
+    def test_given_invalid_grant_when_execute_then_left_out(self):
+        """Test a grant failing validation is reported, not exported."""
+
+        # Arrange
+        failures: dict = {}
+        option_grants = self.__option_grants[:2] + [
+            ("too-early", OptionGrant(1, datetime.date(2017, 1, 1), 0, 2))]
+
+        # Act
+        batches = list(ExportSchedulesUseCase().execute(
+            option_grants, self.__company_valuations, grants_per_batch=2,
+            failures=failures))
+
+        # Assert
+        self.assertEqual(list(failures), ["too-early"])
+        self.assertEqual([batch.grant_ids for batch in batches],
+                         [["grant-1", "grant-1"]])
+        self.assertEqual(batches[0].grant_indices.tolist(),
+                         [0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1])
+
+    def test_given_batches_when_csv_then_chunk_per_batch(self):
+        """Test the CSV is written one chunk per batch."""
+
+        # Act
+        chunks = list(csv_chunks(ExportSchedulesUseCase().execute(
+            self.__option_grants, self.__company_valuations,
+            grants_per_batch=5)))
+
+        # Assert
+        self.assertEqual(len(chunks), 1 + 3)
+        self.assertEqual(
+            len(b"".join(chunks).splitlines()),
+            1 + sum(option_grant.duration_months + 1
+                    for _, option_grant in self.__option_grants))
+
+    def test_given_batches_when_parquet_then_row_group_per_batch(self):
+        """Test every batch is written as a Parquet row group."""
+
+        # Act
+        parquet_file = read_parquet(b"".join(parquet_chunks(
+            ExportSchedulesUseCase().execute(
+                self.__option_grants, self.__company_valuations,
+                grants_per_batch=5))))
+
+        # Assert
+        self.assertEqual(parquet_file.metadata.num_row_groups, 3)
+        self.assertEqual(
+            parquet_file.metadata.num_rows,
+            sum(option_grant.duration_months + 1
+                for _, option_grant in self.__option_grants))
+
+
+class ExportSchedulesCommandTest(TestCase):
+    """Test the export_schedules command."""
+
+    def setUp(self):
+        self.__directory = tempfile.TemporaryDirectory()
+        self.__valuations = os.path.join(
+            self.__directory.name, "valuations.json")
+        with open(self.__valuations, "w") as valuations:
+            json.dump(PAYLOAD["company_valuations"], valuations)
+        self.__grants = os.path.join(self.__directory.name, "grants.jsonl")
+        with open(self.__grants, "w") as grants:
+            for grant in PAYLOAD["option_grants"] + [
+                    {"id": "zero", "quantity": 0, "start_date": "01-01-2018",
+                     "cliff_months": 0, "duration_months": 12}]:
+                grants.write(json.dumps(grant) + "\n")
+
+    def tearDown(self):
+        self.__directory.cleanup()
+
+    def test_given_grants_file_when_export_then_csv_written(self):
+        """Test the command writes the CSV and reports invalid grants."""
+
+        # Arrange
+        output_path = os.path.join(self.__directory.name, "schedules.csv")
+        stderr = StringIO()
+
+        # Act
+        call_command("export_schedules", self.__grants,
+                     valuations=self.__valuations, output=output_path,
+                     batch_size=1, stdout=StringIO(), stderr=stderr)
+
+        # Assert
+        with open(output_path) as output:
+            rows = list(csv.reader(output))
+        self.assertEqual(len(rows), 1 + 49 + 8)
+        self.assertEqual({row[0] for row in rows[1:]},
+                         {"employee-1", "employee, 2"})
+        self.assertIn("zero", stderr.getvalue())
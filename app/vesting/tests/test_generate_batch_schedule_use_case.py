@@ -0,0 +1,105 @@
+"""
+Test the GenerateBatchScheduleUseCase class.
+"""
+import datetime
+from decimal import Decimal
+
+from django.test import TestCase
+from vesting.models import CompanyValuation, OptionGrant
+from vesting.use_cases.generate_batch_schedule.generate_batch_schedule_use_case import (  # noqa: E501
+    GenerateBatchScheduleUseCase)
+
+
+class GenerateBatchScheduleUseCaseTest(TestCase):
+    """Test the GenerateBatchScheduleUseCase class."""
+
+    def setUp(self):
+        self.__generate_batch_schedule_use_case = \
+            GenerateBatchScheduleUseCase()
+        self.__company_valuations = [
+            CompanyValuation(
+                price=20.0, valuation_date=datetime.date(2019, 6, 1)),
+            CompanyValuation(
+                price=10.0, valuation_date=datetime.date(2017, 12, 9)),
+        ]
+
+    def test_given_many_grants_when_execute_then_schedule_per_id(self):
+        """Test every grant gets its own schedule."""
+
+        # Arrange
+        option_grants = {
+            'a': OptionGrant(
+                quantity=4800,
+                start_date=datetime.date(2018, 1, 1),
+                cliff_months=12,
+                duration_months=48,
+            ),
+            'b': OptionGrant(
+                quantity=1200,
+                start_date=datetime.date(2020, 1, 1),
+                cliff_months=0,
+                duration_months=12,
+            ),
+        }
+
+        # Act
+        schedules, errors = self.__generate_batch_schedule_use_case.execute(
+            option_grants, self.__company_valuations)
+
+        # Assert
+        self.assertEqual(errors, {})
+        self.assertEqual(len(schedules['a']), 49)
+        self.assertEqual(len(schedules['b']), 13)
+        self.assertEqual(schedules['a'][12].total_value, Decimal(12000.00))
+        self.assertEqual(schedules['a'][48].total_value, Decimal(96000.00))
+        self.assertEqual(schedules['b'][6].total_value, Decimal(12000.00))
+
+    def test_given_equal_grants_when_execute_then_computed_once(self):
+        """Test grants sharing parameters share one schedule."""
+
+        # Arrange
+        option_grants = {
+            str(index): OptionGrant(
+                quantity=4800,
+                start_date=datetime.date(2018, 1, 1),
+                cliff_months=12,
+                duration_months=48,
+            )
+            for index in range(3)
+        }
+
+        # Act
+        schedules, errors = self.__generate_batch_schedule_use_case.execute(
+            option_grants, self.__company_valuations)
+
+        # Assert
+        self.assertEqual(errors, {})
+        self.assertIs(schedules['0'], schedules['1'])
+        self.assertIs(schedules['0'], schedules['2'])
+
+    def test_given_invalid_grant_when_execute_then_only_it_fails(self):
+        """Test a grant before every valuation fails alone."""
+
+        # Arrange
+        option_grants = {
+            'early': OptionGrant(
+                quantity=4800,
+                start_date=datetime.date(2017, 1, 1),
+                cliff_months=12,
+                duration_months=48,
+            ),
+            'valid': OptionGrant(
+                quantity=4800,
+                start_date=datetime.date(2018, 1, 1),
+                cliff_months=12,
+                duration_months=48,
+            ),
+        }
+
+        # Act
+        schedules, errors = self.__generate_batch_schedule_use_case.execute(
+            option_grants, self.__company_valuations)
+
+        # Assert
+        self.assertEqual(list(schedules), ['valid'])
+        self.assertEqual(list(errors), ['early'])
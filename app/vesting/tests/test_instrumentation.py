@@ -0,0 +1,139 @@
+"""
+Test the request instrumentation.
+"""
+import json
+
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from app.shared.instrumentation import instrumented, reset_registry, timed
+
+VESTING_SCHEDULE_URL = reverse("vesting:schedule")
+VESTING_ASYNC_SCHEDULE_BATCH_URL = reverse("vesting:async-schedule-batch")
+METRICS_URL = reverse("metrics")
+
+PAYLOAD = {
+    "option_grants": [
+        {
+            "quantity": 4800,
+            "start_date": "01-01-2018",
+            "cliff_months": 12,
+            "duration_months": 48,
+        }
+    ],
+    "company_valuations": [
+        {
+            "price": 10.0,
+            "valuation_date": "09-12-2017"
+        }
+    ],
+}
+
+
+class InstrumentationDisabledTestCase(TestCase):
+    """Test the instrumentation stays out of the way when disabled."""
+
+    def setUp(self):
+        """Set up the test case."""
+
+        self.__client = APIClient()
+
+    def test_given_disabled_when_generate_schedule_then_no_header(self):
+        """Test no Server-Timing header is sent."""
+
+        # Act
+        response = self.__client.post(
+            VESTING_SCHEDULE_URL, PAYLOAD, format="json")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.has_header("Server-Timing"))
+        self.assertEqual(self.__client.get(METRICS_URL).status_code,
+                         status.HTTP_404_NOT_FOUND)
+
+    def test_given_no_request_when_timed_then_shared_null_timer(self):
+        """Test timing outside a request allocates nothing."""
+
+        self.assertIs(timed("validate"), timed("execute"))
+
+        with instrumented() as request_timings:
+            with timed("validate"):
+                pass
+
+        self.assertEqual([stage for stage, _, _ in request_timings.stages],
+                         ["validate"])
+
+
+@override_settings(INSTRUMENTATION={"ENABLED": True})
+class InstrumentationEnabledTestCase(TestCase):
+    """Test the Server-Timing header and the metrics endpoint."""
+
+    def setUp(self):
+        """Set up the test case."""
+
+        reset_registry(setting="INSTRUMENTATION")
+        self.__client = APIClient()
+
+    def test_given_enabled_when_generate_schedule_then_server_timing(self):
+        """Test the stages of the request are sent in Server-Timing."""
+
+        # Act
+        response = self.__client.post(
+            VESTING_SCHEDULE_URL, PAYLOAD, format="json")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        stages = [
+            metric.split(";")[0]
+            for metric in response["Server-Timing"].split(", ")
+        ]
+        self.assertEqual(stages, ["validate", "execute", "render", "total"])
+        self.assertRegex(response["Server-Timing"],
+                         r'validate;dur=\d+\.\d{3};desc="-?\d+ blocks"')
+
+    async def __post_async(self, payload):
+        return await AsyncClient().post(
+            VESTING_ASYNC_SCHEDULE_BATCH_URL, json.dumps(payload),
+            content_type="application/json")
+
+    def test_given_async_view_when_requested_then_server_timing(self):
+        """Test the middleware times the requests of the ASGI handler."""
+
+        # Arrange
+        payload = dict(PAYLOAD, option_grants=[
+            dict(PAYLOAD["option_grants"][0], id="employee")])
+
+        # Act
+        response = async_to_sync(self.__post_async)(payload)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertRegex(response["Server-Timing"],
+                         r'total;dur=\d+\.\d{3};desc="-?\d+ blocks"$')
+
+    def test_given_requests_when_metrics_then_prometheus_histograms(self):
+        """Test the stages are exported as Prometheus histograms."""
+
+        # Arrange
+        for _ in range(3):
+            self.__client.post(VESTING_SCHEDULE_URL, PAYLOAD, format="json")
+
+        # Act
+        response = self.__client.get(METRICS_URL)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        body = response.content.decode()
+        self.assertIn(
+            "# TYPE request_stage_duration_seconds histogram", body)
+        self.assertIn(
+            'request_stage_duration_seconds_bucket{view="vesting:schedule",'
+            'stage="execute",le="+Inf"} 3', body)
+        self.assertIn(
+            'request_stage_allocated_blocks_count{view="vesting:schedule",'
+            'stage="validate"} 3', body)
+        self.assertIn("vesting_schedule_cache_hits_total", body)
@@ -0,0 +1,136 @@
+"""
+Test the vesting models.
+"""
+import datetime
+import pickle
+import sys
+from decimal import Decimal
+
+from django.test import TestCase
+from vesting.engine.valuation_timeline import ValuationTimeline
+from vesting.models import (ColumnarSchedule, CompanyValuation, OptionGrant,
+                            Schedule, Vest)
+from vesting.use_cases.generate_schedule.generate_schedule_use_case import \
+    GenerateScheduleUseCase
+
+from app.shared.exceptions import BusinessValidationError
+
+
+class ModelsTest(TestCase):
+    """Test the slotted models."""
+
+    def test_given_models_when_created_then_no_instance_dict(self):
+        """Test the models keep their attributes without a __dict__."""
+
+        instances = [
+            CompanyValuation(10.0, datetime.date(2017, 12, 9)),
+            Vest(1200.0, Decimal('12000'), datetime.date(2019, 1, 1)),
+            OptionGrant(4800, datetime.date(2018, 1, 1), 12, 48),
+            Schedule([], [], []),
+        ]
+
+        for instance in instances:
+            with self.subTest(model=type(instance).__name__):
+                self.assertFalse(hasattr(instance, '__dict__'))
+                with self.assertRaises(AttributeError):
+                    instance.unknown = 1
+
+    def test_given_vest_when_pickled_then_round_trips(self):
+        """Test slotted vests can be pickled for shared caches."""
+
+        # Arrange
+        vest = Vest(1200.0, Decimal('12000'), datetime.date(2019, 1, 1))
+
+        # Act
+        result = pickle.loads(pickle.dumps(vest))
+
+        # Assert
+        self.assertEqual(
+            (result.vested_quantity, result.total_value, result.date),
+            (vest.vested_quantity, vest.total_value, vest.date))
+
+
+class ColumnarScheduleTest(TestCase):
+    """Test the ColumnarSchedule class."""
+
+    def setUp(self):
+        self.__generate_schedule_use_case = GenerateScheduleUseCase()
+        self.__option_grant = OptionGrant(
+            quantity=4800,
+            start_date=datetime.date(2018, 1, 31),
+            cliff_months=12,
+            duration_months=48,
+        )
+        self.__company_valuations = [
+            CompanyValuation(
+                price=10.0, valuation_date=datetime.date(2017, 12, 9)),
+            CompanyValuation(
+                price=Decimal('12.50'),
+                valuation_date=datetime.date(2019, 6, 30)),
+        ]
+
+    def test_given_grant_when_execute_columns_then_same_vests(self):
+        """Test the columnar vests match the list of vests."""
+
+        # Act
+        expected = self.__generate_schedule_use_case.execute(
+            self.__option_grant, self.__company_valuations)
+        result = self.__generate_schedule_use_case.execute_columns(
+            self.__option_grant, self.__company_valuations)
+
+        # Assert
+        self.assertIsInstance(result, ColumnarSchedule)
+        self.assertEqual(len(result.vests), len(expected))
+        for index, vest in enumerate(result.vests):
+            for other in (expected[index], result[index]):
+                self.assertEqual(vest.vested_quantity, other.vested_quantity)
+                self.assertEqual(vest.total_value.as_tuple(),
+                                 other.total_value.as_tuple())
+                self.assertEqual(vest.date, other.date)
+        self.assertEqual([vest.date for vest in result[47:]],
+                         [vest.date for vest in expected[47:]])
+
+    def test_given_invalid_grant_when_execute_columns_then_fails(self):
+        """Test the columnar path runs the business validation."""
+
+        with self.assertRaises(BusinessValidationError):
+            self.__generate_schedule_use_case.execute_columns(
+                OptionGrant(4800, datetime.date(2017, 1, 1), 12, 48),
+                self.__company_valuations)
+
+    def test_given_bulk_run_when_columnar_then_order_of_magnitude_less(self):
+        """
+        Test columnar schedules use a tenth of the memory of lists.
+
+        The sizes are those of the objects each schedule holds for its
+        vests, so they do not depend on what was allocated before.
+        """
+
+        valuation_timeline = ValuationTimeline(self.__company_valuations)
+        # Grants started on different days, which share no vest dates.
+        option_grants = [
+            OptionGrant(4800, datetime.date(2018, 1, 31)
+                        + datetime.timedelta(days=day), 12, 48)
+            for day in range(200)
+        ]
+
+        list_bytes = sum(
+            sys.getsizeof(vests) + sum(
+                sys.getsizeof(vest) + sys.getsizeof(vest.vested_quantity)
+                + sys.getsizeof(vest.total_value) + sys.getsizeof(vest.date)
+                for vest in vests)
+            for vests in (
+                self.__generate_schedule_use_case.execute(
+                    option_grant, valuation_timeline)
+                for option_grant in option_grants))
+        columnar_bytes = sum(
+            sys.getsizeof(schedule) + schedule.quantities.nbytes
+            + schedule.date_offsets.nbytes + schedule.price_indices.nbytes
+            + sys.getsizeof(schedule.prices)
+            + sum(sys.getsizeof(price) for price in schedule.prices)
+            for schedule in (
+                self.__generate_schedule_use_case.execute_columns(
+                    option_grant, valuation_timeline)
+                for option_grant in option_grants))
+
+        self.assertLess(columnar_bytes * 10, list_bytes)
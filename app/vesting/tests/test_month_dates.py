@@ -0,0 +1,95 @@
+"""
+Test the month dates against relativedelta.
+"""
+import datetime
+
+from dateutil.relativedelta import relativedelta
+from hypothesis import example, given, settings
+from hypothesis import strategies as st
+from hypothesis.extra.django import TestCase
+from vesting.engine.month_dates import add_months, month_dates, month_days
+
+# Month ends, leap Februaries and leap rules of the centuries.
+EDGE_DATES = st.sampled_from([
+    datetime.date(2018, 1, 31),
+    datetime.date(2018, 3, 30),
+    datetime.date(2019, 8, 31),
+    datetime.date(2020, 2, 29),
+    datetime.date(2020, 1, 29),
+    datetime.date(1900, 1, 31),
+    datetime.date(2000, 1, 31),
+    datetime.date(9999, 12, 31),
+    datetime.date(1, 1, 31),
+])
+DATES = st.one_of(st.dates(), EDGE_DATES)
+
+
+def relativedelta_or_error(date: datetime.date, months: int):
+    """The date relativedelta gives, or ``ValueError`` when it fails."""
+
+    try:
+        return date + relativedelta(months=months)
+    except ValueError:
+        return ValueError
+
+
+class MonthDatesTest(TestCase):
+    """Test the month dates give the dates of relativedelta."""
+
+    @settings(max_examples=500)
+    @given(date=DATES, months=st.integers(min_value=-1200, max_value=1200))
+    @example(date=datetime.date(2019, 1, 31), months=1)
+    @example(date=datetime.date(2020, 1, 31), months=1)
+    @example(date=datetime.date(2020, 2, 29), months=12)
+    @example(date=datetime.date(2100, 1, 29), months=1)
+    @example(date=datetime.date(9999, 12, 1), months=1)
+    @example(date=datetime.date(1, 1, 1), months=-1)
+    def test_given_date_when_add_months_then_relativedelta(self, date,
+                                                           months):
+        """Test one date is moved as relativedelta moves it."""
+
+        # Act
+        try:
+            result = add_months(date, months)
+        except ValueError:
+            result = ValueError
+
+        # Assert
+        self.assertEqual(result, relativedelta_or_error(date, months))
+
+    @given(start_date=DATES, duration=st.integers(min_value=0, max_value=600))
+    @example(start_date=datetime.date(2018, 1, 31), duration=48)
+    @example(start_date=datetime.date(2020, 2, 29), duration=120)
+    @example(start_date=datetime.date(9998, 1, 1), duration=48)
+    def test_given_schedule_when_month_dates_then_relativedelta(
+            self, start_date, duration):
+        """Test every date of a schedule is the one of relativedelta."""
+
+        # Arrange
+        expected = [relativedelta_or_error(start_date, month)
+                    for month in range(duration + 1)]
+
+        # Act
+        try:
+            result = list(month_dates(start_date, duration))
+        except ValueError:
+            # Fails as a whole when a date is out of range.
+            self.assertIn(ValueError, expected)
+            return
+
+        # Assert
+        self.assertEqual(result, expected)
+        self.assertEqual(
+            month_days(start_date, duration).astype(object).tolist(),
+            expected)
+
+    def test_given_same_schedule_when_month_dates_then_cached(self):
+        """Test the dates of a start date and duration are computed once."""
+
+        # Act
+        first = month_dates(datetime.date(2018, 1, 31), 48)
+        second = month_dates(datetime.date(2018, 1, 31), 48)
+
+        # Assert
+        self.assertIs(first, second)
+        self.assertEqual(len(first), 49)
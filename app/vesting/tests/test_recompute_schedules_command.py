@@ -0,0 +1,189 @@
+"""
+Test the recompute_schedules command.
+"""
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+VESTING_SCHEDULE_BATCH_URL = reverse("vesting:schedule-batch")
+
+GRANTS_CSV = """id,quantity,start_date,cliff_months,duration_months
+employee-1,4800,31-01-2018,12,48
+employee-2,1200,01-01-2018,0,12
+zero-quantity,0,01-01-2018,12,48
+before-valuation,4800,01-01-2017,12,48
+employee-3,4801,28-02-2019,6,24
+"""
+
+COMPANY_VALUATIONS = [
+    {"price": "10.00", "valuation_date": "09-12-2017"},
+    {"price": "12.50", "valuation_date": "30-06-2019"},
+]
+
+
+class RecomputeSchedulesCommandTest(TestCase):
+    """Test the recompute_schedules command."""
+
+    def setUp(self):
+        self.__directory = tempfile.TemporaryDirectory()
+        self.__valuations = self.__path("valuations.json")
+        with open(self.__valuations, "w") as valuations:
+            json.dump(COMPANY_VALUATIONS, valuations)
+
+    def tearDown(self):
+        self.__directory.cleanup()
+
+    def __path(self, name: str) -> str:
+        return os.path.join(self.__directory.name, name)
+
+    def __write(self, name: str, content: str) -> str:
+        path = self.__path(name)
+        with open(path, "w") as output:
+            output.write(content)
+        return path
+
+    def __recompute(self, input_path: str, output_path: str, **options):
+        call_command(
+            "recompute_schedules", input_path,
+            valuations=self.__valuations, output=output_path, workers=2,
+            chunk_size=2, stdout=StringIO(), stderr=StringIO(), **options)
+
+        with open(output_path) as output:
+            return [json.loads(line) for line in output]
+
+    def __expected_lines(self, grants: list[dict]) -> list[dict]:
+        response = APIClient().post(
+            VESTING_SCHEDULE_BATCH_URL + "?stream=1",
+            {"option_grants": grants,
+             "company_valuations": COMPANY_VALUATIONS},
+            format="json")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        return sorted((json.loads(line) for line in lines),
+                      key=lambda line: line["id"])
+
+    def test_given_csv_when_recompute_then_batch_lines(self):
+        """Test every grant gets the line of the streamed batch."""
+
+        # Arrange
+        input_path = self.__write("grants.csv", GRANTS_CSV)
+        grants = [dict(zip(GRANTS_CSV.splitlines()[0].split(","),
+                           line.split(",")))
+                  for line in GRANTS_CSV.splitlines()[1:]]
+
+        # Act
+        result = self.__recompute(input_path, self.__path("out.ndjson"))
+
+        # Assert
+        self.assertEqual([line["id"] for line in result],
+                         [grant["id"] for grant in grants])
+        self.assertEqual(sorted(result, key=lambda line: line["id"]),
+                         self.__expected_lines(grants))
+
+    def test_given_jsonl_without_ids_when_recompute_then_row_numbers(self):
+        """Test JSONL grants without an id are named by their row."""
+
+        # Arrange
+        input_path = self.__write("grants.jsonl", "\n".join(json.dumps({
+            "quantity": 4800,
+            "start_date": "01-01-2018",
+            "cliff_months": 12,
+            "duration_months": duration,
+        }) for duration in (12, 48, 120)) + "\n")
+
+        # Act
+        result = self.__recompute(input_path, self.__path("out.ndjson"))
+
+        # Assert
+        self.assertEqual([line["id"] for line in result], ["1", "2", "3"])
+        self.assertEqual([len(line["schedule"]) for line in result],
+                         [13, 49, 121])
+
+    def test_given_checkpoint_when_resume_then_continues(self):
+        """Test a resumed run appends the missing chunks only."""
+
+        # Arrange
+        lines = GRANTS_CSV.splitlines(keepends=True)
+        input_path = self.__write("grants.csv", "".join(lines[:3]))
+        output_path = self.__path("out.ndjson")
+        self.__recompute(input_path, output_path)
+        with open(output_path, "a") as output:
+            output.write('{"id":"partial chunk')
+        self.__write("grants.csv", GRANTS_CSV)
+
+        # Act
+        result = self.__recompute(input_path, output_path, resume=True)
+
+        # Assert
+        self.assertEqual(
+            result, self.__recompute(input_path, self.__path("full.ndjson")))
+        with open(output_path + ".checkpoint") as checkpoint:
+            self.assertEqual(json.load(checkpoint)["grants"], 5)
+
+    def test_given_output_removed_when_resume_then_fails(self):
+        """Test resuming without the output of the checkpoint fails."""
+
+        # Arrange
+        input_path = self.__write("grants.csv", GRANTS_CSV)
+        output_path = self.__path("out.ndjson")
+        self.__recompute(input_path, output_path)
+        with open(output_path, "r+") as output:
+            output.truncate(10)
+
+        # Act
+        with self.assertRaisesMessage(CommandError, "without --resume"):
+            self.__recompute(input_path, output_path, resume=True)
+        os.remove(output_path)
+        with self.assertRaisesMessage(CommandError, "without --resume"):
+            self.__recompute(input_path, output_path, resume=True)
+
+    def test_given_invalid_valuations_when_recompute_then_fails(self):
+        """Test the valuations are validated before any work."""
+
+        # Arrange
+        input_path = self.__write("grants.csv", GRANTS_CSV)
+        with open(self.__valuations, "w") as valuations:
+            json.dump([{"price": -1, "valuation_date": "09-12-2017"}],
+                      valuations)
+
+        # Act
+        with self.assertRaises(CommandError):
+            self.__recompute(input_path, self.__path("out.ndjson"))
+
+    def test_given_repeated_id_when_recompute_then_fails(self):
+        """Test a repeated grant id fails before any schedule is written."""
+
+        # Arrange
+        input_path = self.__write(
+            "grants.csv", GRANTS_CSV + "employee-1,1200,01-01-2018,0,12\n")
+        output_path = self.__path("out.ndjson")
+
+        # Act
+        with self.assertRaisesMessage(
+                CommandError, "Option grant ids must be unique"):
+            self.__recompute(input_path, output_path)
+
+        # Assert
+        self.assertFalse(os.path.exists(output_path))
+
+    def test_given_jsonl_line_not_object_when_recompute_then_fails(self):
+        """Test a JSONL line that is not an object is reported by number."""
+
+        # Arrange
+        input_path = self.__write("grants.jsonl", "\n".join([
+            json.dumps({"quantity": 4800, "start_date": "01-01-2018",
+                        "cliff_months": 12, "duration_months": 48}),
+            "",
+            json.dumps([4800, "01-01-2018", 12, 48]),
+        ]) + "\n")
+
+        # Act
+        with self.assertRaisesMessage(
+                CommandError, "Line 3 of {} is not a JSON object.".format(
+                    input_path)):
+            self.__recompute(input_path, self.__path("out.ndjson"))
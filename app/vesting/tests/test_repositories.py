@@ -0,0 +1,225 @@
+"""
+Test the repositories and the MaterializeSchedulesUseCase class.
+"""
+import datetime
+from decimal import Decimal
+
+from django.test import TestCase
+from vesting.engine.schedule_engine import EXACT, FLOAT, ScheduleEngine
+from vesting.models import CompanyValuation, OptionGrant, VestRecord
+from vesting.repositories.company_valuation_repository import \
+    CompanyValuationRepository
+from vesting.repositories.option_grant_repository import \
+    OptionGrantRepository
+from vesting.repositories.vest_repository import VestRepository
+from vesting.use_cases.generate_schedule.generate_schedule_use_case import \
+    GenerateScheduleUseCase
+from vesting.use_cases.materialize_schedules.materialize_schedules_use_case import (  # noqa: E501
+    MaterializeSchedulesUseCase)
+
+
+class RepositoriesTest(TestCase):
+    """Test the stored grants, valuations and vests."""
+
+    def setUp(self):
+        self.__option_grant_repository = OptionGrantRepository()
+        self.__company_valuation_repository = CompanyValuationRepository()
+        self.__vest_repository = VestRepository()
+        self.__company_valuations = [
+            CompanyValuation(
+                price=Decimal('10.00'),
+                valuation_date=datetime.date(2017, 12, 9)),
+            CompanyValuation(
+                price=Decimal('12.50'),
+                valuation_date=datetime.date(2019, 6, 30)),
+        ]
+        self.__option_grants = [
+            ('grant-1', 'alice', OptionGrant(
+                4800, datetime.date(2018, 1, 31), 12, 48)),
+            ('grant-2', 'alice', OptionGrant(
+                1200, datetime.date(2018, 6, 1), 0, 12)),
+            ('grant-3', 'bob', OptionGrant(
+                4801, datetime.date(2019, 2, 28), 6, 24)),
+            ('too-early', 'bob', OptionGrant(
+                100, datetime.date(2017, 1, 1), 0, 12)),
+        ]
+
+        self.__company_valuation_repository.bulk_create(
+            self.__company_valuations)
+        self.__records = self.__option_grant_repository.bulk_create(
+            self.__option_grants)
+
+    def __expected_as_of(self, as_of, employee_ids=('alice', 'bob')):
+        """Sum the latest computed vest of every grant on or before a date."""
+
+        vested_quantity = 0.0
+        total_value = Decimal('0.00')
+        for _, employee_id, option_grant in self.__option_grants[:3]:
+            if employee_id not in employee_ids:
+                continue
+            vests = [
+                vest for vest in GenerateScheduleUseCase().execute(
+                    option_grant, self.__company_valuations)
+                if vest.date <= as_of
+            ]
+            if vests:
+                vested_quantity += vests[-1].vested_quantity
+                total_value += vests[-1].total_value.quantize(
+                    Decimal('0.01'))
+        return vested_quantity, total_value
+
+    def test_given_bulk_create_when_stored_then_records_have_pks(self):
+        """Test bulk created grants come back with their primary keys."""
+
+        self.assertEqual([record.grant_id for record in self.__records],
+                         ['grant-1', 'grant-2', 'grant-3', 'too-early'])
+        self.assertTrue(all(record.pk for record in self.__records))
+        self.assertEqual(
+            [record.grant_id for record in
+             self.__option_grant_repository.all(employee_id='bob')],
+            ['grant-3', 'too-early'])
+
+    def test_given_valuations_when_in_effect_on_then_latest_before(self):
+        """Test the valuation in effect is found by date."""
+
+        self.assertIsNone(self.__company_valuation_repository.in_effect_on(
+            datetime.date(2017, 12, 8)))
+        self.assertEqual(
+            self.__company_valuation_repository.in_effect_on(
+                datetime.date(2019, 6, 30)).price,
+            Decimal('12.50'))
+
+    def test_given_grants_when_materialize_then_vests_stored(self):
+        """Test materialized vests match the computed schedules."""
+
+        # Act
+        count, errors = MaterializeSchedulesUseCase().execute()
+
+        # Assert
+        self.assertEqual(count, 49 + 13 + 25)
+        self.assertEqual(list(errors), ['too-early'])
+        self.assertEqual(
+            [(vest.vested_quantity, vest.date)
+             for vest in self.__vest_repository.schedule('grant-1')],
+            [(vest.vested_quantity, vest.date)
+             for vest in GenerateScheduleUseCase().execute(
+                 self.__option_grants[0][2], self.__company_valuations)])
+
+    def test_given_materialized_twice_when_stored_then_replaced(self):
+        """Test materializing again replaces the vests of a grant."""
+
+        # Act
+        MaterializeSchedulesUseCase().execute()
+        MaterializeSchedulesUseCase().execute(self.__records[:1])
+
+        # Assert
+        self.assertEqual(VestRecord.objects.count(), 49 + 13 + 25)
+
+    def test_given_vests_when_total_vested_as_of_then_one_query(self):
+        """Test the total vested as of a date is summed in SQL."""
+
+        # Arrange
+        MaterializeSchedulesUseCase().execute()
+
+        for as_of in [datetime.date(2017, 1, 1), datetime.date(2019, 7, 15),
+                      datetime.date(2030, 1, 1)]:
+            with self.subTest(as_of=as_of):
+                # Act
+                with self.assertNumQueries(1):
+                    result = self.__vest_repository.total_vested_as_of(
+                        as_of)
+
+                # Assert
+                vested_quantity, total_value = self.__expected_as_of(as_of)
+                self.assertAlmostEqual(result['vested_quantity'],
+                                       vested_quantity)
+                self.assertEqual(result['total_value'], total_value)
+
+    def test_given_vests_when_vested_by_employee_then_grouped(self):
+        """Test the vested totals are grouped by employee in SQL."""
+
+        # Arrange
+        MaterializeSchedulesUseCase().execute()
+        as_of = datetime.date(2020, 3, 1)
+
+        # Act
+        with self.assertNumQueries(1):
+            result = self.__vest_repository.vested_by_employee_as_of(as_of)
+
+        # Assert
+        self.assertEqual(list(result), ['alice', 'bob'])
+        for employee_id in result:
+            vested_quantity, total_value = self.__expected_as_of(
+                as_of, employee_ids=(employee_id,))
+            self.assertAlmostEqual(result[employee_id]['vested_quantity'],
+                                   vested_quantity)
+            self.assertEqual(result[employee_id]['total_value'], total_value)
+            self.assertEqual(
+                self.__vest_repository.total_vested_as_of(
+                    as_of, employee_id=employee_id),
+                result[employee_id])
+
+    def __assert_repriced(self, arithmetic: str) -> None:
+        """Add a valuation and compare the vests to fresh schedules."""
+
+        # Arrange
+        materialize_schedules_use_case = MaterializeSchedulesUseCase(
+            ScheduleEngine(arithmetic))
+        materialize_schedules_use_case.execute()
+        company_valuation = CompanyValuation(
+            price=Decimal('11.37'), valuation_date=datetime.date(2019, 3, 15))
+
+        # Act
+        with self.assertNumQueries(7):
+            count = materialize_schedules_use_case.add_company_valuation(
+                company_valuation)
+
+        # Assert
+        self.__company_valuations.append(company_valuation)
+        self.assertEqual(count, 3 + 3 + 4)
+        for grant_id, _, option_grant in self.__option_grants[:3]:
+            self.assertEqual(
+                [(vest.vested_quantity, vest.total_value, vest.date)
+                 for vest in self.__vest_repository.schedule(grant_id)],
+                [(vest.vested_quantity,
+                  vest.total_value.quantize(Decimal('0.01')), vest.date)
+                 for vest in GenerateScheduleUseCase(arithmetic).execute(
+                     option_grant, self.__company_valuations)])
+
+    def test_given_new_valuation_when_added_then_vests_repriced(self):
+        """Test a new valuation prices the stored vests as a new schedule."""
+
+        self.__assert_repriced(FLOAT)
+
+    def test_given_exact_arithmetic_when_added_then_shares_repriced(self):
+        """Test the exact arithmetic prices the fractional shares again."""
+
+        self.__assert_repriced(EXACT)
+
+    def test_given_changed_grant_when_changed_then_vests_replaced(self):
+        """Test a changed grant replaces its vests after the cliff."""
+
+        # Arrange
+        MaterializeSchedulesUseCase().execute()
+        option_grant = OptionGrant(4800, datetime.date(2018, 1, 31), 6, 36)
+        first_vest_id = VestRecord.objects.filter(
+            grant=self.__records[0]).order_by('date').first().pk
+
+        # Act
+        count = MaterializeSchedulesUseCase().change_option_grant(
+            self.__records[0], option_grant)
+
+        # Assert
+        self.assertEqual(count, 31)
+        self.assertEqual(
+            self.__option_grant_repository.get('grant-1').duration_months,
+            36)
+        self.assertEqual(
+            [(vest.vested_quantity, vest.date)
+             for vest in self.__vest_repository.schedule('grant-1')],
+            [(vest.vested_quantity, vest.date)
+             for vest in GenerateScheduleUseCase().execute(
+                 option_grant, self.__company_valuations)])
+        self.assertEqual(VestRecord.objects.filter(
+            grant=self.__records[0]).order_by('date').first().pk,
+            first_vest_id)
@@ -0,0 +1,190 @@
+"""
+Test the schedule cache and the CachedGenerateScheduleUseCase class.
+"""
+import datetime
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from vesting.engine.valuation_timeline import ValuationTimeline
+from vesting.models import CompanyValuation, OptionGrant
+from vesting.schedule_cache import (MISSING, DjangoCacheBackend,
+                                    LRUCacheBackend, ScheduleCache,
+                                    get_schedule_cache, schedule_key)
+from vesting.use_cases.generate_schedule.cached_generate_schedule_use_case import (  # noqa: E501
+    CachedGenerateScheduleUseCase)
+
+from app.shared.exceptions import BusinessValidationError
+
+
+class FakeTimer:
+    """A clock that only moves when told to."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ScheduleCacheTest(TestCase):
+    """Test the schedule cache."""
+
+    def setUp(self):
+        self.__option_grant = OptionGrant(
+            quantity=4800,
+            start_date=datetime.date(2018, 1, 1),
+            cliff_months=12,
+            duration_months=48,
+        )
+        self.__company_valuation = CompanyValuation(
+            price=10.0, valuation_date=datetime.date(2017, 12, 9))
+
+    def test_given_same_grant_when_execute_twice_then_hit(self):
+        """Test a repeated grant is served from the cache."""
+
+        # Arrange
+        schedule_cache = ScheduleCache(LRUCacheBackend(max_size=8))
+        use_case = CachedGenerateScheduleUseCase(
+            schedule_cache=schedule_cache)
+
+        # Act
+        first = use_case.execute(
+            self.__option_grant, self.__company_valuation)
+        second = use_case.execute(
+            self.__option_grant,
+            CompanyValuation(price=Decimal('10.00'),
+                             valuation_date=datetime.date(2017, 12, 9)),
+        )
+
+        # Assert
+        self.assertIs(first, second)
+        self.assertEqual(schedule_cache.stats(), {
+            'hits': 1, 'misses': 1, 'size': 1, 'max_size': 8,
+            'evictions': 0,
+        })
+
+    def test_given_invalid_grant_when_execute_then_not_cached(self):
+        """Test business validation errors are not cached."""
+
+        # Arrange
+        schedule_cache = ScheduleCache(LRUCacheBackend(max_size=8))
+        use_case = CachedGenerateScheduleUseCase(
+            schedule_cache=schedule_cache)
+        company_valuation = CompanyValuation(
+            price=10.0, valuation_date=datetime.date(2019, 1, 1))
+
+        # Act
+        for _ in range(2):
+            with self.assertRaises(BusinessValidationError):
+                use_case.execute(self.__option_grant, company_valuation)
+
+        # Assert
+        self.assertEqual(len(schedule_cache.backend), 0)
+
+    def test_given_later_valuation_when_key_then_unchanged(self):
+        """Test valuations after the last vest do not change the key."""
+
+        # Arrange
+        later_valuation = CompanyValuation(
+            price=99.0, valuation_date=datetime.date(2022, 1, 2))
+        within_valuation = CompanyValuation(
+            price=99.0, valuation_date=datetime.date(2022, 1, 1))
+
+        # Act
+        key = schedule_key(self.__option_grant, ValuationTimeline.of(
+            self.__company_valuation))
+        key_with_later = schedule_key(self.__option_grant, ValuationTimeline(
+            [self.__company_valuation, later_valuation]))
+        key_with_within = schedule_key(self.__option_grant, ValuationTimeline(
+            [self.__company_valuation, within_valuation]))
+
+        # Assert
+        self.assertEqual(key, key_with_later)
+        self.assertNotEqual(key, key_with_within)
+
+    def test_given_full_lru_when_set_then_evicts_least_recent(self):
+        """Test the LRU backend keeps at most max_size entries."""
+
+        # Arrange
+        backend = LRUCacheBackend(max_size=2)
+        backend.set('a', 1)
+        backend.set('b', 2)
+        backend.get('a')
+
+        # Act
+        backend.set('c', 3)
+
+        # Assert
+        self.assertEqual(backend.get('a'), 1)
+        self.assertIs(backend.get('b'), MISSING)
+        self.assertEqual(backend.get('c'), 3)
+        self.assertEqual(backend.evictions, 1)
+
+    def test_given_ttl_elapsed_when_get_then_missing(self):
+        """Test the LRU backend expires entries after the TTL."""
+
+        # Arrange
+        timer = FakeTimer()
+        backend = LRUCacheBackend(max_size=2, ttl=10, timer=timer)
+        backend.set('a', 1)
+
+        # Act
+        timer.now = 9.9
+        before = backend.get('a')
+        timer.now = 10.0
+        after = backend.get('a')
+
+        # Assert
+        self.assertEqual(before, 1)
+        self.assertIs(after, MISSING)
+
+    def test_given_django_backend_when_execute_twice_then_hit(self):
+        """Test schedules can be shared through Django's cache."""
+
+        # Arrange
+        schedule_cache = ScheduleCache(DjangoCacheBackend(ttl=60))
+        schedule_cache.clear()
+        use_case = CachedGenerateScheduleUseCase(
+            schedule_cache=schedule_cache)
+
+        # Act
+        first = use_case.execute(
+            self.__option_grant, self.__company_valuation)
+        second = use_case.execute(
+            self.__option_grant, self.__company_valuation)
+
+        # Assert
+        self.assertEqual(schedule_cache.stats(), {'hits': 1, 'misses': 1})
+        self.assertEqual(
+            [(vest.vested_quantity, vest.total_value, vest.date)
+             for vest in first],
+            [(vest.vested_quantity, vest.total_value, vest.date)
+             for vest in second])
+
+    def test_given_django_backend_when_clear_then_other_entries_kept(self):
+        """Test clearing the schedules keeps the rest of the shared cache."""
+
+        # Arrange
+        backend = DjangoCacheBackend(ttl=60)
+        backend.set('a', 1)
+        backend.cache.set('unrelated', 'kept')
+
+        # Act
+        before = backend.get('a')
+        backend.clear()
+        after = backend.get('a')
+        backend.set('a', 2)
+
+        # Assert
+        self.assertEqual(before, 1)
+        self.assertIs(after, MISSING)
+        self.assertEqual(backend.get('a'), 2)
+        self.assertEqual(backend.cache.get('unrelated'), 'kept')
+
+    def test_given_backend_setting_none_when_get_then_disabled(self):
+        """Test the cache can be turned off from the settings."""
+
+        with override_settings(VESTING_SCHEDULE_CACHE={'BACKEND': None}):
+            self.assertIsNone(get_schedule_cache())
+
+        self.assertIsInstance(get_schedule_cache(), ScheduleCache)
@@ -0,0 +1,261 @@
+"""
+Test the ScheduleEngine class.
+"""
+import datetime
+import math
+from decimal import Decimal
+from fractions import Fraction
+
+from django.test import TestCase
+from vesting.encoders import vest_to_representation
+from vesting.engine.schedule_engine import CENT, EXACT, ScheduleEngine
+from vesting.models import CompanyValuation, OptionGrant
+from vesting.use_cases.generate_schedule.generate_schedule_use_case import \
+    GenerateScheduleUseCase
+
+QUANTITIES = [1, 7, 999, 4800, 1000003]
+CLIFFS_AND_DURATIONS = [
+    (0, 1), (1, 1), (0, 12), (3, 12), (12, 12), (12, 48), (48, 48),
+    (7, 49), (12, 120), (60, 600),
+]
+START_DATES = [
+    datetime.date(2018, 1, 1),
+    datetime.date(2019, 1, 31),
+    datetime.date(2020, 2, 29),
+    datetime.date(2021, 8, 30),
+    datetime.date(2099, 12, 31),
+]
+PRICES = [10.0, 0.3, Decimal('0.01'), Decimal('12345678.99')]
+
+
+class ScheduleEngineParityTest(TestCase):
+    """Test the engine gives the same vests as the per-month formula."""
+
+    def setUp(self):
+        self.__schedule_engine = ScheduleEngine()
+
+    def __assert_parity(self, option_grant, company_valuation):
+        """Assert every vest matches calculate_vest_of_a_month."""
+
+        result = self.__schedule_engine.calculate(
+            option_grant, company_valuation)
+
+        self.assertEqual(len(result), option_grant.duration_months + 1)
+
+        for month, vest in enumerate(result):
+            expected = GenerateScheduleUseCase.calculate_vest_of_a_month(
+                option_grant.start_date,
+                option_grant.cliff_months,
+                option_grant.duration_months,
+                option_grant.quantity,
+                company_valuation.price,
+                month,
+            )
+            self.assertIs(type(vest.vested_quantity), float)
+            self.assertEqual(vest.vested_quantity.hex(),
+                             expected.vested_quantity.hex())
+            self.assertEqual(vest.total_value.as_tuple(),
+                             expected.total_value.as_tuple())
+            self.assertEqual(vest.date, expected.date)
+
+    def test_given_grants_when_calculate_then_matches_formula(self):
+        """Test quantities and values match over many grant shapes."""
+
+        for quantity in QUANTITIES:
+            for cliff, duration in CLIFFS_AND_DURATIONS:
+                for price in PRICES:
+                    with self.subTest(quantity=quantity, cliff=cliff,
+                                      duration=duration, price=price):
+                        self.__assert_parity(
+                            OptionGrant(
+                                quantity=quantity,
+                                start_date=datetime.date(2018, 1, 1),
+                                cliff_months=cliff,
+                                duration_months=duration,
+                            ),
+                            CompanyValuation(
+                                price=price,
+                                valuation_date=datetime.date(2017, 12, 9),
+                            ),
+                        )
+
+    def test_given_month_end_starts_when_calculate_then_matches_dates(self):
+        """Test dates are clamped like relativedelta on short months."""
+
+        for start_date in START_DATES:
+            with self.subTest(start_date=start_date):
+                self.__assert_parity(
+                    OptionGrant(
+                        quantity=4800,
+                        start_date=start_date,
+                        cliff_months=12,
+                        duration_months=600,
+                    ),
+                    CompanyValuation(
+                        price=Decimal('10.00'),
+                        valuation_date=datetime.date(2017, 12, 9),
+                    ),
+                )
+
+    def test_given_schedule_past_year_9999_when_calculate_then_fails(self):
+        """Test dates out of range fail like relativedelta does."""
+
+        # Arrange
+        option_grant = OptionGrant(
+            quantity=4800,
+            start_date=datetime.date(9998, 1, 1),
+            cliff_months=12,
+            duration_months=48,
+        )
+        company_valuation = CompanyValuation(
+            price=10.0, valuation_date=datetime.date(2017, 12, 9)
+        )
+
+        # Act
+        with self.assertRaises(ValueError):
+            self.__schedule_engine.calculate(option_grant, company_valuation)
+
+
+class ScheduleEngineExactTest(TestCase):
+    """Test the exact arithmetic of the engine."""
+
+    def setUp(self):
+        self.__float_engine = ScheduleEngine()
+        self.__exact_engine = ScheduleEngine(arithmetic=EXACT)
+        self.__company_valuation = CompanyValuation(
+            price=Decimal('10.00'),
+            valuation_date=datetime.date(2017, 12, 9),
+        )
+
+    def test_given_grants_when_exact_then_matches_fractions(self):
+        """Test exact vests are the exact fractions, rounded."""
+
+        for quantity in QUANTITIES + [10 ** 15]:
+            for cliff, duration in CLIFFS_AND_DURATIONS:
+                for price in PRICES:
+                    with self.subTest(quantity=quantity, cliff=cliff,
+                                      duration=duration, price=price):
+                        result = self.__exact_engine.calculate(
+                            OptionGrant(
+                                quantity=quantity,
+                                start_date=datetime.date(2018, 1, 1),
+                                cliff_months=cliff,
+                                duration_months=duration,
+                            ),
+                            CompanyValuation(
+                                price=price,
+                                valuation_date=datetime.date(2017, 12, 9),
+                            ),
+                        )
+
+                        for month, vest in enumerate(result):
+                            shares = Fraction(
+                                quantity * month
+                                * (((duration - cliff) + month) // duration),
+                                duration)
+                            self.assertEqual(vest.vested_quantity,
+                                             math.floor(shares))
+                            self.assertEqual(
+                                vest.total_value,
+                                Decimal(round(shares * Fraction(
+                                    Decimal(price)) * 100)) * CENT)
+                            self.assertEqual(
+                                vest.total_value.as_tuple().exponent, -2)
+
+    def test_given_grants_when_exact_then_renders_like_float(self):
+        """
+        Test exact vests render like the float ones do.
+
+        The API truncates the vested quantity, so where a float quantity
+        falls just short of a whole share it renders one share less than
+        the exact one; the values and dates render the same.
+        """
+
+        for quantity in QUANTITIES:
+            for cliff, duration in CLIFFS_AND_DURATIONS:
+                for price in [10.0, Decimal('0.01'), Decimal('12.34')]:
+                    option_grant = OptionGrant(
+                        quantity=quantity,
+                        start_date=datetime.date(2018, 1, 1),
+                        cliff_months=cliff,
+                        duration_months=duration,
+                    )
+                    company_valuation = CompanyValuation(
+                        price=price,
+                        valuation_date=datetime.date(2017, 12, 9),
+                    )
+                    with self.subTest(quantity=quantity, cliff=cliff,
+                                      duration=duration, price=price):
+                        expected = self.__float_engine.calculate(
+                            option_grant, company_valuation)
+                        result = self.__exact_engine.calculate(
+                            option_grant, company_valuation)
+
+                        for float_vest, exact_vest in zip(expected, result):
+                            rendered = vest_to_representation(float_vest)
+                            exact = vest_to_representation(exact_vest)
+                            shortfall = (exact['vested_quantity']
+                                         - rendered['vested_quantity'])
+                            if shortfall:
+                                self.assertEqual(shortfall, 1)
+                                self.assertAlmostEqual(
+                                    float_vest.vested_quantity,
+                                    exact_vest.vested_quantity, places=6)
+                            rendered['vested_quantity'] += shortfall
+                            self.assertEqual(rendered, exact)
+
+    def test_given_float_drift_when_exact_then_whole_shares(self):
+        """Test exact shares do not fall short of a whole number."""
+
+        # Arrange
+        option_grant = OptionGrant(
+            quantity=4800,
+            start_date=datetime.date(2018, 1, 31),
+            cliff_months=12,
+            duration_months=600,
+        )
+
+        # Act
+        expected = self.__float_engine.calculate(
+            option_grant, self.__company_valuation)[55]
+        result = self.__exact_engine.calculate(
+            option_grant, self.__company_valuation)[55]
+
+        # Assert
+        self.assertEqual(vest_to_representation(expected)['vested_quantity'],
+                         439)
+        self.assertEqual(vest_to_representation(result)['vested_quantity'],
+                         440)
+        self.assertEqual(result.vested_quantity, 440)
+        self.assertEqual(result.total_value, Decimal('4400.00'))
+
+    def test_given_half_cent_when_exact_then_rounds_half_even(self):
+        """Test exact values on a half cent round to the even cent."""
+
+        # Arrange
+        option_grant = OptionGrant(
+            quantity=1,
+            start_date=datetime.date(2018, 1, 1),
+            cliff_months=0,
+            duration_months=8,
+        )
+        company_valuation = CompanyValuation(
+            price=Decimal('0.20'),
+            valuation_date=datetime.date(2017, 12, 9),
+        )
+
+        # Act
+        result = self.__exact_engine.calculate(
+            option_grant, company_valuation)
+
+        # Assert
+        self.assertEqual(
+            [vest.total_value for vest in result[:4]],
+            [Decimal('0.00'), Decimal('0.02'), Decimal('0.05'),
+             Decimal('0.08')])
+
+    def test_given_unknown_arithmetic_when_created_then_fails(self):
+        """Test only the known arithmetics are accepted."""
+
+        with self.assertRaises(ValueError):
+            ScheduleEngine(arithmetic='approximate')
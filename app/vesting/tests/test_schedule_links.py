@@ -0,0 +1,195 @@
+"""
+Test the linked schedules and their conditional requests.
+"""
+import base64
+import json
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from vesting.schedule_links import parse_schedule_token
+from vesting.use_cases.generate_schedule.cached_generate_schedule_use_case import (  # noqa: E501
+    CachedGenerateScheduleUseCase)
+
+VESTING_SCHEDULE_URL = reverse("vesting:schedule")
+
+PAYLOAD = {
+    "option_grants": [
+        {
+            "quantity": 4800,
+            "start_date": "01-01-2018",
+            "cliff_months": 12,
+            "duration_months": 48,
+        }
+    ],
+    "company_valuations": [
+        {"price": "10.00", "valuation_date": "09-12-2017"}
+    ],
+}
+
+
+def token_url(fields: list) -> str:
+    """Link with a token of the given fields."""
+
+    token = base64.urlsafe_b64encode(
+        json.dumps(fields).encode()).rstrip(b"=").decode()
+    return reverse("vesting:schedule-detail", kwargs={"token": token})
+
+
+class ScheduleLinksTest(TestCase):
+    """Test the schedules served at their links."""
+
+    def setUp(self):
+        """Set up the test case."""
+
+        self.__client = APIClient()
+
+    def __link(self, payload: dict = PAYLOAD, query: str = "") -> str:
+        response = self.__client.post(
+            VESTING_SCHEDULE_URL + query, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response["Content-Location"]
+
+    def test_given_post_when_get_link_then_same_schedule(self):
+        """Test the link of a posted schedule serves it, cacheable."""
+
+        # Arrange
+        posted = self.__client.post(
+            VESTING_SCHEDULE_URL, PAYLOAD, format="json")
+
+        # Act
+        response = self.__client.get(posted["Content-Location"])
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), posted.json())
+        self.assertRegex(response["ETag"], r'^"[0-9a-f]{32}"$')
+        self.assertEqual(response["Cache-Control"], "public, max-age=86400")
+        self.assertIn("Accept", response["Vary"])
+
+    def test_given_formatting_when_post_then_same_link(self):
+        """Test payloads differing only in formatting share their link."""
+
+        # Arrange
+        payload = {
+            "company_valuations": [
+                {"valuation_date": "09-12-2017", "price": 10}],
+            "option_grants": [dict(PAYLOAD["option_grants"][0],
+                                   quantity="4800", frequency="monthly")],
+        }
+
+        # Act
+        link = self.__link(payload)
+
+        # Assert
+        self.assertEqual(link, self.__link())
+        self.assertEqual(
+            parse_schedule_token(link.split("/")[-2])["company_valuations"],
+            [{"price": "10", "valuation_date": "09-12-2017"}])
+
+    def test_given_valuation_history_when_get_link_then_same_schedule(self):
+        """Test a history links to its schedule whatever its order."""
+
+        # Arrange
+        company_valuations = PAYLOAD["company_valuations"] + [
+            {"price": "12.50", "valuation_date": "01-06-2019"}]
+        payload = dict(PAYLOAD, company_valuations=company_valuations)
+        reordered = dict(PAYLOAD, company_valuations=company_valuations[::-1])
+        posted = self.__client.post(
+            VESTING_SCHEDULE_URL, payload, format="json")
+
+        # Act
+        link = posted["Content-Location"]
+        response = self.__client.get(link)
+
+        # Assert
+        self.assertEqual(link, self.__link(reordered))
+        self.assertNotEqual(link, self.__link())
+        self.assertEqual(response.json(), posted.json())
+        self.assertEqual(
+            parse_schedule_token(link.split("/")[-2])["company_valuations"],
+            [{"price": "10", "valuation_date": "09-12-2017"},
+             {"price": "12.5", "valuation_date": "01-06-2019"}])
+
+    def test_given_long_valuation_history_when_post_then_no_link(self):
+        """Test a history too long for a token is answered without a link."""
+
+        # Arrange
+        payload = dict(PAYLOAD, company_valuations=[
+            {"price": "10.{:02d}".format(day),
+             "valuation_date": "{:02d}-12-2017".format(day)}
+            for day in range(1, 29)])
+
+        # Act
+        response = self.__client.post(
+            VESTING_SCHEDULE_URL, payload, format="json")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("Content-Location", response)
+
+    def test_given_etag_when_get_then_not_modified_without_executing(self):
+        """Test a matching If-None-Match is answered before computing."""
+
+        # Arrange
+        link = self.__link()
+        etag = self.__client.get(link)["ETag"]
+
+        # Act
+        with mock.patch.object(
+                CachedGenerateScheduleUseCase, "execute") as execute:
+            response = self.__client.get(
+                link, HTTP_IF_NONE_MATCH='"other", {}'.format(etag))
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+        execute.assert_not_called()
+
+    def test_given_variants_when_get_then_distinct_etags(self):
+        """Test collapsed, streamed and browsable responses differ."""
+
+        # Arrange
+        link = self.__link()
+
+        # Act
+        etags = [
+            self.__client.get(link)["ETag"],
+            self.__client.get(link + "?collapse=1")["ETag"],
+            self.__client.get(link + "?stream=1")["ETag"],
+            self.__client.get(link, HTTP_ACCEPT="text/html")["ETag"],
+        ]
+        with override_settings(VESTING_ARITHMETIC="exact"):
+            etags.append(self.__client.get(link)["ETag"])
+
+        # Assert
+        self.assertEqual(len(set(etags)), len(etags))
+        self.assertTrue(self.__link(query="?collapse=1").endswith(
+            "/?collapse=1"))
+
+    def test_given_invalid_tokens_when_get_then_not_found_or_errors(self):
+        """Test a token not naming a payload is not found."""
+
+        # Arrange
+        invalid_payload = token_url(
+            [0, "01-01-2018", 12, 48, "monthly", "10", "09-12-2017"])
+
+        # Act
+        responses = [self.__client.get(url) for url in (
+            reverse("vesting:schedule-detail", kwargs={"token": "abc"}),
+            token_url([4800, "01-01-2018"]),
+            token_url([4800, "01-01-2018", 12, 48, "monthly", "10"]),
+            reverse("vesting:schedule-detail", kwargs={"token": "a" * 600}),
+        )]
+        invalid = self.__client.get(invalid_payload)
+
+        # Assert
+        self.assertEqual([response.status_code for response in responses],
+                         [status.HTTP_404_NOT_FOUND] * 4)
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("option_grants", invalid.json())
+        self.assertEqual(self.__client.get(VESTING_SCHEDULE_URL).status_code,
+                         status.HTTP_405_METHOD_NOT_ALLOWED)
@@ -0,0 +1,96 @@
+"""
+Test the regression gate of the schedule pipeline benchmark.
+"""
+import argparse
+
+from benchmarks.schedule_pipeline import compare, parse_stage_threshold
+from django.test import TestCase
+
+
+def result(stage: str, seconds: float, duration: int = 48,
+           batch_size: int = 1) -> dict:
+    """A timing of one case."""
+
+    return {
+        'stage': stage,
+        'duration': duration,
+        'batch_size': batch_size,
+        'seconds': seconds,
+        'us_per_schedule': seconds / batch_size * 1e6,
+    }
+
+
+class CompareTest(TestCase):
+    """Test the comparison against a baseline."""
+
+    def test_given_slowdown_within_threshold_when_compare_then_none(self):
+        """Test a case up to the threshold slower is not a regression."""
+
+        # Act
+        regressions = compare(
+            [result('vests', 1.25), result('api', 0.5)],
+            [result('vests', 1.0), result('api', 1.0)], threshold=0.25)
+
+        # Assert
+        self.assertEqual(regressions, [])
+
+    def test_given_slowdown_over_threshold_when_compare_then_regression(self):
+        """Test a case slower than allowed is reported with its ratio."""
+
+        # Act
+        regressions = compare(
+            [result('vests', 1.3), result('vests', 1.0, duration=600)],
+            [result('vests', 1.0), result('vests', 1.0, duration=600)],
+            threshold=0.25)
+
+        # Assert
+        self.assertEqual(len(regressions), 1)
+        self.assertEqual(regressions[0]['duration'], 48)
+        self.assertEqual(regressions[0]['baseline_seconds'], 1.0)
+        self.assertAlmostEqual(regressions[0]['ratio'], 1.3)
+        self.assertEqual(regressions[0]['threshold'], 0.25)
+
+    def test_given_stage_threshold_when_compare_then_overrides(self):
+        """Test a stage threshold replaces the default for its stage."""
+
+        # Act
+        regressions = compare(
+            [result('api', 1.4), result('vests', 1.4)],
+            [result('api', 1.0), result('vests', 1.0)],
+            threshold=0.25, stage_thresholds={'api': 0.5})
+
+        # Assert
+        self.assertEqual([regression['stage'] for regression in regressions],
+                         ['vests'])
+
+    def test_given_case_missing_when_compare_then_skipped(self):
+        """Test cases on one side only, or without time, are skipped."""
+
+        # Act
+        regressions = compare(
+            [result('vests', 9.0, batch_size=10), result('api', 9.0),
+             result('output', 9.0)],
+            [result('vests', 1.0), result('output', 0.0)])
+
+        # Assert
+        self.assertEqual(regressions, [])
+
+
+class ParseStageThresholdTest(TestCase):
+    """Test the parsing of --stage-threshold."""
+
+    def test_given_stage_and_threshold_when_parse_then_pair(self):
+        """Test a stage and a threshold are parsed."""
+
+        self.assertEqual(parse_stage_threshold('api=0.5'), ('api', 0.5))
+        self.assertEqual(parse_stage_threshold('validator=0'),
+                         ('validator', 0.0))
+
+    def test_given_malformed_value_when_parse_then_fails(self):
+        """Test malformed values are rejected with an argparse error."""
+
+        for value in ['api', 'api=', '=0.5', 'unknown=0.5', 'api=fast',
+                      'api=-0.1', 'api=nan', 'api=0.5=1']:
+            with self.subTest(value=value):
+                with self.assertRaises(argparse.ArgumentTypeError):
+                    parse_stage_threshold(value)
@@ -0,0 +1,96 @@
+"""
+Test the production server launcher.
+"""
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from django.test import TestCase, override_settings
+from rest_framework import status
+
+from app.server import (ASGI_WORKER_CLASS, cores, gunicorn_options,
+                        server_config)
+
+PAYLOAD = {
+    "option_grants": [{"quantity": 4800, "start_date": "01-01-2018",
+                       "cliff_months": 12, "duration_months": 48}],
+    "company_valuations": [{"price": "10.00", "valuation_date": "09-12-2017"}],
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class ServerOptionsTestCase(TestCase):
+    """Test the gunicorn options follow the SERVER setting."""
+
+    def test_given_defaults_when_options_then_worker_per_core(self):
+        """Test the defaults preload one sync worker per core."""
+
+        # Act
+        options = gunicorn_options(server_config())
+
+        # Assert
+        self.assertEqual(options["workers"], cores())
+        self.assertEqual(options["worker_class"], "sync")
+        self.assertTrue(options["preload_app"])
+        self.assertEqual(options["max_requests"], 10000)
+
+    @override_settings(SERVER={"WORKERS": 3, "THREADS": 4, "KEEPALIVE": 2})
+    def test_given_setting_and_overrides_when_options_then_merged(self):
+        """Test the command line overrides the setting."""
+
+        # Act
+        threaded = gunicorn_options(server_config({"WORKERS": None}))
+        asgi = gunicorn_options(server_config(
+            {"WORKER_CLASS": "asgi", "WORKERS": 2, "PRELOAD": False}))
+
+        # Assert
+        self.assertEqual((threaded["workers"], threaded["worker_class"],
+                          threaded["keepalive"]), (3, "gthread", 2))
+        self.assertEqual((asgi["workers"], asgi["worker_class"],
+                          asgi["preload_app"]),
+                         (2, ASGI_WORKER_CLASS, False))
+        with self.assertRaises(ValueError):
+            server_config({"WORKER_CLASS": "eventlet"})
+
+    def test_given_launcher_when_post_then_workers_answer(self):
+        """Test the launcher serves the API from preforked workers."""
+
+        # Arrange
+        port = free_port()
+        process = subprocess.Popen(
+            [sys.executable, "-m", "app.server", "--bind",
+             "127.0.0.1:{}".format(port), "--workers", "2"],
+            env=dict(os.environ, DJANGO_SETTINGS_MODULE="app.settings"),
+            stderr=subprocess.DEVNULL)
+        self.addCleanup(process.wait)
+        self.addCleanup(process.terminate)
+
+        # Act
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                connection = http.client.HTTPConnection(
+                    "127.0.0.1", port, timeout=10)
+                connection.request(
+                    "POST", "/api/vesting/schedule/", json.dumps(PAYLOAD),
+                    {"Content-Type": "application/json"})
+                response = connection.getresponse()
+                break
+            except OSError:
+                if time.monotonic() > deadline or process.poll() is not None:
+                    raise
+                time.sleep(0.1)
+
+        # Assert
+        self.assertEqual(response.status, status.HTTP_200_OK)
+        self.assertEqual(len(json.loads(response.read())), 49)
+        connection.close()
@@ -0,0 +1,135 @@
+"""
+Test the production settings and the lazily loaded API docs.
+"""
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+SCHEMA_URL = reverse("api-schema")
+DOCS_URL = reverse("api-docs")
+
+PRODUCTION_REQUESTS = '''
+import json
+import sys
+
+import django
+django.setup()
+from django.test import Client
+
+client = Client()
+schedule = client.post("/api/vesting/schedule/", {
+    "option_grants": [{"quantity": 4800, "start_date": "01-01-2018",
+                       "cliff_months": 12, "duration_months": 48}],
+    "company_valuations": [{"price": 10.0, "valuation_date": "09-12-2017"}],
+}, content_type="application/json")
+invalid = client.post("/api/vesting/schedule/", {},
+                      content_type="application/json")
+loaded = sorted(
+    module for module in ("drf_spectacular.views",
+                          "django.contrib.auth.models",
+                          "django.contrib.sessions.models")
+    if module in sys.modules)
+schema = client.get("/api/schema/")
+
+print(json.dumps({
+    "schedule": [schedule.status_code, len(schedule.json())],
+    "invalid": [invalid.status_code, invalid.json()],
+    "loaded": loaded,
+    "schema": schema.status_code,
+    "schema_loaded": "drf_spectacular.views" in sys.modules,
+}))
+'''
+
+
+PRODUCTION_ENVIRON = {
+    "DJANGO_SETTINGS_MODULE": "app.settings_production",
+    "DJANGO_SECRET_KEY": "production-test",
+    "DJANGO_ALLOWED_HOSTS": "testserver",
+}
+
+
+def run_production(code: str, **environ) -> subprocess.CompletedProcess:
+    """Run code with the production settings and an environment."""
+
+    env = dict(os.environ, **PRODUCTION_ENVIRON)
+    env.update(environ)
+    for name in [name for name, value in env.items() if value is None]:
+        del env[name]
+    return subprocess.run(
+        [sys.executable, "-c", code], env=env, cwd=str(settings.BASE_DIR),
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+
+class ProductionSettingsTestCase(TestCase):
+    """Test the API runs with the production settings."""
+
+    def test_given_production_settings_when_requests_then_lean(self):
+        """Test the API answers without the unused apps or the docs."""
+
+        # Act
+        completed = run_production(PRODUCTION_REQUESTS)
+        completed.check_returncode()
+        result = json.loads(completed.stdout)
+
+        # Assert
+        self.assertEqual(result["schedule"], [status.HTTP_200_OK, 49])
+        self.assertEqual(result["invalid"][0], status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(result["invalid"][1]["option_grants"],
+                         ["This field is required."])
+        self.assertEqual(result["loaded"], [])
+        self.assertEqual(result["schema"], status.HTTP_200_OK)
+        self.assertTrue(result["schema_loaded"])
+
+    def test_given_no_secret_key_when_setup_then_improperly_configured(self):
+        """Test the production settings have no default secret key."""
+
+        # Act
+        completed = run_production("import django; django.setup()",
+                                   DJANGO_SECRET_KEY=None)
+
+        # Assert
+        self.assertNotEqual(completed.returncode, 0)
+        self.assertIn(b"ImproperlyConfigured: Set the DJANGO_SECRET_KEY",
+                      completed.stderr)
+
+    def test_given_no_allowed_hosts_when_setup_then_improperly_configured(
+            self):
+        """Test the production settings allow no host by default."""
+
+        # Act
+        completed = run_production("import django; django.setup()",
+                                   DJANGO_ALLOWED_HOSTS=None)
+
+        # Assert
+        self.assertNotEqual(completed.returncode, 0)
+        self.assertIn(b"ImproperlyConfigured: Set the DJANGO_ALLOWED_HOSTS",
+                      completed.stderr)
+
+
+class LazyDocsTestCase(TestCase):
+    """Test the schema and docs are served by their lazy views."""
+
+    def setUp(self):
+        """Set up the test case."""
+
+        self.__client = APIClient()
+
+    def test_given_lazy_views_when_get_then_schema_and_docs(self):
+        """Test the schema and the Swagger page are served."""
+
+        # Act
+        schema = self.__client.get(SCHEMA_URL)
+        docs = self.__client.get(DOCS_URL)
+
+        # Assert
+        self.assertEqual(schema.status_code, status.HTTP_200_OK)
+        self.assertIn(b"/api/vesting/schedule/", schema.content)
+        self.assertEqual(docs.status_code, status.HTTP_200_OK)
+        self.assertIn(SCHEMA_URL.encode(), docs.content)
@@ -0,0 +1,145 @@
+"""
+Test the UpdateScheduleUseCase class.
+"""
+import datetime
+from decimal import Decimal
+
+from django.test import TestCase
+from vesting.models import CompanyValuation, OptionGrant, Schedule
+from vesting.use_cases.generate_schedule.generate_schedule_use_case import \
+    GenerateScheduleUseCase
+from vesting.use_cases.update_schedule.update_schedule_use_case import \
+    UpdateScheduleUseCase
+
+from app.shared.exceptions import BusinessValidationError
+
+
+def as_tuples(vests):
+    return [(vest.vested_quantity, vest.total_value, vest.date)
+            for vest in vests]
+
+
+class UpdateScheduleUseCaseTest(TestCase):
+    """Test the UpdateScheduleUseCase class."""
+
+    def setUp(self):
+        self.__option_grant = OptionGrant(
+            4801, datetime.date(2018, 1, 31), 12, 48)
+        self.__company_valuations = [
+            CompanyValuation(price=Decimal('10.00'),
+                             valuation_date=datetime.date(2017, 12, 9)),
+            CompanyValuation(price=Decimal('12.50'),
+                             valuation_date=datetime.date(2020, 6, 30)),
+        ]
+
+    def __schedule(self, arithmetic='float'):
+        return Schedule(
+            option_grants=self.__option_grant,
+            company_valuations=self.__company_valuations,
+            vests=GenerateScheduleUseCase(arithmetic).execute(
+                self.__option_grant, self.__company_valuations),
+        )
+
+    def test_given_new_valuation_when_add_then_same_as_full_rebuild(self):
+        """Test a new valuation gives the vests of a full rebuild."""
+
+        for arithmetic in ('float', 'exact'):
+            for valuation_date in [datetime.date(2017, 12, 9),
+                                   datetime.date(2019, 3, 15),
+                                   datetime.date(2021, 1, 1),
+                                   datetime.date(2030, 1, 1)]:
+                with self.subTest(arithmetic=arithmetic,
+                                  valuation_date=valuation_date):
+                    # Arrange
+                    schedule = self.__schedule(arithmetic)
+                    company_valuation = CompanyValuation(
+                        price=Decimal('11.37'),
+                        valuation_date=valuation_date)
+
+                    # Act
+                    updated = UpdateScheduleUseCase(
+                        arithmetic).add_company_valuation(
+                            schedule, company_valuation)
+
+                    # Assert
+                    self.assertEqual(
+                        as_tuples(updated.vests),
+                        as_tuples(GenerateScheduleUseCase(arithmetic).execute(
+                            self.__option_grant,
+                            self.__company_valuations + [company_valuation])))
+                    self.assertEqual(len(updated.company_valuations), 3)
+
+    def test_given_new_valuation_when_add_then_other_vests_untouched(self):
+        """Test only the vests the new valuation applies to are rebuilt."""
+
+        # Arrange
+        schedule = self.__schedule()
+        company_valuation = CompanyValuation(
+            price=Decimal('11.37'), valuation_date=datetime.date(2019, 3, 15))
+
+        # Act
+        updated = UpdateScheduleUseCase().add_company_valuation(
+            schedule, company_valuation)
+
+        # Assert
+        kept = [index for index, (old, new) in enumerate(
+            zip(schedule.vests, updated.vests)) if old is new]
+        self.assertEqual(kept, list(range(14)) + list(range(29, 49)))
+        self.assertEqual(updated.vests[14].date, datetime.date(2019, 3, 31))
+        self.assertEqual(updated.vests[29].date, datetime.date(2020, 6, 30))
+
+    def test_given_changed_grant_when_change_then_same_as_full_rebuild(self):
+        """Test a changed grant gives the vests of a full rebuild."""
+
+        for arithmetic in ('float', 'exact'):
+            for option_grant in [
+                OptionGrant(4801, datetime.date(2018, 1, 31), 6, 48),
+                OptionGrant(4801, datetime.date(2018, 1, 31), 24, 36),
+                OptionGrant(4801, datetime.date(2018, 1, 31), 0, 60),
+                OptionGrant(9600, datetime.date(2018, 1, 31), 12, 48),
+                OptionGrant(4801, datetime.date(2018, 2, 28), 12, 48),
+            ]:
+                with self.subTest(arithmetic=arithmetic,
+                                  cliff=option_grant.cliff_months,
+                                  duration=option_grant.duration_months):
+                    # Arrange
+                    schedule = self.__schedule(arithmetic)
+
+                    # Act
+                    updated = UpdateScheduleUseCase(
+                        arithmetic).change_option_grant(
+                            schedule, option_grant)
+
+                    # Assert
+                    self.assertIs(updated.option_grants, option_grant)
+                    self.assertEqual(
+                        as_tuples(updated.vests),
+                        as_tuples(GenerateScheduleUseCase(arithmetic).execute(
+                            option_grant, self.__company_valuations)))
+
+    def test_given_changed_cliff_when_change_then_prefix_untouched(self):
+        """Test the vests before the earlier cliff are kept."""
+
+        # Arrange
+        schedule = self.__schedule()
+
+        # Act
+        updated = UpdateScheduleUseCase().change_option_grant(
+            schedule, OptionGrant(4801, datetime.date(2018, 1, 31), 24, 36))
+
+        # Assert
+        self.assertTrue(all(
+            old is new for old, new in zip(schedule.vests[:12],
+                                           updated.vests[:12])))
+        self.assertIsNot(schedule.vests[12], updated.vests[12])
+        self.assertEqual(len(updated.vests), 37)
+
+    def test_given_invalid_grant_when_change_then_fails(self):
+        """Test a changed grant is validated like a new one."""
+
+        with self.assertRaisesMessage(
+                BusinessValidationError,
+                "Cliff must be less than or equal to duration."):
+            UpdateScheduleUseCase().change_option_grant(
+                self.__schedule(),
+                OptionGrant(4801, datetime.date(2018, 1, 31), 50, 48))
@@ -0,0 +1,214 @@
+"""
+Test the fast payload validators against the serializers.
+"""
+import copy
+import datetime
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase
+from vesting.serializers import (BatchOptionGrantSerializer,
+                                 BatchScheduleSerializer,
+                                 OptionCompanyValuationSerializer)
+from vesting.validators import (BatchOptionGrantValidator,
+                                BatchScheduleValidator,
+                                OptionCompanyValuationValidator, parse_date)
+
+OPTION_GRANT = {
+    "quantity": 4800,
+    "start_date": "31-01-2018",
+    "cliff_months": 12,
+    "duration_months": 48,
+}
+COMPANY_VALUATION = {"price": 10.0, "valuation_date": "09-12-2017"}
+
+OPTION_GRANT_VARIANTS = [
+    {},
+    {"quantity": 4800.0},
+    {"quantity": "4800"},
+    {"quantity": " 4800 "},
+    {"quantity": "4_800"},
+    {"quantity": True},
+    {"quantity": None},
+    {"quantity": 0},
+    {"quantity": -1},
+    {"quantity": 10 ** 30},
+    {"quantity": "abc"},
+    {"quantity": [4800]},
+    {"start_date": "1-1-2018"},
+    {"start_date": "31-02-2018"},
+    {"start_date": "2018-01-31"},
+    {"start_date": "31/01/2018"},
+    {"start_date": "31-01-18"},
+    {"start_date": "00-01-2018"},
+    {"start_date": "31-01-0000"},
+    {"start_date": "٣١-01-2018"},
+    {"start_date": 20180131},
+    {"start_date": ""},
+    {"cliff_months": -1},
+    {"cliff_months": 49},
+    {"cliff_months": "12"},
+    {"duration_months": 0},
+    {"duration_months": 12, "cliff_months": 12},
+]
+COMPANY_VALUATION_VARIANTS = [
+    {},
+    {"price": 10},
+    {"price": "10.5"},
+    {"price": " 10.50 "},
+    {"price": 10.005},
+    {"price": 0},
+    {"price": -1.5},
+    {"price": 123456789},
+    {"price": "nan"},
+    {"price": "Infinity"},
+    {"price": True},
+    {"price": None},
+    {"price": [10]},
+    {"valuation_date": "9-12-2017"},
+    {"valuation_date": "09-13-2017"},
+    {"valuation_date": None},
+]
+
+
+def variants(base: dict, changes: list[dict]) -> list:
+    """The base with each change applied, a removed key for ``{}``."""
+
+    payloads = []
+    for change in changes:
+        payload = dict(base, **change)
+        if not change:
+            payload.pop(next(iter(base)))
+        payloads.append(payload)
+    return payloads
+
+
+class ValidatorsTest(TestCase):
+    """Test the validators answer like the serializers."""
+
+    def __assert_same(self, validator_class, serializer_class, payload):
+        validator = validator_class(data=copy.deepcopy(payload))
+        serializer = serializer_class(data=copy.deepcopy(payload))
+
+        is_valid = validator.is_valid()
+
+        self.assertEqual(is_valid, serializer.is_valid())
+        if is_valid:
+            self.assertEqual(validator.validated_data,
+                             serializer.validated_data)
+        else:
+            self.assertEqual(validator.errors, serializer.errors)
+
+    def test_given_schedule_payloads_when_valid_then_same_as_serializer(self):
+        """Test the schedule payload gives the serializer's data and errors."""
+
+        payloads = [
+            {"option_grants": [OPTION_GRANT],
+             "company_valuations": [COMPANY_VALUATION]},
+            {"option_grants": [OPTION_GRANT]},
+            {"option_grants": [OPTION_GRANT],
+             "company_valuations": [COMPANY_VALUATION, COMPANY_VALUATION]},
+            {"option_grants": [OPTION_GRANT], "company_valuations": []},
+            {"option_grants": [], "company_valuations": [COMPANY_VALUATION]},
+            {"option_grants": [OPTION_GRANT, OPTION_GRANT],
+             "company_valuations": [COMPANY_VALUATION]},
+            {"option_grants": OPTION_GRANT,
+             "company_valuations": [COMPANY_VALUATION]},
+            {"option_grants": ["grant"],
+             "company_valuations": [COMPANY_VALUATION]},
+            [OPTION_GRANT],
+            None,
+        ] + [
+            {"option_grants": [option_grant],
+             "company_valuations": [COMPANY_VALUATION]}
+            for option_grant in variants(OPTION_GRANT, OPTION_GRANT_VARIANTS)
+        ] + [
+            {"option_grants": [OPTION_GRANT],
+             "company_valuations": [company_valuation]}
+            for company_valuation in variants(
+                COMPANY_VALUATION, COMPANY_VALUATION_VARIANTS)
+        ]
+
+        for payload in payloads:
+            with self.subTest(payload=payload):
+                self.__assert_same(OptionCompanyValuationValidator,
+                                   OptionCompanyValuationSerializer, payload)
+
+    def test_given_batch_payloads_when_valid_then_same_as_serializer(self):
+        """Test the batch payload gives the serializer's data and errors."""
+
+        payloads = [
+            {"option_grants": [dict(OPTION_GRANT, id="a"),
+                               dict(OPTION_GRANT, id="b")],
+             "company_valuations": [COMPANY_VALUATION,
+                                    dict(COMPANY_VALUATION, price="12.5")]},
+            {"option_grants": [dict(OPTION_GRANT, id="1"),
+                               dict(OPTION_GRANT, id=1)],
+             "company_valuations": [COMPANY_VALUATION]},
+            {"option_grants": [dict(OPTION_GRANT, id="a"), OPTION_GRANT],
+             "company_valuations": [COMPANY_VALUATION]},
+            {"option_grants": [dict(OPTION_GRANT, id="")],
+             "company_valuations": [COMPANY_VALUATION]},
+            {"option_grants": [], "company_valuations": [COMPANY_VALUATION]},
+            {"option_grants": [dict(OPTION_GRANT, id="a")],
+             "company_valuations": []},
+            {"option_grants": ["a"],
+             "company_valuations": [COMPANY_VALUATION]},
+            {"option_grants": [dict(OPTION_GRANT, id="a")]},
+        ] + [
+            {"option_grants": [dict(OPTION_GRANT, id="a")],
+             "company_valuations": [company_valuation]}
+            for company_valuation in variants(
+                COMPANY_VALUATION, COMPANY_VALUATION_VARIANTS)
+        ]
+
+        for payload in payloads:
+            with self.subTest(payload=payload):
+                self.__assert_same(BatchScheduleValidator,
+                                   BatchScheduleSerializer, payload)
+
+    def test_given_batch_grants_when_valid_then_same_as_serializer(self):
+        """Test a batch grant gives the serializer's data and errors."""
+
+        option_grant = dict(OPTION_GRANT, id="employee-1")
+        payloads = variants(option_grant, OPTION_GRANT_VARIANTS) + [
+            dict(option_grant, id=id_value) for id_value in [
+                12, 1.5, " padded ", "   ", "x" * 255, "x" * 256, "a\x00b",
+                "\ud800", True, None, ["a"],
+            ]
+        ] + [OPTION_GRANT]
+
+        for payload in payloads:
+            with self.subTest(payload=payload):
+                self.__assert_same(BatchOptionGrantValidator,
+                                   BatchOptionGrantSerializer, payload)
+
+    def test_given_valid_payload_when_validate_then_serializer_unused(self):
+        """Test a common payload never reaches the serializer."""
+
+        # Arrange
+        validator = OptionCompanyValuationValidator(data={
+            "option_grants": [OPTION_GRANT],
+            "company_valuations": [COMPANY_VALUATION],
+        })
+
+        # Act
+        with mock.patch.object(OptionCompanyValuationValidator,
+                               "serializer_class") as serializer_class:
+            is_valid = validator.is_valid()
+
+        # Assert
+        self.assertTrue(is_valid)
+        serializer_class.assert_not_called()
+        self.assertEqual(validator.validated_data["company_valuations"], [
+            {"price": Decimal("10.00"),
+             "valuation_date": datetime.date(2017, 12, 9)}])
+
+    def test_given_dates_when_parse_date_then_same_as_strptime(self):
+        """Test the date parser agrees with strptime on every day."""
+
+        day = datetime.date(1999, 1, 1)
+        while day < datetime.date(2031, 1, 1):
+            text = day.strftime("%d-%m-%Y")
+            self.assertEqual(parse_date(text), day)
+            day += datetime.timedelta(days=1)
@@ -0,0 +1,126 @@
+"""
+Test the ValuationTimeline class.
+"""
+import datetime
+import random
+from decimal import Decimal
+
+from django.test import TestCase
+from vesting.engine.valuation_timeline import ValuationTimeline
+from vesting.models import CompanyValuation, OptionGrant
+from vesting.use_cases.generate_schedule.generate_schedule_use_case import \
+    GenerateScheduleUseCase
+
+from app.shared.exceptions import BusinessValidationError
+
+
+class ValuationTimelineTest(TestCase):
+    """Test the ValuationTimeline class."""
+
+    def setUp(self):
+        self.__valuations = [
+            CompanyValuation(
+                price=30.0, valuation_date=datetime.date(2020, 1, 1)),
+            CompanyValuation(
+                price=10.0, valuation_date=datetime.date(2017, 12, 9)),
+            CompanyValuation(
+                price=20.0, valuation_date=datetime.date(2019, 1, 1)),
+        ]
+        self.__valuation_timeline = ValuationTimeline(self.__valuations)
+
+    def test_given_dates_when_valuation_at_then_latest_before(self):
+        """Test the valuation in effect is the latest on or before a date."""
+
+        cases = [
+            (datetime.date(2017, 12, 8), None),
+            (datetime.date(2017, 12, 9), 10.0),
+            (datetime.date(2018, 12, 31), 10.0),
+            (datetime.date(2019, 1, 1), 20.0),
+            (datetime.date(2030, 1, 1), 30.0),
+        ]
+
+        for date, price in cases:
+            with self.subTest(date=date):
+                valuation = self.__valuation_timeline.valuation_at(date)
+                self.assertEqual(
+                    valuation.price if valuation else None, price)
+
+    def test_given_same_date_when_valuation_at_then_last_given_wins(self):
+        """Test the last valuation given wins on a shared date."""
+
+        # Arrange
+        valuation_timeline = ValuationTimeline([
+            CompanyValuation(
+                price=10.0, valuation_date=datetime.date(2019, 1, 1)),
+            CompanyValuation(
+                price=15.0, valuation_date=datetime.date(2019, 1, 1)),
+        ])
+
+        # Act
+        valuation = valuation_timeline.valuation_at(datetime.date(2019, 1, 1))
+
+        # Assert
+        self.assertEqual(valuation.price, 15.0)
+
+    def test_given_sorted_dates_when_valuations_for_then_match_bisect(self):
+        """Test the merge pass agrees with a lookup per date."""
+
+        # Arrange
+        generator = random.Random(7)
+        first_day = datetime.date(2010, 1, 1).toordinal()
+        valuation_timeline = ValuationTimeline(
+            CompanyValuation(
+                price=generator.randint(1, 1000),
+                valuation_date=datetime.date.fromordinal(
+                    first_day + generator.randint(0, 5000)),
+            )
+            for _ in range(300)
+        )
+        dates = sorted(
+            datetime.date.fromordinal(first_day + generator.randint(0, 6000))
+            for _ in range(1000)
+        )
+
+        # Act
+        valuations = valuation_timeline.valuations_for(dates)
+
+        # Assert
+        self.assertEqual(
+            valuations,
+            [valuation_timeline.valuation_at(date) for date in dates])
+
+    def test_given_history_when_execute_then_vests_priced_on_date(self):
+        """Test each vest is priced with the valuation in effect."""
+
+        # Arrange
+        option_grant = OptionGrant(
+            quantity=4800,
+            start_date=datetime.date(2018, 1, 1),
+            cliff_months=12,
+            duration_months=48,
+        )
+
+        # Act
+        result = GenerateScheduleUseCase().execute(
+            option_grant, self.__valuations)
+
+        # Assert
+        self.assertEqual(result[12].total_value, Decimal(24000.00))
+        self.assertEqual(result[23].total_value, Decimal(46000.00))
+        self.assertEqual(result[24].total_value, Decimal(72000.00))
+        self.assertEqual(result[48].total_value, Decimal(144000.00))
+
+    def test_given_no_valuation_when_execute_then_fails(self):
+        """Test the use case fails without any valuation."""
+
+        # Arrange
+        option_grant = OptionGrant(
+            quantity=4800,
+            start_date=datetime.date(2018, 1, 1),
+            cliff_months=12,
+            duration_months=48,
+        )
+
+        # Act
+        with self.assertRaises(BusinessValidationError):
+            GenerateScheduleUseCase().execute(option_grant, [])
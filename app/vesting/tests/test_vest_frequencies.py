@@ -0,0 +1,365 @@
+"""
+Test the vesting frequencies and the collapsed schedules.
+"""
+import datetime
+import json
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from vesting.encoders import vest_to_representation
+from vesting.engine.portfolio_engine import PortfolioEngine
+from vesting.engine.schedule_engine import EXACT, FLOAT, ScheduleEngine
+from vesting.engine.valuation_timeline import ValuationTimeline
+from vesting.models import (ANNUAL, DAILY, FREQUENCIES, MONTHLY, QUARTERLY,
+                            CompanyValuation, OptionGrant, Schedule,
+                            VestRange)
+from vesting.use_cases.update_schedule.update_schedule_use_case import \
+    UpdateScheduleUseCase
+
+VESTING_SCHEDULE_URL = reverse("vesting:schedule")
+VESTING_SCHEDULE_BATCH_URL = reverse("vesting:schedule-batch")
+VESTING_SCHEDULE_PORTFOLIO_URL = reverse("vesting:schedule-portfolio")
+
+
+def expand(collapsed_vests: list, vests: list) -> list[dict]:
+    """The rendered vests of ``vests`` a collapsed schedule stands for."""
+
+    dates = [vest.date for vest in vests]
+    expanded = []
+    for vest in collapsed_vests:
+        representation = vest_to_representation(vest)
+        end_date = representation.pop("end_date", representation["date"])
+        first = dates.index(vest.date)
+        last = dates.index(datetime.datetime.strptime(
+            end_date, "%d-%m-%Y").date())
+        expanded.extend(
+            dict(representation, date=vest_to_representation(
+                vests[index])["date"])
+            for index in range(first, last + 1))
+    return expanded
+
+
+class VestFrequencyTest(TestCase):
+    """Test the schedules of every frequency."""
+
+    def setUp(self):
+        """Set up the test case."""
+
+        self.__schedule_engine = ScheduleEngine()
+        self.__valuation_timeline = ValuationTimeline([
+            CompanyValuation(Decimal("10.00"), datetime.date(2017, 12, 9)),
+            CompanyValuation(Decimal("12.35"), datetime.date(2019, 6, 30)),
+        ])
+
+    def __grant(self, frequency: str, cliff_months: int = 12,
+                duration_months: int = 46) -> OptionGrant:
+        return OptionGrant(4800, datetime.date(2018, 1, 31), cliff_months,
+                           duration_months, frequency)
+
+    def test_given_quarterly_or_annual_when_calculate_then_monthly_months(
+            self):
+        """Test the vests are the monthly ones of their months and last."""
+
+        # Arrange
+        monthly = self.__schedule_engine.calculate(
+            self.__grant(MONTHLY), self.__valuation_timeline)
+
+        for frequency, months in ((QUARTERLY, list(range(0, 46, 3)) + [46]),
+                                  (ANNUAL, [0, 12, 24, 36, 46])):
+            with self.subTest(frequency=frequency):
+                # Act
+                vests = self.__schedule_engine.calculate(
+                    self.__grant(frequency), self.__valuation_timeline)
+
+                # Assert
+                self.assertEqual(
+                    [vest_to_representation(vest) for vest in vests],
+                    [vest_to_representation(monthly[month])
+                     for month in months])
+
+    def test_given_daily_when_calculate_then_vest_every_day(self):
+        """Test a daily grant accrues every day from the cliff."""
+
+        # Act
+        vests = self.__schedule_engine.calculate(
+            self.__grant(DAILY, duration_months=48),
+            self.__valuation_timeline)
+
+        # Assert
+        self.assertEqual(len(vests), 1461 + 1)
+        self.assertEqual(vests[364].vested_quantity, 0)
+        self.assertEqual(vests[365].date, datetime.date(2019, 1, 31))
+        self.assertEqual(vests[365].vested_quantity, 4800 * 365 / 1461)
+        self.assertEqual(vests[-1].date, datetime.date(2022, 1, 31))
+        self.assertEqual(vests[-1].vested_quantity, 4800)
+        self.assertEqual(vests[-1].total_value, Decimal("59280.00"))
+
+    def test_given_daily_when_exact_then_whole_shares(self):
+        """Test the exact daily vests are the floor of the fraction."""
+
+        # Act
+        vests = ScheduleEngine(EXACT).calculate(
+            self.__grant(DAILY, duration_months=48),
+            self.__valuation_timeline)
+
+        # Assert
+        self.assertEqual(vests[365].vested_quantity, 4800 * 365 // 1461)
+        self.assertEqual(vests[365].total_value, Decimal("11991.79"))
+        self.assertEqual(vests[-1].vested_quantity, 4800)
+
+    def test_given_frequencies_when_vest_as_of_then_latest_vest(self):
+        """Test the vest as of a date is the latest one of the schedule."""
+
+        for arithmetic in (FLOAT, EXACT):
+            schedule_engine = ScheduleEngine(arithmetic)
+            for frequency in FREQUENCIES:
+                vests = schedule_engine.calculate(
+                    self.__grant(frequency), self.__valuation_timeline)
+                for as_of in (datetime.date(2018, 1, 30),
+                              datetime.date(2019, 2, 27),
+                              datetime.date(2019, 7, 1),
+                              datetime.date(2021, 11, 30),
+                              datetime.date(2030, 1, 1)):
+                    with self.subTest(arithmetic=arithmetic,
+                                      frequency=frequency, as_of=as_of):
+                        # Act
+                        vest = schedule_engine.vest_as_of(
+                            self.__grant(frequency),
+                            self.__valuation_timeline, as_of)
+
+                        # Assert
+                        latest = [vest for vest in vests
+                                  if vest.date <= as_of]
+                        if not latest:
+                            self.assertIsNone(vest)
+                            continue
+                        self.assertEqual(
+                            (vest.vested_quantity, vest.total_value,
+                             vest.date),
+                            (latest[-1].vested_quantity,
+                             latest[-1].total_value, latest[-1].date))
+
+    def test_given_frequencies_when_collapsed_then_runs_of_the_schedule(self):
+        """Test a collapsed schedule stands for the rendered schedule."""
+
+        for arithmetic in (FLOAT, EXACT):
+            schedule_engine = ScheduleEngine(arithmetic)
+            for frequency in FREQUENCIES:
+                for option_grant in (self.__grant(frequency),
+                                     OptionGrant(7, datetime.date(2018, 3, 1),
+                                                 0, 30, frequency)):
+                    with self.subTest(arithmetic=arithmetic,
+                                      frequency=frequency,
+                                      quantity=option_grant.quantity):
+                        # Act
+                        collapsed = list(schedule_engine.iterate_collapsed(
+                            option_grant, self.__valuation_timeline))
+
+                        # Assert
+                        vests = schedule_engine.calculate(
+                            option_grant, self.__valuation_timeline)
+                        self.assertEqual(
+                            expand(collapsed, vests),
+                            [vest_to_representation(vest) for vest in vests])
+                        values = [(vest.vested_quantity, vest.total_value)
+                                  for vest in collapsed]
+                        self.assertNotIn(True, [
+                            first == second
+                            for first, second in zip(values, values[1:])])
+
+    def test_given_cliff_when_collapsed_then_one_range_before_it(self):
+        """Test the vests before the cliff are one range."""
+
+        # Act
+        collapsed = list(self.__schedule_engine.iterate_collapsed(
+            OptionGrant(4800, datetime.date(2018, 1, 31), 1200, 1200, DAILY),
+            self.__valuation_timeline))
+
+        # Assert
+        self.assertEqual(len(collapsed), 2)
+        self.assertIsInstance(collapsed[0], VestRange)
+        self.assertEqual(
+            (collapsed[0].vested_quantity, collapsed[0].date,
+             collapsed[0].end_date),
+            (0, datetime.date(2018, 1, 31), datetime.date(2118, 1, 30)))
+        self.assertEqual(
+            (collapsed[1].vested_quantity, collapsed[1].total_value),
+            (4800, Decimal("59280.00")))
+
+    def test_given_frequencies_when_portfolio_then_latest_vests_summed(self):
+        """Test the portfolio sums the latest vest of every grant."""
+
+        # Arrange
+        option_grants = [
+            self.__grant(QUARTERLY),
+            OptionGrant(1000, datetime.date(2018, 3, 15), 0, 7, DAILY),
+            OptionGrant(500, datetime.date(2018, 2, 28), 6, 24, MONTHLY),
+        ]
+        schedules = [
+            self.__schedule_engine.calculate(
+                option_grant, self.__valuation_timeline)
+            for option_grant in option_grants
+        ]
+
+        # Act
+        curve = PortfolioEngine().calculate(
+            option_grants, self.__valuation_timeline)
+
+        # Assert
+        for point in curve:
+            latest = [[vest for vest in vests if vest.date <= point.date]
+                      for vests in schedules]
+            latest = [vests[-1] for vests in latest if vests]
+            self.assertAlmostEqual(
+                point.vested_quantity,
+                sum(vest.vested_quantity for vest in latest), places=6)
+            self.assertAlmostEqual(
+                point.total_value,
+                sum(vest.total_value for vest in latest),
+                delta=Decimal("0.01"))
+
+    def test_given_quarterly_grant_changed_when_update_then_recomputed(self):
+        """Test a changed quarterly grant gives its whole schedule."""
+
+        # Arrange
+        update_schedule_use_case = UpdateScheduleUseCase(FLOAT)
+        option_grant = self.__grant(QUARTERLY)
+        changed_option_grant = self.__grant(QUARTERLY, cliff_months=7,
+                                            duration_months=40)
+        schedule = Schedule(
+            option_grant, self.__valuation_timeline.company_valuations,
+            self.__schedule_engine.calculate(
+                option_grant, self.__valuation_timeline))
+
+        # Act
+        updated = update_schedule_use_case.change_option_grant(
+            schedule, changed_option_grant)
+
+        # Assert
+        self.assertEqual(
+            [vest_to_representation(vest) for vest in updated.vests],
+            [vest_to_representation(vest)
+             for vest in self.__schedule_engine.calculate(
+                 changed_option_grant, self.__valuation_timeline)])
+
+
+class VestFrequencyAPITest(TestCase):
+    """Test the frequency and collapse options of the schedule endpoints."""
+
+    def setUp(self):
+        """Set up the test case."""
+
+        self.__client = APIClient()
+        self.__payload = {
+            "option_grants": [
+                {
+                    "quantity": 4800,
+                    "start_date": "31-01-2018",
+                    "cliff_months": 12,
+                    "duration_months": 48,
+                    "frequency": "quarterly",
+                }
+            ],
+            "company_valuations": [
+                {"price": "10.00", "valuation_date": "09-12-2017"}
+            ],
+        }
+
+    def test_given_quarterly_when_generate_schedule_then_quarter_vests(self):
+        """Test a quarterly grant vests every three months."""
+
+        # Act
+        response = self.__client.post(
+            VESTING_SCHEDULE_URL, self.__payload, format="json")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 17)
+        self.assertEqual(response.data[4], {
+            "vested_quantity": 1200,
+            "total_value": "12000.00",
+            "date": "31-01-2019",
+        })
+
+    def test_given_collapse_when_generate_schedule_then_range(self):
+        """Test the vests before the cliff are one record."""
+
+        # Act
+        response = self.__client.post(
+            VESTING_SCHEDULE_URL + "?collapse=1", self.__payload,
+            format="json")
+        stream_response = self.__client.post(
+            VESTING_SCHEDULE_URL + "?collapse=1&stream=1", self.__payload,
+            format="json")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1 + 13)
+        self.assertEqual(response.data[0], {
+            "vested_quantity": 0,
+            "total_value": "0.00",
+            "date": "31-01-2018",
+            "end_date": "31-10-2018",
+        })
+        self.assertEqual(
+            [json.loads(line) for line in b"".join(
+                stream_response.streaming_content).decode().splitlines()],
+            json.loads(response.content))
+
+    def test_given_collapse_when_generate_batch_then_ranges(self):
+        """Test the batch schedules are collapsed as well."""
+
+        # Arrange
+        option_grant = dict(self.__payload["option_grants"][0], id="a")
+        payload = dict(self.__payload, option_grants=[
+            option_grant, dict(option_grant, id="b", frequency="monthly")])
+
+        # Act
+        response = self.__client.post(
+            VESTING_SCHEDULE_BATCH_URL + "?collapse=1", payload,
+            format="json")
+
+        # Assert
+        schedules = json.loads(response.content)["schedules"]
+        self.assertEqual(len(schedules["a"]), 1 + 13)
+        self.assertEqual(len(schedules["b"]), 1 + 37)
+        self.assertEqual(schedules["b"][0]["end_date"], "31-12-2018")
+
+    def test_given_no_monthly_grant_when_portfolio_then_curve(self):
+        """Test a portfolio of quarterly and daily grants is summed."""
+
+        # Arrange
+        self.__payload["option_grants"].append({
+            "quantity": 1000,
+            "start_date": "15-03-2018",
+            "cliff_months": 0,
+            "duration_months": 7,
+            "frequency": "daily",
+        })
+
+        # Act
+        response = self.__client.post(
+            VESTING_SCHEDULE_PORTFOLIO_URL, self.__payload, format="json")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()[-1], {
+            "vested_quantity": 5800, "total_value": "58000.00",
+            "date": "31-01-2022"})
+
+    def test_given_unknown_frequency_when_generate_schedule_then_error(self):
+        """Test only the known frequencies are accepted."""
+
+        # Arrange
+        self.__payload["option_grants"][0]["frequency"] = "weekly"
+
+        # Act
+        response = self.__client.post(
+            VESTING_SCHEDULE_URL, self.__payload, format="json")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("frequency", response.data["option_grants"][0])
@@ -0,0 +1,174 @@
+"""
+Test the VestedAsOfUseCase class and the vested as of API.
+"""
+import datetime
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from vesting.engine.schedule_engine import ScheduleEngine
+from vesting.models import CompanyValuation, OptionGrant
+from vesting.use_cases.generate_schedule.generate_schedule_use_case import \
+    GenerateScheduleUseCase
+from vesting.use_cases.vested_as_of.vested_as_of_use_case import \
+    VestedAsOfUseCase
+
+from app.shared.exceptions import BusinessValidationError
+
+VESTING_SCHEDULE_URL = reverse("vesting:schedule")
+VESTING_SCHEDULE_VESTED_URL = reverse("vesting:schedule-vested")
+
+
+class VestedAsOfUseCaseTest(TestCase):
+    """Test the VestedAsOfUseCase class."""
+
+    def setUp(self):
+        self.__company_valuations = [
+            CompanyValuation(price=Decimal('10.00'),
+                             valuation_date=datetime.date(2017, 12, 9)),
+            CompanyValuation(price=Decimal('12.37'),
+                             valuation_date=datetime.date(2019, 6, 30)),
+        ]
+
+    def test_given_dates_when_execute_then_latest_vest_of_schedule(self):
+        """Test each date gets the vest the full schedule has for it."""
+
+        for arithmetic in ('float', 'exact'):
+            for option_grant in [
+                OptionGrant(4801, datetime.date(2018, 1, 31), 12, 48),
+                OptionGrant(1200, datetime.date(2018, 2, 28), 0, 13),
+                OptionGrant(10 ** 15, datetime.date(2018, 8, 29), 7, 30),
+            ]:
+                with self.subTest(arithmetic=arithmetic,
+                                  start_date=option_grant.start_date):
+                    # Arrange
+                    vests = GenerateScheduleUseCase(arithmetic).execute(
+                        option_grant, self.__company_valuations)
+                    as_of_dates = [
+                        option_grant.start_date + datetime.timedelta(days)
+                        for days in range(0, 1600, 3)
+                    ]
+
+                    # Act
+                    result = VestedAsOfUseCase(arithmetic).execute(
+                        option_grant, self.__company_valuations, as_of_dates)
+
+                    # Assert
+                    for as_of, vest in zip(as_of_dates, result):
+                        expected = [v for v in vests if v.date <= as_of][-1]
+                        self.assertEqual(
+                            (vest.vested_quantity, vest.total_value,
+                             vest.date),
+                            (expected.vested_quantity, expected.total_value,
+                             expected.date))
+
+    def test_given_date_before_start_when_execute_then_none(self):
+        """Test nothing has vested before the start date."""
+
+        result = VestedAsOfUseCase().execute(
+            OptionGrant(4800, datetime.date(2018, 1, 31), 12, 48),
+            self.__company_valuations, [datetime.date(2018, 1, 30)])
+
+        self.assertEqual(result, [None])
+
+    def test_given_grant_when_execute_then_no_schedule_built(self):
+        """Test the schedule is never generated."""
+
+        with mock.patch.object(ScheduleEngine, 'iterate') as iterate:
+            result = VestedAsOfUseCase().execute(
+                OptionGrant(4800, datetime.date(2018, 1, 31), 12, 48),
+                self.__company_valuations, [datetime.date(2020, 1, 31)])
+
+        iterate.assert_not_called()
+        self.assertEqual(result[0].vested_quantity, 2400.0)
+
+    def test_given_invalid_grant_when_execute_then_fails(self):
+        """Test the grant is validated like for a schedule."""
+
+        with self.assertRaisesMessage(
+                BusinessValidationError,
+                "Start date must be greater than or equal to valuation date."):
+            VestedAsOfUseCase().execute(
+                OptionGrant(4800, datetime.date(2017, 1, 31), 12, 48),
+                self.__company_valuations, [datetime.date(2020, 1, 31)])
+
+
+class VestedAsOfAPITestCase(TestCase):
+    """Test the vested as of API."""
+
+    def setUp(self):
+        """Set up the test case."""
+
+        self.__client = APIClient()
+        self.__payload = {
+            "option_grants": [
+                {
+                    "quantity": 4800,
+                    "start_date": "31-01-2018",
+                    "cliff_months": 12,
+                    "duration_months": 48,
+                }
+            ],
+            "company_valuations": [
+                {
+                    "price": 10.0,
+                    "valuation_date": "09-12-2017"
+                }
+            ],
+        }
+
+    def test_given_as_of_when_vested_then_vest_of_schedule(self):
+        """Test one date answers with the row the schedule has for it."""
+
+        # Arrange
+        schedule = self.__client.post(
+            VESTING_SCHEDULE_URL, self.__payload, format="json").json()
+
+        # Act
+        response = self.__client.post(
+            VESTING_SCHEDULE_VESTED_URL,
+            dict(self.__payload, as_of="15-03-2020"), format="json")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(),
+                         dict(schedule[25], as_of="15-03-2020"))
+
+    def test_given_as_of_dates_when_vested_then_one_per_date(self):
+        """Test a list of dates answers with a list in the same order."""
+
+        # Act
+        response = self.__client.post(
+            VESTING_SCHEDULE_VESTED_URL,
+            dict(self.__payload,
+                 as_of_dates=["01-01-2030", "30-01-2018", "31-01-2019"]),
+            format="json")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), [
+            {"as_of": "01-01-2030", "vested_quantity": 4800,
+             "total_value": "48000.00", "date": "31-01-2022"},
+            {"as_of": "30-01-2018", "vested_quantity": 0,
+             "total_value": "0.00", "date": None},
+            {"as_of": "31-01-2019", "vested_quantity": 1200,
+             "total_value": "12000.00", "date": "31-01-2019"},
+        ])
+
+    def test_given_no_as_of_when_vested_then_fails(self):
+        """Test either an as of date or a list of them is required."""
+
+        for payload in [
+            self.__payload,
+            dict(self.__payload, as_of="01-01-2020",
+                 as_of_dates=["01-01-2020"]),
+        ]:
+            with self.subTest(payload=payload):
+                response = self.__client.post(
+                    VESTING_SCHEDULE_VESTED_URL, payload, format="json")
+
+                self.assertEqual(response.status_code,
+                                 status.HTTP_400_BAD_REQUEST)
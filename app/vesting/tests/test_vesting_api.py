@@ -1,7 +1,9 @@
 """
 Test the Vesting API.
 """
-from django.test import TestCase
+import json
+
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -46,6 +48,100 @@ class VestingAPITestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 49)
 
+    def test_given_stream_flag_when_generate_schedule_then_ndjson(self):
+        """Test the streamed schedule matches the JSON schedule."""
+
+        # Arrange
+        payload = {
+            "option_grants": [
+                {
+                    "quantity": 4800,
+                    "start_date": "31-01-2018",
+                    "cliff_months": 12,
+                    "duration_months": 120,
+                }
+            ],
+            "company_valuations": [
+                {
+                    "price": 10.0,
+                    "valuation_date": "09-12-2017"
+                }
+            ],
+        }
+
+        # Act
+        response = self.__client.post(
+            VESTING_SCHEDULE_URL + "?stream=1", payload, format="json")
+        json_response = self.__client.post(
+            VESTING_SCHEDULE_URL, payload, format="json")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line) for line in lines],
+                         json.loads(json_response.content))
+
+    def test_given_stream_flag_and_bad_dates_when_generate_then_fails(self):
+        """Test business validation fails before streaming starts."""
+
+        # Arrange
+        payload = {
+            "option_grants": [
+                {
+                    "quantity": 4800,
+                    "start_date": "01-01-2017",
+                    "cliff_months": 12,
+                    "duration_months": 48,
+                }
+            ],
+            "company_valuations": [
+                {
+                    "price": 10.0,
+                    "valuation_date": "09-12-2017"
+                }
+            ],
+        }
+
+        # Act
+        response = self.__client.post(
+            VESTING_SCHEDULE_URL + "?stream=1", payload, format="json")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_given_exact_arithmetic_when_generate_then_whole_shares(self):
+        """Test the exact arithmetic setting reaches the endpoint."""
+
+        # Arrange
+        payload = {
+            "option_grants": [
+                {
+                    "quantity": 4800,
+                    "start_date": "31-01-2018",
+                    "cliff_months": 12,
+                    "duration_months": 600,
+                }
+            ],
+            "company_valuations": [
+                {
+                    "price": 10.0,
+                    "valuation_date": "09-12-2017"
+                }
+            ],
+        }
+
+        # Act
+        float_response = self.__client.post(
+            VESTING_SCHEDULE_URL, payload, format="json")
+        with override_settings(VESTING_ARITHMETIC="exact"):
+            exact_response = self.__client.post(
+                VESTING_SCHEDULE_URL, payload, format="json")
+
+        # Assert
+        self.assertEqual(float_response.data[55]["vested_quantity"], 439)
+        self.assertEqual(exact_response.data[55]["vested_quantity"], 440)
+
     def test_given_no_payload_when_generate_schedule_then_fails(self):
         """Test the generate schedule fails when no payload."""
         # Act
@@ -536,34 +632,47 @@ class VestingAPIValidationTestCase(TestCase):
         # Assert
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
-    def test_given_more_than_one_company_when_generate_then_fails(self):
-        """Test generate fails when company list is greater than one."""
+    def test_given_more_than_one_company_when_generate_then_same_as_batch(
+            self):
+        """Test generate prices a valuation history like the batch does."""
 
         # Arrange
+        option_grant = {
+            "quantity": 4800,
+            "start_date": "01-01-2018",
+            "cliff_months": 12,
+            "duration_months": 48,
+        }
+        company_valuations = [
+            {
+                "price": 12.5,
+                "valuation_date": "01-06-2019"
+            },
+            {
+                "price": 10.0,
+                "valuation_date": "09-12-2017"
+            }
+        ]
         payload = {
-            "option_grants": [
-                {
-                    "quantity": 4800,
-                    "start_date": "2018-01-01",
-                    "cliff_months": 12,
-                    "duration_months": 48,
-                }
-            ],
-            "company_valuations": [
-                {
-                    "price": 10.0,
-                    "valuation_date": "2017-01-01"
-                },
-                {
-                    "price": 10.0,
-                    "valuation_date": "2017-01-01"
-                }
-            ],
+            "option_grants": [option_grant],
+            "company_valuations": company_valuations,
+        }
+        batch_payload = {
+            "option_grants": [dict(option_grant, id="grant")],
+            "company_valuations": company_valuations,
         }
 
         # Act
         response = self.__client.post(
             VESTING_SCHEDULE_URL, payload, format="json")
+        batch_response = self.__client.post(
+            reverse("vesting:schedule-batch"), batch_payload, format="json")
 
         # Assert
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content),
+                         batch_response.json()["schedules"]["grant"])
+        self.assertEqual(
+            {vest["total_value"] for vest in json.loads(response.content)
+             if vest["date"] in ("01-05-2019", "01-06-2019")},
+            {"16000.00", "21250.00"})
@@ -0,0 +1,140 @@
+"""
+Test the Vesting async API.
+"""
+import json
+
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+VESTING_SCHEDULE_BATCH_URL = reverse("vesting:schedule-batch")
+VESTING_ASYNC_SCHEDULE_BATCH_URL = reverse("vesting:async-schedule-batch")
+
+PAYLOAD = {
+    "option_grants": [
+        {
+            "id": "employee-{}".format(index),
+            "quantity": 4800 + index,
+            "start_date": "31-01-2018",
+            "cliff_months": 12,
+            "duration_months": 48,
+        }
+        for index in range(5)
+    ] + [
+        {
+            "id": "zero-quantity",
+            "quantity": 0,
+            "start_date": "01-01-2018",
+            "cliff_months": 12,
+            "duration_months": 48,
+        },
+        {
+            "id": "before-valuation",
+            "quantity": 4800,
+            "start_date": "01-01-2017",
+            "cliff_months": 12,
+            "duration_months": 48,
+        },
+    ],
+    "company_valuations": [
+        {
+            "price": 10.0,
+            "valuation_date": "09-12-2017"
+        },
+        {
+            "price": 12.5,
+            "valuation_date": "30-06-2019"
+        },
+    ],
+}
+
+
+@override_settings(VESTING_SCHEDULE_EXECUTOR={"CHUNK_SIZE": 2})
+class VestingAsyncAPITestCase(TestCase):
+    """Test the Vesting async API."""
+
+    def setUp(self):
+        """Set up the test case."""
+
+        self.__client = APIClient()
+        self.__async_client = AsyncClient()
+
+    async def __post(self, payload) -> tuple[int, dict]:
+        response = await self.__async_client.post(
+            VESTING_ASYNC_SCHEDULE_BATCH_URL, json.dumps(payload),
+            content_type="application/json")
+
+        return response.status_code, json.loads(response.content)
+
+    def test_given_batch_when_generate_async_then_same_as_sync(self):
+        """Test the async batch answers like the sync batch."""
+
+        # Arrange
+        expected = json.loads(self.__client.post(
+            VESTING_SCHEDULE_BATCH_URL, PAYLOAD, format="json").content)
+
+        # Act
+        status_code, result = async_to_sync(self.__post)(PAYLOAD)
+
+        # Assert
+        self.assertEqual(status_code, status.HTTP_200_OK)
+        self.assertEqual(result, expected)
+        self.assertEqual(list(result["schedules"]),
+                         ["employee-{}".format(index) for index in range(5)])
+        self.assertEqual(set(result["errors"]),
+                         {"zero-quantity", "before-valuation"})
+
+    def test_given_process_executor_when_generate_async_then_same(self):
+        """Test the batch can be computed on a process pool."""
+
+        # Arrange
+        expected = json.loads(self.__client.post(
+            VESTING_SCHEDULE_BATCH_URL, PAYLOAD, format="json").content)
+
+        # Act
+        with override_settings(VESTING_SCHEDULE_EXECUTOR={
+                "KIND": "process", "MAX_WORKERS": 2, "CHUNK_SIZE": 2}):
+            status_code, result = async_to_sync(self.__post)(PAYLOAD)
+
+        # Assert
+        self.assertEqual(status_code, status.HTTP_200_OK)
+        self.assertEqual(result, expected)
+
+    async def test_given_duplicate_ids_when_generate_async_then_fails(self):
+        """Test the whole batch is rejected like the sync batch."""
+
+        # Arrange
+        payload = dict(PAYLOAD, option_grants=[
+            PAYLOAD["option_grants"][0], PAYLOAD["option_grants"][0]])
+
+        # Act
+        status_code, result = await self.__post(payload)
+
+        # Assert
+        self.assertEqual(status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(result["option_grants"],
+                         ["Option grant ids must be unique."])
+
+    async def test_given_malformed_json_when_generate_async_then_fails(self):
+        """Test a body that is not JSON is a bad request."""
+
+        # Act
+        response = await self.__async_client.post(
+            VESTING_ASYNC_SCHEDULE_BATCH_URL, "{",
+            content_type="application/json")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_given_get_method_when_generate_async_then_fails(self):
+        """Test the async batch only accepts POST."""
+
+        # Act
+        response = await self.__async_client.get(
+            VESTING_ASYNC_SCHEDULE_BATCH_URL)
+
+        # Assert
+        self.assertEqual(response.status_code,
+                         status.HTTP_405_METHOD_NOT_ALLOWED)
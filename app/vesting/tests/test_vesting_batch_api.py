@@ -0,0 +1,251 @@
+"""
+Test the Vesting batch API.
+"""
+import json
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+VESTING_SCHEDULE_URL = reverse("vesting:schedule")
+VESTING_SCHEDULE_BATCH_URL = reverse("vesting:schedule-batch")
+
+
+class VestingBatchAPITestCase(TestCase):
+    """Test the Vesting batch API."""
+
+    def setUp(self):
+        """Set up the test case."""
+
+        self.__client = APIClient()
+
+    def test_given_valid_batch_when_generate_then_success(self):
+        """Test the batch matches the single schedule endpoint."""
+
+        # Arrange
+        option_grant = {
+            "quantity": 4800,
+            "start_date": "01-01-2018",
+            "cliff_months": 12,
+            "duration_months": 48,
+        }
+        company_valuations = [
+            {
+                "price": 10.0,
+                "valuation_date": "09-12-2017"
+            }
+        ]
+        payload = {
+            "option_grants": [
+                dict(option_grant, id="employee-1"),
+                dict(option_grant, id="employee-2", quantity=1200),
+            ],
+            "company_valuations": company_valuations,
+        }
+
+        # Act
+        response = self.__client.post(
+            VESTING_SCHEDULE_BATCH_URL, payload, format="json")
+        single_response = self.__client.post(
+            VESTING_SCHEDULE_URL,
+            {
+                "option_grants": [option_grant],
+                "company_valuations": company_valuations,
+            },
+            format="json",
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["errors"], {})
+        self.assertEqual(response.data["schedules"]["employee-1"],
+                         single_response.data)
+        self.assertEqual(len(response.data["schedules"]["employee-2"]), 49)
+
+    def test_given_invalid_grant_when_generate_then_reports_item(self):
+        """Test invalid grants are reported without failing the batch."""
+
+        # Arrange
+        payload = {
+            "option_grants": [
+                {
+                    "id": "valid",
+                    "quantity": 4800,
+                    "start_date": "01-01-2018",
+                    "cliff_months": 12,
+                    "duration_months": 48,
+                },
+                {
+                    "id": "zero-quantity",
+                    "quantity": 0,
+                    "start_date": "01-01-2018",
+                    "cliff_months": 12,
+                    "duration_months": 48,
+                },
+                {
+                    "id": "before-valuation",
+                    "quantity": 4800,
+                    "start_date": "01-01-2017",
+                    "cliff_months": 12,
+                    "duration_months": 48,
+                },
+            ],
+            "company_valuations": [
+                {
+                    "price": 10.0,
+                    "valuation_date": "09-12-2017"
+                }
+            ],
+        }
+
+        # Act
+        response = self.__client.post(
+            VESTING_SCHEDULE_BATCH_URL, payload, format="json")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.data["schedules"]), ["valid"])
+        self.assertEqual(
+            response.data["errors"]["zero-quantity"]["non_field_errors"],
+            ["Quantity must be greater than 0."])
+        self.assertEqual(
+            response.data["errors"]["before-valuation"]["detail"],
+            "Start date must be greater than or equal to valuation date.")
+
+    def test_given_stream_flag_when_generate_then_record_per_grant(self):
+        """Test the streamed batch yields one record per grant in order."""
+
+        # Arrange
+        option_grant = {
+            "quantity": 4800,
+            "start_date": "01-01-2018",
+            "cliff_months": 12,
+            "duration_months": 48,
+        }
+        payload = {
+            "option_grants": [
+                dict(option_grant, id="first"),
+                dict(option_grant, id="invalid", cliff_months=-1),
+                dict(option_grant, id="early", start_date="01-01-2017"),
+                dict(option_grant, id="last"),
+            ],
+            "company_valuations": [
+                {
+                    "price": 10.0,
+                    "valuation_date": "09-12-2017"
+                }
+            ],
+        }
+
+        # Act
+        response = self.__client.post(
+            VESTING_SCHEDULE_BATCH_URL + "?stream=1", payload, format="json")
+        json_response = self.__client.post(
+            VESTING_SCHEDULE_BATCH_URL, payload, format="json")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        records = [
+            json.loads(line) for line in
+            b"".join(response.streaming_content).decode().splitlines()
+        ]
+        expected = json.loads(json_response.content)
+        self.assertEqual([record["id"] for record in records],
+                         ["first", "invalid", "early", "last"])
+        self.assertEqual(records[0]["schedule"],
+                         expected["schedules"]["first"])
+        self.assertEqual(records[1]["errors"], expected["errors"]["invalid"])
+        self.assertEqual(records[2]["errors"], expected["errors"]["early"])
+        self.assertEqual(records[3]["schedule"],
+                         expected["schedules"]["last"])
+
+    def test_given_duplicated_ids_when_generate_then_fails(self):
+        """Test the batch fails when grant ids are repeated."""
+
+        # Arrange
+        option_grant = {
+            "id": "employee-1",
+            "quantity": 4800,
+            "start_date": "01-01-2018",
+            "cliff_months": 12,
+            "duration_months": 48,
+        }
+        payload = {
+            "option_grants": [option_grant, option_grant],
+            "company_valuations": [
+                {
+                    "price": 10.0,
+                    "valuation_date": "09-12-2017"
+                }
+            ],
+        }
+
+        # Act
+        response = self.__client.post(
+            VESTING_SCHEDULE_BATCH_URL, payload, format="json")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_given_missing_id_when_generate_then_fails(self):
+        """Test the batch fails when a grant has no id."""
+
+        # Arrange
+        payload = {
+            "option_grants": [
+                {
+                    "quantity": 4800,
+                    "start_date": "01-01-2018",
+                    "cliff_months": 12,
+                    "duration_months": 48,
+                }
+            ],
+            "company_valuations": [
+                {
+                    "price": 10.0,
+                    "valuation_date": "09-12-2017"
+                }
+            ],
+        }
+
+        # Act
+        response = self.__client.post(
+            VESTING_SCHEDULE_BATCH_URL, payload, format="json")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_given_no_company_val_when_generate_then_fails(self):
+        """Test the batch fails when company valuations are empty."""
+
+        # Arrange
+        payload = {
+            "option_grants": [
+                {
+                    "id": "employee-1",
+                    "quantity": 4800,
+                    "start_date": "01-01-2018",
+                    "cliff_months": 12,
+                    "duration_months": 48,
+                }
+            ],
+            "company_valuations": [],
+        }
+
+        # Act
+        response = self.__client.post(
+            VESTING_SCHEDULE_BATCH_URL, payload, format="json")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_given_get_method_when_generate_batch_then_fails(self):
+        """Test the batch fails when GET request method."""
+        # Act
+        response = self.__client.get(VESTING_SCHEDULE_BATCH_URL)
+
+        # Assert
+        self.assertEqual(response.status_code,
+                         status.HTTP_405_METHOD_NOT_ALLOWED)
@@ -9,4 +9,21 @@ app_name = 'vesting'
 urlpatterns = [
     path('schedule/',
          views.ScheduleViewSet.as_view({'post': 'create'}), name='schedule'),
+    path('schedule/batch/',
+         views.BatchScheduleViewSet.as_view({'post': 'create'}),
+         name='schedule-batch'),
+    path('schedule/vested/',
+         views.VestedAsOfViewSet.as_view({'post': 'create'}),
+         name='schedule-vested'),
+    path('schedule/portfolio/',
+         views.PortfolioScheduleViewSet.as_view({'post': 'create'}),
+         name='schedule-portfolio'),
+    path('schedule/export/<str:export_format>/',
+         views.ExportScheduleViewSet.as_view({'post': 'create'}),
+         name='schedule-export'),
+    path('schedule/<str:token>/',
+         views.ScheduleViewSet.as_view({'get': 'retrieve'}),
+         name='schedule-detail'),
+    path('async/schedule/batch/', views.async_batch_schedule,
+         name='async-schedule-batch'),
 ]
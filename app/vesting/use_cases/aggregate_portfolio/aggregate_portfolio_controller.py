@@ -0,0 +1,37 @@
+"""
+Aggregate Portfolio Controller.
+"""
+from rest_framework import status
+from rest_framework.response import Response
+from vesting.encoders import VestRepresentation
+from vesting.models import CompanyValuation, OptionGrant
+from vesting.serializers import PortfolioSerializer
+from vesting.use_cases.aggregate_portfolio.aggregate_portfolio_use_case import (  # noqa: E501
+    AggregatePortfolioUseCase)
+
+
+class AggregatePortfolioController:
+    """Controller for the aggregate portfolio use case."""
+
+    def __init__(self):
+        self.aggregate_portfolio_use_case = AggregatePortfolioUseCase()
+
+    def handle(self, request) -> Response:
+        """Handle the request."""
+
+        serializer = PortfolioSerializer(data=request.data)
+
+        if not serializer.is_valid():
+            return Response(serializer.errors,
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        validated_data = serializer.validated_data
+        curve = self.aggregate_portfolio_use_case.execute(
+            [OptionGrant(**option_grant_data)
+             for option_grant_data in validated_data['option_grants']],
+            [CompanyValuation(**company_valuation_data)
+             for company_valuation_data in
+             validated_data['company_valuations']],
+        )
+
+        return Response(VestRepresentation(curve), status=status.HTTP_200_OK)
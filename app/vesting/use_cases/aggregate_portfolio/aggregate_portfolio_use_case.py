@@ -0,0 +1,37 @@
+"""
+Sum the vesting schedules of many grants of options.
+"""
+from typing import Iterable, Union
+
+from vesting.engine.portfolio_engine import PortfolioEngine
+from vesting.engine.valuation_timeline import ValuationTimeline
+from vesting.models import CompanyValuation, OptionGrant, Vest
+from vesting.use_cases.generate_schedule.generate_schedule_use_case import \
+    validate_schedule_inputs
+
+
+class AggregatePortfolioUseCase:
+    """ Sum the vesting schedules of many grants on a monthly timeline."""
+
+    def __init__(self):
+        self.portfolio_engine = PortfolioEngine()
+
+    def execute(self, option_grants: Iterable[OptionGrant],
+                company_valuations: Union[
+                    ValuationTimeline, CompanyValuation,
+                    Iterable[CompanyValuation]]) -> list[Vest]:
+        """
+        Execute the portfolio aggregation.
+
+        Every grant is validated like for its schedule, and the first one
+        that fails raises its business validation error. Returns a vest per
+        month holding what all grants have vested by the end of it.
+        """
+
+        option_grants = list(option_grants)
+        valuation_timeline = ValuationTimeline.of(company_valuations)
+        for option_grant in option_grants:
+            validate_schedule_inputs(option_grant, valuation_timeline)
+
+        return self.portfolio_engine.calculate(
+            option_grants, valuation_timeline)
@@ -0,0 +1,63 @@
+"""
+Export Schedules Controller.
+"""
+from django.http import Http404, StreamingHttpResponse
+from rest_framework import status
+from rest_framework.response import Response
+from vesting.exporters import EXPORT_FORMATS
+from vesting.models import CompanyValuation
+from vesting.use_cases.export_schedules.export_schedules_use_case import \
+    ExportSchedulesUseCase
+from vesting.validators import (BatchScheduleValidator,
+                                parse_batch_option_grants)
+
+
+class ExportSchedulesController:
+    """Controller for the export schedules use case."""
+
+    def __init__(self):
+        self.export_schedules_use_case = ExportSchedulesUseCase()
+
+    def handle(self, request, export_format: str):
+        """
+        Handle the request.
+
+        Every grant is validated before the export starts streaming, so an
+        invalid grant fails the whole request with the errors of each grant.
+        """
+
+        if export_format not in EXPORT_FORMATS:
+            raise Http404('Unknown export format.')
+        output_format = EXPORT_FORMATS[export_format]
+
+        batch_serializer = BatchScheduleValidator(data=request.data)
+
+        if not batch_serializer.is_valid():
+            return Response(batch_serializer.errors,
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        validated_data = batch_serializer.validated_data
+        company_valuations = [
+            CompanyValuation(**company_valuation_data)
+            for company_valuation_data in validated_data['company_valuations']
+        ]
+
+        errors: dict = {}
+        option_grants = list(parse_batch_option_grants(
+            validated_data['option_grants'], errors))
+        for grant_id, exc in self.export_schedules_use_case.validate(
+                option_grants, company_valuations).items():
+            errors[grant_id] = {'detail': exc.detail}
+
+        if errors:
+            return Response({'errors': errors},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        response = StreamingHttpResponse(
+            output_format.chunks(self.export_schedules_use_case.execute(
+                option_grants, company_valuations)),
+            content_type=output_format.content_type)
+        response['Content-Disposition'] = \
+            'attachment; filename="schedules{}"'.format(
+                output_format.extension)
+        return response
@@ -0,0 +1,112 @@
+"""
+Compute the schedules of many grants as columns, for exports.
+"""
+from itertools import islice
+from typing import Iterable, Iterator, Optional, Union
+
+import numpy as np
+from django.conf import settings
+from vesting.engine.schedule_engine import (EPOCH_ORDINAL, FLOAT,
+                                            ScheduleEngine)
+from vesting.engine.valuation_timeline import ValuationTimeline
+from vesting.models import CompanyValuation, OptionGrant, ScheduleColumns
+from vesting.use_cases.generate_schedule.generate_schedule_use_case import \
+    validate_schedule_inputs
+
+from app.shared.exceptions import BusinessValidationError
+
+DEFAULT_GRANTS_PER_BATCH = 1024
+
+
+class ExportSchedulesUseCase:
+    """ Compute the schedules of many grants in batches of columns."""
+
+    def __init__(self, arithmetic: Optional[str] = None):
+        self.schedule_engine = ScheduleEngine(
+            arithmetic or getattr(settings, 'VESTING_ARITHMETIC', FLOAT))
+
+    @staticmethod
+    def validate(option_grants: Iterable[tuple[str, OptionGrant]],
+                 company_valuations: Union[
+                     ValuationTimeline, CompanyValuation,
+                     Iterable[CompanyValuation]]
+                 ) -> dict[str, BusinessValidationError]:
+        """The business validation error of every grant that fails it."""
+
+        valuation_timeline = ValuationTimeline.of(company_valuations)
+        failures: dict[str, BusinessValidationError] = {}
+        for grant_id, option_grant in option_grants:
+            try:
+                validate_schedule_inputs(option_grant, valuation_timeline)
+            except BusinessValidationError as exc:
+                failures[grant_id] = exc
+
+        return failures
+
+    def execute(self, option_grants: Iterable[tuple[str, OptionGrant]],
+                company_valuations: Union[
+                    ValuationTimeline, CompanyValuation,
+                    Iterable[CompanyValuation]],
+                grants_per_batch: int = DEFAULT_GRANTS_PER_BATCH,
+                failures: Optional[dict] = None
+                ) -> Iterator[ScheduleColumns]:
+        """
+        Execute the export, one batch of columns at a time.
+
+        Each batch holds the vests of up to ``grants_per_batch`` grants, in
+        the order the grants were given, computed with the same values as
+        the schedule endpoints but without any ``Vest``. A grant that fails
+        business validation is left out and, when ``failures`` is given,
+        added to it.
+        """
+
+        valuation_timeline = ValuationTimeline.of(company_valuations)
+        option_grants = iter(option_grants)
+
+        while True:
+            chunk = list(islice(option_grants, grants_per_batch))
+            if not chunk:
+                return
+
+            batch = self._execute_batch(chunk, valuation_timeline, failures)
+            if batch is not None:
+                yield batch
+
+    def _execute_batch(self, option_grants: list[tuple[str, OptionGrant]],
+                       valuation_timeline: ValuationTimeline,
+                       failures: Optional[dict]
+                       ) -> Optional[ScheduleColumns]:
+        grant_ids: list[str] = []
+        lengths: list[int] = []
+        date_ordinals: list[np.ndarray] = []
+        vested_quantities: list[np.ndarray] = []
+        value_cents: list[np.ndarray] = []
+
+        for grant_id, option_grant in option_grants:
+            try:
+                validate_schedule_inputs(option_grant, valuation_timeline)
+            except BusinessValidationError as exc:
+                if failures is not None:
+                    failures[grant_id] = exc
+                continue
+
+            ordinals, quantities, cents = self.schedule_engine.value_columns(
+                option_grant, valuation_timeline)
+            grant_ids.append(grant_id)
+            lengths.append(len(ordinals))
+            date_ordinals.append(ordinals)
+            vested_quantities.append(quantities)
+            value_cents.append(cents)
+
+        if not grant_ids:
+            return None
+
+        return ScheduleColumns(
+            grant_ids=grant_ids,
+            grant_indices=np.repeat(
+                np.arange(len(grant_ids), dtype=np.int32), lengths),
+            days=(np.concatenate(date_ordinals)
+                  - EPOCH_ORDINAL).astype(np.int32),
+            vested_quantities=np.concatenate(vested_quantities),
+            value_cents=np.concatenate(value_cents),
+        )
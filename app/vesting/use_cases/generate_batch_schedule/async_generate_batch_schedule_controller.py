@@ -0,0 +1,144 @@
+"""
+Async Generate Batch Schedule Controller.
+
+Serves the batch schedule generation from an async view. Parsing, the
+validation of the request and every chunk of grants run on the schedule
+executor, so the event loop only waits on them and keeps accepting
+clients. The response body is the one of the synchronous batch endpoint.
+"""
+import asyncio
+import json
+from concurrent.futures import Executor
+from typing import Optional
+
+from django.http import HttpResponse
+from rest_framework import status
+from vesting.encoders import encode_vests
+from vesting.executors import get_schedule_executor, schedule_executor_config
+from vesting.models import CompanyValuation
+from vesting.streaming import json_line
+from vesting.use_cases.generate_batch_schedule.generate_batch_schedule_use_case import (  # noqa: E501
+    GenerateBatchScheduleUseCase)
+from vesting.validators import (BatchScheduleValidator,
+                                parse_batch_option_grants)
+
+from app.shared.exceptions import BusinessValidationError
+
+ChunkResult = tuple[list[tuple[str, str]], list[tuple[str, str]]]
+
+
+def validate_batch(body: bytes) -> tuple[int, dict]:
+    """
+    Parse and validate a batch request.
+
+    Returns a status and, on success, the validated data or, on failure,
+    the errors.
+    """
+
+    try:
+        data = json.loads(body or b'{}')
+    except ValueError as exc:
+        return status.HTTP_400_BAD_REQUEST, {
+            'detail': 'JSON parse error - {}'.format(exc),
+            'status_code': status.HTTP_400_BAD_REQUEST,
+        }
+
+    batch_serializer = BatchScheduleValidator(data=data)
+
+    if not batch_serializer.is_valid():
+        return status.HTTP_400_BAD_REQUEST, batch_serializer.errors
+
+    validated_data = batch_serializer.validated_data
+
+    return status.HTTP_200_OK, {
+        'option_grants': validated_data['option_grants'],
+        'company_valuations': [
+            CompanyValuation(**company_valuation_data)
+            for company_valuation_data in validated_data['company_valuations']
+        ],
+    }
+
+
+def generate_chunk(option_grants_data: list[dict],
+                   company_valuations: list[CompanyValuation]
+                   ) -> ChunkResult:
+    """
+    Validate, generate and encode the schedules of a chunk of grants.
+
+    Returns the encoded schedules and the encoded errors keyed by grant id,
+    in request order. Defined at module level so a process pool can run it.
+    """
+
+    errors: dict = {}
+    results = GenerateBatchScheduleUseCase().execute_iter(
+        parse_batch_option_grants(option_grants_data, errors),
+        company_valuations,
+    )
+
+    schedules: list[tuple[str, str]] = []
+    failures: list[tuple[str, str]] = []
+    for grant_id, result in results:
+        if isinstance(result, BusinessValidationError):
+            failures.append(
+                (grant_id, json_line({'detail': result.detail})))
+        else:
+            schedules.append((grant_id, encode_vests(result)))
+
+    return (
+        schedules,
+        [(grant_id, json_line(error)) for grant_id, error in errors.items()]
+        + failures,
+    )
+
+
+class AsyncGenerateBatchScheduleController:
+    """Async controller for the generate batch schedule use case."""
+
+    def __init__(self, executor: Optional[Executor] = None,
+                 chunk_size: Optional[int] = None):
+        self.executor = executor or get_schedule_executor()
+        self.chunk_size = chunk_size or \
+            schedule_executor_config()['CHUNK_SIZE']
+
+    async def handle(self, request) -> HttpResponse:
+        """Handle the request."""
+
+        loop = asyncio.get_running_loop()
+
+        status_code, data = await loop.run_in_executor(
+            self.executor, validate_batch, request.body)
+
+        if status_code != status.HTTP_200_OK:
+            return self._json_response(json_line(data), status_code)
+
+        option_grants_data = data['option_grants']
+        chunks = await asyncio.gather(*[
+            loop.run_in_executor(
+                self.executor, generate_chunk,
+                option_grants_data[start:start + self.chunk_size],
+                data['company_valuations'])
+            for start in range(0, len(option_grants_data), self.chunk_size)
+        ])
+
+        schedules = [schedule for chunk in chunks for schedule in chunk[0]]
+        errors = [error for chunk in chunks for error in chunk[1]]
+
+        return self._json_response(
+            '{{"schedules":{},"errors":{}}}'.format(
+                self._json_object(schedules), self._json_object(errors)),
+            status.HTTP_200_OK,
+        )
+
+    @staticmethod
+    def _json_object(items: list[tuple[str, str]]) -> str:
+        """JSON object of already encoded values keyed by grant id."""
+
+        return '{' + ','.join(
+            json_line(grant_id) + ':' + value for grant_id, value in items
+        ) + '}'
+
+    @staticmethod
+    def _json_response(content: str, status_code: int) -> HttpResponse:
+        return HttpResponse(content.encode('utf-8'),
+                            content_type='application/json',
+                            status=status_code)
@@ -0,0 +1,108 @@
+"""
+Generate Batch Schedule Controller.
+"""
+from typing import Iterator, Union
+
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.response import Response
+from vesting.encoders import VestRepresentation, encode_vests
+from vesting.models import CompanyValuation, OptionGrant
+from vesting.streaming import (is_collapse_requested, is_stream_requested,
+                               json_line, ndjson_response)
+from vesting.use_cases.generate_batch_schedule.generate_batch_schedule_use_case import (  # noqa: E501
+    GenerateBatchScheduleUseCase)
+from vesting.validators import (BatchScheduleValidator,
+                                parse_batch_option_grants)
+
+from app.shared.exceptions import BusinessValidationError
+
+STREAM_MEMO_SIZE = 1024
+
+
+class GenerateBatchScheduleController:
+    """Controller for the generate batch schedule use case."""
+
+    def __init__(self):
+        self.generate_batch_schedule_use_case = GenerateBatchScheduleUseCase()
+
+    def handle(self, request) -> Union[Response, StreamingHttpResponse]:
+        """Handle the request."""
+
+        batch_serializer = BatchScheduleValidator(data=request.data)
+
+        if not batch_serializer.is_valid():
+            return Response(batch_serializer.errors,
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        validated_data = batch_serializer.validated_data
+        company_valuations = [
+            CompanyValuation(**company_valuation_data)
+            for company_valuation_data in validated_data['company_valuations']
+        ]
+
+        collapse = is_collapse_requested(request)
+
+        if is_stream_requested(request):
+            return ndjson_response(self._iter_lines(
+                validated_data['option_grants'], company_valuations,
+                collapse))
+
+        errors: dict = {}
+        option_grants: dict[str, OptionGrant] = {}
+
+        for grant_id, option_grant in parse_batch_option_grants(
+                validated_data['option_grants'], errors):
+            option_grants[grant_id] = option_grant
+
+        schedules, failures = self.generate_batch_schedule_use_case.execute(
+            option_grants, company_valuations, collapse)
+
+        for grant_id, exc in failures.items():
+            errors[grant_id] = {'detail': exc.detail}
+
+        representations: dict[int, VestRepresentation] = {}
+        for grant_id, schedule in schedules.items():
+            if id(schedule) not in representations:
+                representations[id(schedule)] = VestRepresentation(schedule)
+            schedules[grant_id] = representations[id(schedule)]
+
+        return Response({'schedules': schedules, 'errors': errors},
+                        status=status.HTTP_200_OK)
+
+    def _iter_lines(self, option_grants_data: list[dict],
+                    company_valuations: list[CompanyValuation],
+                    collapse: bool = False) -> Iterator[str]:
+        """
+        Yield one JSON line per grant, in the order the grants were given.
+
+        A line holds either the ``schedule`` or the ``errors`` of a grant.
+        """
+
+        errors: dict = {}
+        results = self.generate_batch_schedule_use_case.execute_iter(
+            parse_batch_option_grants(option_grants_data, errors),
+            company_valuations,
+            memo_size=STREAM_MEMO_SIZE,
+            collapse=collapse,
+        )
+
+        for grant_id, result in results:
+            yield from self._error_lines(errors)
+
+            if isinstance(result, BusinessValidationError):
+                yield json_line(
+                    {'id': grant_id, 'errors': {'detail': result.detail}})
+            else:
+                yield '{{"id":{},"schedule":{}}}'.format(
+                    json_line(grant_id), encode_vests(result))
+
+        yield from self._error_lines(errors)
+
+    @staticmethod
+    def _error_lines(errors: dict) -> Iterator[str]:
+        """Yield and forget the validation errors collected so far."""
+
+        while errors:
+            grant_id = next(iter(errors))
+            yield json_line({'id': grant_id, 'errors': errors.pop(grant_id)})
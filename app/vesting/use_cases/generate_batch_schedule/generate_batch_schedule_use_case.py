@@ -0,0 +1,100 @@
+"""
+Generate the schedules of a batch of option grants.
+"""
+from collections import OrderedDict
+from typing import Iterable, Iterator, Optional, Union
+
+from vesting.engine.valuation_timeline import ValuationTimeline
+from vesting.models import CompanyValuation, OptionGrant, Vest
+from vesting.use_cases.generate_schedule.cached_generate_schedule_use_case import (  # noqa: E501
+    CachedGenerateScheduleUseCase)
+
+from app.shared.exceptions import BusinessValidationError
+
+ScheduleResult = Union[list[Vest], BusinessValidationError]
+
+
+class GenerateBatchScheduleUseCase:
+    """ Generate the schedules of a batch of option grants."""
+
+    def __init__(
+        self,
+        generate_schedule_use_case: Optional[
+            CachedGenerateScheduleUseCase] = None,
+    ):
+        self.generate_schedule_use_case = \
+            generate_schedule_use_case or CachedGenerateScheduleUseCase()
+
+    def execute(
+        self,
+        option_grants: dict[str, OptionGrant],
+        company_valuations: list[CompanyValuation],
+        collapse: bool = False,
+    ) -> tuple[dict[str, list[Vest]], dict[str, BusinessValidationError]]:
+        """
+        Execute the batch schedule generation.
+
+        Every vest is priced with the valuation in effect on its date, using
+        one valuation timeline shared by the whole batch. Grants sharing the
+        same parameters are computed once and share the resulting vest list.
+        A grant that fails business validation is reported in the errors
+        without failing the rest of the batch. With ``collapse`` a run of
+        equal vests is one ``VestRange``.
+        """
+
+        schedules: dict[str, list[Vest]] = {}
+        errors: dict[str, BusinessValidationError] = {}
+
+        for grant_id, result in self.execute_iter(
+                option_grants.items(), company_valuations,
+                collapse=collapse):
+            if isinstance(result, BusinessValidationError):
+                errors[grant_id] = result
+            else:
+                schedules[grant_id] = result
+
+        return schedules, errors
+
+    def execute_iter(
+        self,
+        option_grants: Iterable[tuple[str, OptionGrant]],
+        company_valuations: Union[ValuationTimeline,
+                                  Iterable[CompanyValuation]],
+        memo_size: Optional[int] = None,
+        collapse: bool = False,
+    ) -> Iterator[tuple[str, ScheduleResult]]:
+        """
+        Execute the batch schedule generation lazily, one grant at a time.
+
+        ``memo_size`` bounds how many distinct grants are remembered for
+        deduplication, so a long stream keeps a flat memory footprint. When
+        it is ``None`` every distinct grant is remembered.
+        """
+
+        valuation_timeline = ValuationTimeline.of(company_valuations)
+        computed: OrderedDict[tuple, ScheduleResult] = OrderedDict()
+
+        for grant_id, option_grant in option_grants:
+            key = (
+                option_grant.quantity,
+                option_grant.start_date,
+                option_grant.cliff_months,
+                option_grant.duration_months,
+                option_grant.frequency,
+            )
+
+            if key in computed:
+                computed.move_to_end(key)
+                result = computed[key]
+            else:
+                try:
+                    result = self.generate_schedule_use_case.execute(
+                        option_grant, valuation_timeline, collapse)
+                except BusinessValidationError as exc:
+                    result = exc
+
+                computed[key] = result
+                if memo_size is not None and len(computed) > memo_size:
+                    computed.popitem(last=False)
+
+            yield grant_id, result
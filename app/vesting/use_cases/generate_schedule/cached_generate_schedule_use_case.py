@@ -0,0 +1,81 @@
+"""
+Generate a schedule, memoized by the schedule cache.
+"""
+from typing import Iterable, Iterator, Optional, Union
+
+from vesting.engine.valuation_timeline import ValuationTimeline
+from vesting.models import CompanyValuation, OptionGrant, Vest
+from vesting.schedule_cache import (MISSING, ScheduleCache,
+                                    get_schedule_cache, schedule_key)
+from vesting.use_cases.generate_schedule.generate_schedule_use_case import \
+    GenerateScheduleUseCase
+
+
+class CachedGenerateScheduleUseCase:
+    """ Cache layer in front of the generate schedule use case."""
+
+    def __init__(
+        self,
+        generate_schedule_use_case: Optional[GenerateScheduleUseCase] = None,
+        schedule_cache: Optional[ScheduleCache] = None,
+    ):
+        self.generate_schedule_use_case = \
+            generate_schedule_use_case or GenerateScheduleUseCase()
+        self.schedule_cache = schedule_cache or get_schedule_cache()
+
+    def execute(self, option_grants: OptionGrant,
+                company_valuations: Union[
+                    ValuationTimeline, CompanyValuation,
+                    Iterable[CompanyValuation]],
+                collapse: bool = False) -> list[Vest]:
+        """
+        Execute the schedule generation, reusing a cached schedule.
+
+        Business validation errors are raised and never cached.
+        """
+
+        valuation_timeline = ValuationTimeline.of(company_valuations)
+
+        if self.schedule_cache is None:
+            return self.generate_schedule_use_case.execute(
+                option_grants, valuation_timeline, collapse)
+
+        return self.schedule_cache.get_or_compute(
+            self._key(option_grants, valuation_timeline, collapse),
+            lambda: self.generate_schedule_use_case.execute(
+                option_grants, valuation_timeline, collapse),
+        )
+
+    def execute_iter(self, option_grants: OptionGrant,
+                     company_valuations: Union[
+                         ValuationTimeline, CompanyValuation,
+                         Iterable[CompanyValuation]],
+                     collapse: bool = False) -> Iterator[Vest]:
+        """
+        Execute the schedule generation lazily.
+
+        A cached schedule is replayed; on a miss the schedule is streamed
+        and not stored, so streaming keeps a flat memory footprint.
+        """
+
+        valuation_timeline = ValuationTimeline.of(company_valuations)
+
+        if self.schedule_cache is not None:
+            schedule = self.schedule_cache.get(
+                self._key(option_grants, valuation_timeline, collapse))
+            if schedule is not MISSING:
+                return iter(schedule)
+
+        return self.generate_schedule_use_case.execute_iter(
+            option_grants, valuation_timeline, collapse)
+
+    def _key(self, option_grants: OptionGrant,
+             valuation_timeline: ValuationTimeline,
+             collapse: bool = False) -> tuple:
+        """
+        Schedule key, told apart by the arithmetic that computes it and by
+        whether the runs of equal vests are collapsed.
+        """
+
+        return (self.generate_schedule_use_case.schedule_engine.arithmetic,
+                collapse) + schedule_key(option_grants, valuation_timeline)
@@ -1,45 +1,121 @@
 """
 Generate Schedule Controller.
 """
+from typing import Optional, Union
+
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
 from rest_framework import status
 from rest_framework.response import Response
+from vesting.encoders import VestRepresentation, encode_vest
 from vesting.models import CompanyValuation, OptionGrant
-from vesting.serializers import (OptionCompanyValuationSerializer,
-                                 VestSerializer)
-from vesting.use_cases.generate_schedule.generate_schedule_use_case import \
-    GenerateScheduleUseCase
+from vesting.schedule_links import (add_cache_headers, parse_schedule_token,
+                                    schedule_etag, schedule_link,
+                                    schedule_token)
+from vesting.streaming import (NDJSON_CONTENT_TYPE, is_collapse_requested,
+                               is_stream_requested, ndjson_response)
+from vesting.use_cases.generate_schedule.cached_generate_schedule_use_case import (  # noqa: E501
+    CachedGenerateScheduleUseCase)
+from vesting.validators import OptionCompanyValuationValidator
+
+from app.shared.instrumentation import timed
 
 
 class GenerateScheduleController:
     """Controller for the generate schedule use case."""
 
     def __init__(self):
-        self.generate_schedule_use_case = GenerateScheduleUseCase()
+        self.generate_schedule_use_case = CachedGenerateScheduleUseCase()
 
-    def handle(self, request) -> Response:
+    def handle(self, request) -> Union[Response, StreamingHttpResponse]:
         """Handle the request."""
 
-        schedule_serializer = OptionCompanyValuationSerializer(
-            data=request.data)
+        return self._respond(request, request.data)
+
+    def retrieve(self, request, token: str) -> Union[
+            Response, StreamingHttpResponse, HttpResponse]:
+        """
+        Handle the request of a linked schedule.
+
+        A client already holding the schedule is answered ``304`` before the
+        token is decoded.
+        """
+
+        etag = self._etag(request, token)
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return add_cache_headers(not_modified, etag)
+
+        try:
+            data = parse_schedule_token(token)
+        except ValueError:
+            raise Http404
+
+        return self._respond(request, data, etag)
+
+    def _etag(self, request, token: str) -> str:
+        """ETag of the schedule named by a token, as requested."""
+
+        if is_stream_requested(request):
+            media_type = NDJSON_CONTENT_TYPE
+        else:
+            media_type = request.accepted_renderer.media_type
+
+        return schedule_etag(
+            token,
+            self.generate_schedule_use_case.generate_schedule_use_case
+            .schedule_engine.arithmetic,
+            is_collapse_requested(request), media_type)
+
+    def _respond(self, request, data, etag: Optional[str] = None) -> Union[
+            Response, StreamingHttpResponse]:
+        """
+        Validate the payload and answer with its schedule.
+
+        Given the ETag of a linked schedule, the response can be cached;
+        otherwise it links to the schedule.
+        """
+
+        schedule_serializer = OptionCompanyValuationValidator(data=data)
+
+        with timed('validate'):
+            is_valid = schedule_serializer.is_valid()
+
+        if not is_valid:
+            return Response(schedule_serializer.errors,
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        validated_data = schedule_serializer.validated_data
+        option_grant_data = validated_data.pop('option_grants')
+        company_valuation_data = validated_data.pop('company_valuations')
 
-        if schedule_serializer.is_valid():
+        company_valuations = [
+            CompanyValuation(**company_valuation)
+            for company_valuation in company_valuation_data
+        ]
 
-            validated_data = schedule_serializer.validated_data
-            option_grant_data = validated_data.pop('option_grants')
-            company_valuation_data = validated_data.pop('company_valuations')
+        option_grant = OptionGrant(
+            **option_grant_data.pop())
 
-            company_valuation = CompanyValuation(
-                **company_valuation_data.pop())
+        collapse = is_collapse_requested(request)
 
-            option_grant = OptionGrant(
-                **option_grant_data.pop())
+        if is_stream_requested(request):
+            vests = self.generate_schedule_use_case.execute_iter(
+                option_grant, company_valuations, collapse)
 
-            schedule = self.generate_schedule_use_case.execute(
-                option_grant, company_valuation)
+            response = ndjson_response(encode_vest(vest) for vest in vests)
+        else:
+            with timed('execute'):
+                schedule = self.generate_schedule_use_case.execute(
+                    option_grant, company_valuations, collapse)
 
-            vest_serializer = VestSerializer(schedule, many=True)
+            response = Response(VestRepresentation(schedule),
+                                status=status.HTTP_200_OK)
 
-            return Response(vest_serializer.data, status=status.HTTP_200_OK)
+        if etag is not None:
+            return add_cache_headers(response, etag)
 
-        return Response(schedule_serializer.errors,
-                        status=status.HTTP_400_BAD_REQUEST)
+        token = schedule_token(option_grant, company_valuations)
+        if token is not None:
+            response['Content-Location'] = schedule_link(token, collapse)
+        return response
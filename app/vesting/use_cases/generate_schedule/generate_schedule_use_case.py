@@ -3,54 +3,114 @@ Generate a schedule of vesting events for a given grant of options.
 """
 import datetime
 from decimal import Decimal
+from typing import Iterable, Iterator, Optional, Union
 
-from dateutil.relativedelta import relativedelta
-from vesting.models import CompanyValuation, OptionGrant, Vest
+from django.conf import settings
+from vesting.engine.month_dates import add_months
+from vesting.engine.schedule_engine import FLOAT, ScheduleEngine
+from vesting.engine.valuation_timeline import ValuationTimeline
+from vesting.models import (ColumnarSchedule, CompanyValuation, OptionGrant,
+                            Vest)
 
 from app.shared.exceptions import BusinessValidationError
 
 
+def validate_schedule_inputs(option_grant: OptionGrant,
+                             valuation_timeline: ValuationTimeline) -> None:
+    """
+    Validate a grant and its valuations against the business rules.
+
+    Raises ``BusinessValidationError`` for the first rule broken.
+    """
+
+    if option_grant.cliff_months > option_grant.duration_months:
+        raise BusinessValidationError(
+            "Cliff must be less than or equal to duration.")
+
+    if not len(valuation_timeline):
+        raise BusinessValidationError(
+            "At least one company valuation must be provided.")
+
+    if option_grant.start_date < valuation_timeline.first_date:
+        raise BusinessValidationError(
+            "Start date must be greater than or equal to valuation date."
+        )
+
+
 class GenerateScheduleUseCase:
     """ Generate a schedule of vesting events for a given grant of options."""
 
+    def __init__(self, arithmetic: Optional[str] = None):
+        self.schedule_engine = ScheduleEngine(
+            arithmetic or getattr(settings, 'VESTING_ARITHMETIC', FLOAT))
+
     def execute(self, option_grants: OptionGrant,
-                company_valuations: CompanyValuation):
-        """Execute the schedule generation."""
+                company_valuations: Union[
+                    ValuationTimeline, CompanyValuation,
+                    Iterable[CompanyValuation]],
+                collapse: bool = False):
+        """
+        Execute the schedule generation.
+
+        Accepts one company valuation or a whole valuation history; every
+        vest is priced with the valuation in effect on its date. With
+        ``collapse`` a run of equal vests is one ``VestRange``.
+        """
 
-        return self._calculate_vests(option_grants, company_valuations)
+        return self._calculate_vests(
+            option_grants, ValuationTimeline.of(company_valuations), collapse)
 
-    def _calculate_vests(self, option_grants: OptionGrant,
-                         company_valuations: CompanyValuation) -> list[Vest]:
+    def execute_iter(self, option_grants: OptionGrant,
+                     company_valuations: Union[
+                         ValuationTimeline, CompanyValuation,
+                         Iterable[CompanyValuation]],
+                     collapse: bool = False) -> Iterator[Vest]:
         """
-        Calculate the vesting schedule for a given grant of options.
+        Execute the schedule generation lazily.
+
+        The grant is validated right away, so a business validation error is
+        raised here and not while the vests are being consumed.
         """
 
-        duration: int = option_grants.duration_months
+        valuation_timeline = ValuationTimeline.of(company_valuations)
+        validate_schedule_inputs(option_grants, valuation_timeline)
+
+        if collapse:
+            return self.schedule_engine.iterate_collapsed(
+                option_grants, valuation_timeline)
+        return self.schedule_engine.iterate(option_grants, valuation_timeline)
+
+    def execute_columns(self, option_grants: OptionGrant,
+                        company_valuations: Union[
+                            ValuationTimeline, CompanyValuation,
+                            Iterable[CompanyValuation]]) -> ColumnarSchedule:
+        """
+        Execute the schedule generation into a columnar schedule.
 
-        if option_grants.cliff_months > duration:
-            raise BusinessValidationError(
-                "Cliff must be less than or equal to duration.")
+        Meant for bulk runs, where holding a ``Vest`` per month for every
+        grant would dominate memory.
+        """
 
-        if option_grants.start_date < company_valuations.valuation_date:
-            raise BusinessValidationError(
-                "Start date must be greater than or equal to valuation date."
-            )
+        valuation_timeline = ValuationTimeline.of(company_valuations)
+        validate_schedule_inputs(option_grants, valuation_timeline)
 
-        vest_list: list[Vest] = []
+        return self.schedule_engine.calculate_columns(
+            option_grants, valuation_timeline)
 
-        for index in range(0, duration + 1):
+    def _calculate_vests(self, option_grants: OptionGrant,
+                         company_valuations: ValuationTimeline,
+                         collapse: bool = False) -> list[Vest]:
+        """
+        Calculate the vesting schedule for a given grant of options.
+        """
 
-            calculated_vest: Vest = self.calculate_vest_of_a_month(
-                option_grants.start_date,
-                option_grants.cliff_months,
-                duration,
-                option_grants.quantity,
-                company_valuations.price,
-                index,
-            )
-            vest_list.append(calculated_vest)
+        validate_schedule_inputs(option_grants, company_valuations)
 
-        return vest_list
+        if collapse:
+            return list(self.schedule_engine.iterate_collapsed(
+                option_grants, company_valuations))
+        return self.schedule_engine.calculate(
+            option_grants, company_valuations)
 
     @staticmethod
     def calculate_vest_of_a_month(
@@ -61,9 +121,13 @@ class GenerateScheduleUseCase:
         price: Decimal,
         month: int,
     ) -> Vest:
-        """ Calculate the vesting of a month for a given grant of options."""
-        current_date: datetime.date = start_date + \
-            relativedelta(months=+(month))
+        """
+        Calculate the vesting of a month for a given grant of options.
+
+        Reference implementation of the README formula for a single month.
+        ``ScheduleEngine`` computes all months at once with the same result.
+        """
+        current_date: datetime.date = add_months(start_date, month)
         cliff_percentage: float = cliff / duration
 
         current_quantity: float = quantity * ((cliff_percentage + ((month / duration) - cliff_percentage)) * (((duration - cliff) + month) // duration))  # noqa
@@ -0,0 +1,141 @@
+"""
+Materialize the schedules of the stored option grants.
+"""
+import datetime
+from bisect import bisect_left
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.db import transaction
+from vesting.engine.schedule_engine import FLOAT, ScheduleEngine
+from vesting.models import CompanyValuation, OptionGrant, OptionGrantRecord
+from vesting.repositories.company_valuation_repository import \
+    CompanyValuationRepository
+from vesting.repositories.option_grant_repository import \
+    OptionGrantRepository
+from vesting.repositories.vest_repository import VestRepository
+from vesting.use_cases.generate_batch_schedule.generate_batch_schedule_use_case import (  # noqa: E501
+    GenerateBatchScheduleUseCase)
+from vesting.use_cases.generate_schedule.cached_generate_schedule_use_case import (  # noqa: E501
+    CachedGenerateScheduleUseCase)
+from vesting.use_cases.generate_schedule.generate_schedule_use_case import (  # noqa: E501
+    GenerateScheduleUseCase, validate_schedule_inputs)
+from vesting.use_cases.update_schedule.update_schedule_use_case import \
+    UpdateScheduleUseCase
+
+from app.shared.exceptions import BusinessValidationError
+
+
+class MaterializeSchedulesUseCase:
+    """ Compute and store the vests of stored option grants."""
+
+    def __init__(self, schedule_engine: Optional[ScheduleEngine] = None):
+        self.schedule_engine = schedule_engine or ScheduleEngine(
+            getattr(settings, 'VESTING_ARITHMETIC', FLOAT))
+        arithmetic = self.schedule_engine.arithmetic
+
+        self.option_grant_repository = OptionGrantRepository()
+        self.company_valuation_repository = CompanyValuationRepository()
+        self.vest_repository = VestRepository()
+        self.generate_batch_schedule_use_case = GenerateBatchScheduleUseCase(
+            CachedGenerateScheduleUseCase(
+                GenerateScheduleUseCase(arithmetic)))
+        self.update_schedule_use_case = UpdateScheduleUseCase(arithmetic)
+
+    def execute(
+        self,
+        option_grant_records: Optional[Iterable[OptionGrantRecord]] = None,
+    ) -> tuple[int, dict[str, BusinessValidationError]]:
+        """
+        Replace the stored vests of the grants, every grant by default.
+
+        Every vest is priced with the stored valuation in effect on its date.
+        Returns the number of vests stored and the grants that failed
+        business validation, which keep no vests.
+        """
+
+        if option_grant_records is None:
+            option_grant_records = self.option_grant_repository.all()
+        option_grant_records = list(option_grant_records)
+
+        schedules, errors = self.generate_batch_schedule_use_case.execute(
+            {
+                record.grant_id: record.to_option_grant()
+                for record in option_grant_records
+            },
+            self.company_valuation_repository.timeline(),
+        )
+
+        count = self.vest_repository.replace_schedules(
+            (record, schedules.get(record.grant_id, []))
+            for record in option_grant_records
+        )
+
+        return count, errors
+
+    def add_company_valuation(self,
+                              company_valuation: CompanyValuation) -> int:
+        """
+        Store a new valuation and price the stored vests it applies to.
+
+        Those are the vests from its date until the next later valuation.
+        No quantity changes, so they are priced again by the schedule engine
+        without being recomputed, with the values a new schedule would have:
+        in the exact arithmetic a value is that of the fractional shares,
+        not of the stored whole options. Returns the number of vests priced
+        again.
+        """
+
+        valuation_date = company_valuation.valuation_date
+
+        with transaction.atomic():
+            next_date = self.company_valuation_repository.next_valuation_date(
+                valuation_date)
+            self.company_valuation_repository.bulk_create([company_valuation])
+            valuation_timeline = self.company_valuation_repository.timeline()
+
+            repriced = []
+            for option_grant_record, records in \
+                    self.vest_repository.schedules_between(
+                        valuation_date, next_date):
+                dates = [record.date for record in records]
+                start = bisect_left(dates, valuation_date)
+                stop = len(dates) if next_date is None else \
+                    bisect_left(dates, next_date)
+
+                vests = self.schedule_engine.reprice(
+                    option_grant_record.to_option_grant(),
+                    [record.to_vest() for record in records],
+                    valuation_timeline, start, stop)
+                for record, vest in zip(records[start:stop],
+                                        vests[start:stop]):
+                    record.total_value = vest.total_value
+                    repriced.append(record)
+
+            return self.vest_repository.update_values(repriced)
+
+    def change_option_grant(self, option_grant_record: OptionGrantRecord,
+                            option_grant: OptionGrant) -> int:
+        """
+        Store the new parameters of a grant and replace the vests they
+        change, keeping the ones before the earlier of the two cliffs.
+
+        Raises ``BusinessValidationError`` when the new grant is invalid.
+        Returns the number of vests stored again.
+        """
+
+        valuation_timeline = self.company_valuation_repository.timeline()
+        validate_schedule_inputs(option_grant, valuation_timeline)
+
+        first_month = self.update_schedule_use_case.first_changed_month(
+            option_grant_record.to_option_grant(), option_grant)
+        vests = list(self.schedule_engine.iterate(
+            option_grant, valuation_timeline, first_month))
+        first_date = vests[0].date if first_month else datetime.date.min
+
+        with transaction.atomic():
+            self.option_grant_repository.update(
+                option_grant_record, option_grant)
+
+            return self.vest_repository.replace_schedule_from(
+                option_grant_record, vests, first_date)
@@ -0,0 +1,101 @@
+"""
+Update a schedule of vesting events after its grant or valuations change.
+"""
+from bisect import bisect_left
+from typing import Optional
+
+from django.conf import settings
+from vesting.engine.schedule_engine import FLOAT, ScheduleEngine
+from vesting.engine.valuation_timeline import ValuationTimeline
+from vesting.engine.vest_periods import VestPeriods
+from vesting.models import CompanyValuation, OptionGrant, Schedule
+from vesting.use_cases.generate_schedule.generate_schedule_use_case import \
+    validate_schedule_inputs
+
+
+class UpdateScheduleUseCase:
+    """ Recompute only the vests of a schedule that a change affects."""
+
+    def __init__(self, arithmetic: Optional[str] = None):
+        self.schedule_engine = ScheduleEngine(
+            arithmetic or getattr(settings, 'VESTING_ARITHMETIC', FLOAT))
+
+    def add_company_valuation(self, schedule: Schedule,
+                              company_valuation: CompanyValuation
+                              ) -> Schedule:
+        """
+        Execute the schedule update for a new company valuation.
+
+        The valuation is in effect from its date until the next later
+        valuation, so only the vests between those dates are priced again;
+        no quantity changes.
+        """
+
+        valuation_timeline = ValuationTimeline(
+            list(schedule.company_valuations) + [company_valuation])
+        start, stop = self.affected_vests(
+            schedule, valuation_timeline, company_valuation)
+
+        return Schedule(
+            option_grants=schedule.option_grants,
+            company_valuations=valuation_timeline.company_valuations,
+            vests=self.schedule_engine.reprice(
+                schedule.option_grants, schedule.vests, valuation_timeline,
+                start, stop),
+        )
+
+    def change_option_grant(self, schedule: Schedule,
+                            option_grant: OptionGrant) -> Schedule:
+        """
+        Execute the schedule update for a changed grant.
+
+        Nothing vests before the cliff, so while the start date and the
+        frequency are the same the vests before the earlier of the two
+        cliffs are kept and only the vests after it are computed again.
+        """
+
+        valuation_timeline = ValuationTimeline.of(schedule.company_valuations)
+        validate_schedule_inputs(option_grant, valuation_timeline)
+
+        first_month = self.first_changed_month(
+            schedule.option_grants, option_grant)
+
+        return Schedule(
+            option_grants=option_grant,
+            company_valuations=schedule.company_valuations,
+            vests=list(schedule.vests[:first_month]) + list(
+                self.schedule_engine.iterate(
+                    option_grant, valuation_timeline, first_month)),
+        )
+
+    @staticmethod
+    def affected_vests(schedule: Schedule,
+                       valuation_timeline: ValuationTimeline,
+                       company_valuation: CompanyValuation
+                       ) -> tuple[int, int]:
+        """Range of the vests priced with a valuation of the timeline."""
+
+        dates = [vest.date for vest in schedule.vests]
+        next_index = valuation_timeline.index_at(
+            company_valuation.valuation_date) + 1
+
+        start = bisect_left(dates, company_valuation.valuation_date)
+        if next_index == len(valuation_timeline):
+            return start, len(dates)
+        return start, bisect_left(
+            dates, valuation_timeline.valuation_dates[next_index])
+
+    @staticmethod
+    def first_changed_month(option_grant: OptionGrant,
+                            changed_option_grant: OptionGrant) -> int:
+        """
+        First vest that differs between two grants.
+
+        For monthly grants it is the month of the earlier cliff.
+        """
+
+        if option_grant.start_date != changed_option_grant.start_date or \
+                option_grant.frequency != changed_option_grant.frequency:
+            return 0
+        return VestPeriods(changed_option_grant).first_at_month(min(
+            option_grant.cliff_months, changed_option_grant.cliff_months))
@@ -0,0 +1,62 @@
+"""
+Vested As Of Controller.
+"""
+import datetime
+from typing import Optional
+
+from rest_framework import status
+from rest_framework.response import Response
+from vesting.encoders import format_date, vest_to_representation
+from vesting.models import CompanyValuation, OptionGrant, Vest
+from vesting.serializers import VestedAsOfSerializer
+from vesting.use_cases.vested_as_of.vested_as_of_use_case import \
+    VestedAsOfUseCase
+
+
+def vested_as_of_representation(as_of: datetime.date,
+                                vest: Optional[Vest]) -> dict:
+    """The vest in effect on a date, nothing vested before the start."""
+
+    if vest is None:
+        representation = {
+            'vested_quantity': 0, 'total_value': '0.00', 'date': None}
+    else:
+        representation = vest_to_representation(vest)
+
+    return dict(as_of=format_date(as_of), **representation)
+
+
+class VestedAsOfController:
+    """Controller for the vested as of use case."""
+
+    def __init__(self):
+        self.vested_as_of_use_case = VestedAsOfUseCase()
+
+    def handle(self, request) -> Response:
+        """Handle the request."""
+
+        serializer = VestedAsOfSerializer(data=request.data)
+
+        if not serializer.is_valid():
+            return Response(serializer.errors,
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        validated_data = serializer.validated_data
+        option_grant = OptionGrant(**validated_data['option_grants'][0])
+        company_valuations = [
+            CompanyValuation(**company_valuation)
+            for company_valuation in validated_data['company_valuations']
+        ]
+        as_of_dates = validated_data.get('as_of_dates') or \
+            [validated_data['as_of']]
+
+        vests = self.vested_as_of_use_case.execute(
+            option_grant, company_valuations, as_of_dates)
+        representations = [
+            vested_as_of_representation(as_of, vest)
+            for as_of, vest in zip(as_of_dates, vests)
+        ]
+
+        if 'as_of_dates' in validated_data:
+            return Response(representations, status=status.HTTP_200_OK)
+        return Response(representations[0], status=status.HTTP_200_OK)
@@ -0,0 +1,43 @@
+"""
+Find what a grant of options has vested as of given dates.
+"""
+import datetime
+from typing import Iterable, Optional, Union
+
+from django.conf import settings
+from vesting.engine.schedule_engine import FLOAT, ScheduleEngine
+from vesting.engine.valuation_timeline import ValuationTimeline
+from vesting.models import CompanyValuation, OptionGrant, Vest
+from vesting.use_cases.generate_schedule.generate_schedule_use_case import \
+    validate_schedule_inputs
+
+
+class VestedAsOfUseCase:
+    """ Find the vest in effect on each date without building a schedule."""
+
+    def __init__(self, arithmetic: Optional[str] = None):
+        self.schedule_engine = ScheduleEngine(
+            arithmetic or getattr(settings, 'VESTING_ARITHMETIC', FLOAT))
+
+    def execute(self, option_grants: OptionGrant,
+                company_valuations: Union[
+                    ValuationTimeline, CompanyValuation,
+                    Iterable[CompanyValuation]],
+                as_of_dates: Iterable[datetime.date]
+                ) -> list[Optional[Vest]]:
+        """
+        Execute the vested as of query.
+
+        Each date gets the latest vest of the schedule on or before it,
+        computed in constant time for the month, or ``None`` before the
+        start date.
+        """
+
+        valuation_timeline = ValuationTimeline.of(company_valuations)
+        validate_schedule_inputs(option_grants, valuation_timeline)
+
+        return [
+            self.schedule_engine.vest_as_of(
+                option_grants, valuation_timeline, as_of)
+            for as_of in as_of_dates
+        ]
@@ -0,0 +1,308 @@
+"""
+Fast validation of schedule payloads.
+
+The serializers of ``vesting.serializers`` validate a payload field by field
+through DRF's machinery and parse every date with ``strptime``; on batch
+payloads that costs more than the schedules. The validators here check the
+common case in one pass over plain dictionaries, with a hand-written
+``DD-MM-YYYY`` parser, and give the same validated data.
+
+The fast path only accepts values it can validate exactly as the
+serializer would: integers, ids without surrounding whitespace,
+``DD-MM-YYYY`` dates and so on. Anything else, valid or not, is handed to
+the serializer, which stays the reference for the rules and gives the
+errors, so the error structure and messages are those of the serializers.
+The serializers also remain the source of the OpenAPI schema.
+"""
+import datetime
+from typing import Iterable, Iterator, Optional
+
+from rest_framework import serializers
+from vesting.models import FREQUENCIES, MONTHLY, OptionGrant
+from vesting.serializers import (BatchOptionGrantSerializer,
+                                 BatchScheduleSerializer,
+                                 CompanyValuationSerializer,
+                                 OptionCompanyValuationSerializer)
+
+MAX_INTEGER_DIGITS = 18
+MAX_INTEGER = 10 ** MAX_INTEGER_DIGITS
+MAX_ID_LENGTH = 255
+
+_PRICE_FIELD = CompanyValuationSerializer().fields['price']
+
+
+class SlowPath(Exception):
+    """The payload needs the serializer to be validated."""
+
+
+def parse_date(value) -> datetime.date:
+    """
+    Parse a ``DD-MM-YYYY`` date.
+
+    Only zero padded days and months are accepted; ``strptime`` also takes
+    ``1-1-2018``, which the serializer handles.
+    """
+
+    if type(value) is not str or len(value) != 10 or value[2] != '-' or \
+            value[5] != '-':
+        raise SlowPath
+    day, month, year = value[:2], value[3:5], value[6:]
+    if not (day + month + year).isascii() or \
+            not (day + month + year).isdigit():
+        raise SlowPath
+
+    try:
+        return datetime.date(int(year), int(month), int(day))
+    except ValueError:
+        raise SlowPath
+
+
+def parse_integer(value) -> int:
+    """
+    An integer of the payload, as ``IntegerField`` parses it.
+
+    Takes JSON integers and, as CSV files have them, strings of digits.
+    """
+
+    if type(value) is str and 0 < len(value) <= MAX_INTEGER_DIGITS and \
+            value.isascii() and value.isdigit():
+        return int(value)
+    if type(value) is not int or not -MAX_INTEGER < value < MAX_INTEGER:
+        raise SlowPath
+    return value
+
+
+def parse_price(value):
+    """A price of the payload, as ``CompanyValuationSerializer`` has it."""
+
+    if type(value) not in (int, float, str):
+        raise SlowPath
+    try:
+        price = _PRICE_FIELD.to_internal_value(value)
+    except serializers.ValidationError:
+        raise SlowPath
+
+    if price <= 0:
+        raise SlowPath
+    return price
+
+
+def parse_option_grant(data) -> dict:
+    """The fields of ``OptionGrantSerializer``."""
+
+    if type(data) is not dict:
+        raise SlowPath
+    try:
+        quantity = parse_integer(data['quantity'])
+        start_date = parse_date(data['start_date'])
+        cliff_months = parse_integer(data['cliff_months'])
+        duration_months = parse_integer(data['duration_months'])
+    except KeyError:
+        raise SlowPath
+
+    frequency = data.get('frequency', MONTHLY)
+    if type(frequency) is not str or frequency not in FREQUENCIES:
+        raise SlowPath
+
+    if quantity <= 0 or cliff_months < 0 or \
+            cliff_months > duration_months or duration_months <= 0:
+        raise SlowPath
+
+    return {
+        'quantity': quantity,
+        'start_date': start_date,
+        'cliff_months': cliff_months,
+        'duration_months': duration_months,
+        'frequency': frequency,
+    }
+
+
+def parse_company_valuation(data) -> dict:
+    """The fields of ``CompanyValuationSerializer``."""
+
+    if type(data) is not dict:
+        raise SlowPath
+    try:
+        return {
+            'price': parse_price(data['price']),
+            'valuation_date': parse_date(data['valuation_date']),
+        }
+    except KeyError:
+        raise SlowPath
+
+
+def parse_list(data: dict, name: str) -> list:
+    """A non empty list of the payload."""
+
+    value = data.get(name)
+    if type(value) is not list or not value:
+        raise SlowPath
+    return value
+
+
+class FastValidator:
+    """
+    Validate a payload like ``serializer_class``, with a fast path.
+
+    Offers the ``is_valid``, ``validated_data`` and ``errors`` of a
+    serializer. ``fast_validate`` returns the validated data or raises
+    ``SlowPath``, and the serializer then validates the payload.
+    """
+
+    serializer_class: type = serializers.Serializer
+
+    def __init__(self, data):
+        self.initial_data = data
+        self._validated_data: Optional[dict] = None
+        self._errors: dict = {}
+
+    def is_valid(self) -> bool:
+        """
+        Validate the payload, on the fast path when it can.
+
+        Falls back to ``serializer_class`` when ``fast_validate`` raises
+        ``SlowPath``, keeping its errors when the payload is invalid.
+        """
+
+        try:
+            self._validated_data = self.fast_validate(self.initial_data)
+            return True
+        except SlowPath:
+            pass
+
+        serializer = self.serializer_class(data=self.initial_data)
+        if serializer.is_valid():
+            self._validated_data = serializer.validated_data
+            return True
+
+        self._errors = serializer.errors
+        return False
+
+    @property
+    def validated_data(self) -> dict:
+        """The validated data, once ``is_valid`` returned ``True``."""
+
+        return self._validated_data
+
+    @property
+    def errors(self) -> dict:
+        """The serializer errors, once ``is_valid`` returned ``False``."""
+
+        return self._errors
+
+    def fast_validate(self, data) -> dict:
+        """
+        The validated data of a payload, or ``SlowPath``.
+
+        The hook every subclass implements: it checks the common shapes of
+        its payload in one pass and raises ``SlowPath`` for anything it
+        cannot validate exactly as ``serializer_class`` would.
+        """
+
+        raise NotImplementedError(
+            '{} must implement fast_validate.'.format(type(self).__name__))
+
+
+class OptionCompanyValuationValidator(FastValidator):
+    """Validate the payload of the schedule endpoint."""
+
+    serializer_class = OptionCompanyValuationSerializer
+
+    def fast_validate(self, data) -> dict:
+        if type(data) is not dict:
+            raise SlowPath
+        option_grants = parse_list(data, 'option_grants')
+        company_valuations = parse_list(data, 'company_valuations')
+        if len(option_grants) != 1 or not company_valuations:
+            raise SlowPath
+
+        return {
+            'option_grants': [parse_option_grant(option_grants[0])],
+            'company_valuations': [
+                parse_company_valuation(company_valuation)
+                for company_valuation in company_valuations
+            ],
+        }
+
+
+class BatchOptionGrantValidator(FastValidator):
+    """Validate a grant of the batch endpoint."""
+
+    serializer_class = BatchOptionGrantSerializer
+
+    def fast_validate(self, data) -> dict:
+        validated_data = parse_option_grant(data)
+
+        grant_id = data.get('id')
+        if type(grant_id) is not str or not grant_id or \
+                len(grant_id) > MAX_ID_LENGTH or \
+                grant_id != grant_id.strip() or '\x00' in grant_id:
+            raise SlowPath
+        try:
+            grant_id.encode('utf-8')
+        except UnicodeEncodeError:
+            raise SlowPath
+
+        validated_data['id'] = grant_id
+        return validated_data
+
+
+class BatchScheduleValidator(FastValidator):
+    """
+    Validate the payload of the batch endpoint.
+
+    As with ``BatchScheduleSerializer``, the grants are only checked for
+    unique ids here; each grant is validated on its own afterwards.
+    """
+
+    serializer_class = BatchScheduleSerializer
+
+    def fast_validate(self, data) -> dict:
+        if type(data) is not dict:
+            raise SlowPath
+        option_grants = parse_list(data, 'option_grants')
+        company_valuations = parse_list(data, 'company_valuations')
+
+        ids: set[str] = set()
+        for option_grant in option_grants:
+            if type(option_grant) is not dict:
+                raise SlowPath
+            grant_id = option_grant.get('id')
+            if grant_id in (None, ''):
+                raise SlowPath
+            ids.add(str(grant_id))
+        if len(ids) != len(option_grants):
+            raise SlowPath
+
+        return {
+            'option_grants': [
+                {str(key): value for key, value in option_grant.items()}
+                for option_grant in option_grants
+            ],
+            'company_valuations': [
+                parse_company_valuation(company_valuation)
+                for company_valuation in company_valuations
+            ],
+        }
+
+
+def parse_batch_option_grants(option_grants_data: Iterable[dict],
+                              errors: dict
+                              ) -> Iterator[tuple[str, OptionGrant]]:
+    """
+    Yield the valid option grants of a batch with their ids.
+
+    Invalid grants are added to ``errors`` keyed by their id instead.
+    """
+
+    for option_grant_data in option_grants_data:
+        grant_id = str(option_grant_data['id'])
+        option_grant_validator = BatchOptionGrantValidator(
+            data=option_grant_data)
+
+        if option_grant_validator.is_valid():
+            grant_fields = dict(option_grant_validator.validated_data)
+            grant_fields.pop('id')
+            yield grant_id, OptionGrant(**grant_fields)
+        else:
+            errors[grant_id] = option_grant_validator.errors
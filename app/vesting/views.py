@@ -1,8 +1,23 @@
 
+from django.http import HttpResponseNotAllowed
 from rest_framework import viewsets
-from vesting.serializers import OptionCompanyValuationSerializer
+from rest_framework.renderers import BrowsableAPIRenderer
+from vesting.renderers import VestJSONRenderer, VestMessagePackRenderer
+from vesting.serializers import (BatchScheduleSerializer,
+                                 OptionCompanyValuationSerializer,
+                                 PortfolioSerializer, VestedAsOfSerializer)
+from vesting.use_cases.aggregate_portfolio.aggregate_portfolio_controller import (  # noqa: E501
+    AggregatePortfolioController)
+from vesting.use_cases.export_schedules.export_schedules_controller import \
+    ExportSchedulesController
+from vesting.use_cases.generate_batch_schedule.async_generate_batch_schedule_controller import (  # noqa: E501
+    AsyncGenerateBatchScheduleController)
+from vesting.use_cases.generate_batch_schedule.generate_batch_schedule_controller import (  # noqa: E501
+    GenerateBatchScheduleController)
 from vesting.use_cases.generate_schedule.generate_schedule_controller import \
     GenerateScheduleController
+from vesting.use_cases.vested_as_of.vested_as_of_controller import \
+    VestedAsOfController
 
 
 class ScheduleViewSet(viewsets.ViewSet):
@@ -10,9 +25,90 @@ class ScheduleViewSet(viewsets.ViewSet):
     API endpoint that allows schedules to be viewed or edited.
     """
     serializer_class = OptionCompanyValuationSerializer
+    renderer_classes = [VestJSONRenderer, BrowsableAPIRenderer,
+                        VestMessagePackRenderer]
 
     def create(self, request):
         """
         Retrieve a schedule.
         """
         return GenerateScheduleController().handle(request)
+
+    def retrieve(self, request, token):
+        """
+        Retrieve the schedule a link names, with caching headers.
+        """
+        return GenerateScheduleController().retrieve(request, token)
+
+
+class BatchScheduleViewSet(viewsets.ViewSet):
+    """
+    API endpoint that generates the schedules of many option grants.
+    """
+    serializer_class = BatchScheduleSerializer
+    renderer_classes = [VestJSONRenderer, BrowsableAPIRenderer,
+                        VestMessagePackRenderer]
+
+    def create(self, request):
+        """
+        Retrieve a schedule for every option grant of the batch.
+        """
+        return GenerateBatchScheduleController().handle(request)
+
+
+class VestedAsOfViewSet(viewsets.ViewSet):
+    """
+    API endpoint that tells what a grant has vested as of given dates.
+    """
+    serializer_class = VestedAsOfSerializer
+
+    def create(self, request):
+        """
+        Retrieve the vest in effect on each date, without the schedule.
+        """
+        return VestedAsOfController().handle(request)
+
+
+class PortfolioScheduleViewSet(viewsets.ViewSet):
+    """
+    API endpoint that sums the schedules of many option grants.
+    """
+    serializer_class = PortfolioSerializer
+    renderer_classes = [VestJSONRenderer, BrowsableAPIRenderer]
+
+    def create(self, request):
+        """
+        Retrieve what the grants have vested by the end of every month.
+        """
+        return AggregatePortfolioController().handle(request)
+
+
+class ExportScheduleViewSet(viewsets.ViewSet):
+    """
+    API endpoint that exports the schedules of many option grants.
+    """
+    serializer_class = BatchScheduleSerializer
+    renderer_classes = [VestJSONRenderer, BrowsableAPIRenderer]
+
+    def create(self, request, export_format):
+        """
+        Download the schedules of the batch as CSV, Arrow or Parquet.
+        """
+        return ExportSchedulesController().handle(request, export_format)
+
+
+async def async_batch_schedule(request):
+    """
+    Async endpoint that generates the schedules of many option grants.
+
+    Takes the payload of ``BatchScheduleViewSet`` and computes the batch on
+    the schedule executor; meant to be served over ASGI.
+    """
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+
+    return await AsyncGenerateBatchScheduleController().handle(request)
+
+
+# Set directly: csrf_exempt() would wrap the coroutine in a sync view.
+async_batch_schedule.csrf_exempt = True